@@ -0,0 +1,293 @@
+"""
+Expense Aggregates
+
+Description:
+Materialized running aggregates for the Expense Tracker. An ExpenseAggregates
+object listens to an ExpenseStore and keeps the overall total and count, and
+the total and count of every month and every description, up to date with the
+difference each add, update or delete makes. Reading a total is then a
+dictionary lookup instead of a pass over all expenses. Totals are kept in whole
+cents, like the amounts in the store, so they never drift however many changes
+are applied.
+
+An update moves the old amount out of the old month and category and the new
+amount into the new ones, so changing the amount, date or description of an
+expense keeps every aggregate exact. check_consistency() recomputes everything
+from the store with the reporting engine and reports any difference, to the cent.
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python expense_aggregates.py    # compare aggregate reads with full recomputes
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from expense_reports import totals_by_category, totals_by_period
+from expense_store import ExpenseStore, to_cents
+
+
+def month_deltas(expenses, sign=1, deltas=None):
+    """
+    Sum the amounts and counts of expenses by description and month.
+
+    ExpenseAggregates and ExpenseBudgets both keep their totals up to date
+    by applying these deltas.
+
+    Args:
+        expenses: One expense as a dict of the COLUMNS names to its values,
+                  as returned by ExpenseStore.row(), or many as a dict of
+                  the names to sequences, as passed to on_add(). Only
+                  'Description', 'Amount' and 'Date Spent' are read.
+        sign (int, optional): 1 for expenses added, -1 for expenses removed.
+                              Defaults to 1.
+        deltas (dict, optional): Deltas to add to, e.g. those of the other
+                                 side of an update. Defaults to None, a new dict.
+
+    Returns:
+        dict: [cents, count] per (description, 'YYYY-MM') pair.
+    """
+    deltas = {} if deltas is None else deltas
+    amounts = expenses['Amount']
+    single = isinstance(amounts, (int, float, np.generic))
+    if single or len(amounts) == 1:
+        # One expense, the usual change, skips the array work
+        if not single:
+            expenses = {name: np.asarray(expenses[name])[0] for name in ('Description', 'Amount', 'Date Spent')}
+        pairs = (((expenses['Description'], str(np.datetime64(expenses['Date Spent'], 'M'))),
+                  to_cents(expenses['Amount']), 1),)
+    else:
+        cents = to_cents(amounts)
+        months, month_codes = np.unique(np.asarray(expenses['Date Spent'], dtype='datetime64[M]'),
+                                        return_inverse=True)
+        codes, categories = pd.factorize(np.asarray(expenses['Description'], dtype=object))
+        # One weighted bincount over the distinct (description, month) pairs
+        keys, rows = np.unique(codes * len(months) + month_codes, return_inverse=True)
+        # Float sums of whole cents are exact up to 2**53 cents
+        sums = np.rint(np.bincount(rows, weights=cents, minlength=len(keys))).astype(np.int64)
+        counts = np.bincount(rows, minlength=len(keys))
+        months = months.astype(str).tolist()
+        pairs = [((categories[key // len(months)], months[key % len(months)]), total, count)
+                 for key, total, count in zip(keys.tolist(), sums.tolist(), counts.tolist())]
+    for pair, cents, count in pairs:
+        delta = deltas.get(pair)
+        if delta is None:
+            deltas[pair] = [sign * cents, sign * count]
+        else:
+            delta[0] += sign * cents
+            delta[1] += sign * count
+    return deltas
+
+
+class ExpenseAggregates:
+    """
+    Running totals of an ExpenseStore, updated on every change.
+
+    Args:
+        store (ExpenseStore, optional): A store to follow. Its current
+                                        expenses are counted and the aggregates
+                                        are registered as its listener.
+                                        Defaults to None.
+
+    Note:
+        Months are keyed as 'YYYY-MM' strings and categories by description.
+        Every bucket holds its total in cents and its count. A bucket whose
+        last expense goes away is removed.
+    """
+
+    def __init__(self, store=None):
+        self.total_cents = 0
+        self.count = 0
+        self._by_month = {}
+        self._by_category = {}
+        if store is not None:
+            if len(store):
+                self.on_add({name: store.column(name) for name in ('Description', 'Amount', 'Date Spent')})
+            store.add_listener(self)
+
+    @property
+    def total(self):
+        """float: The total amount of all expenses."""
+        return self.total_cents / 100
+
+    @staticmethod
+    def _change(buckets, key, amount, count):
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [amount, count]
+        else:
+            bucket[0] += amount
+            bucket[1] += count
+            if bucket[1] == 0:
+                del buckets[key]
+
+    def _apply(self, deltas):
+        for (category, month), (cents, count) in deltas.items():
+            self.total_cents += cents
+            self.count += count
+            self._change(self._by_month, month, cents, count)
+            self._change(self._by_category, category, cents, count)
+
+    def on_add(self, columns):
+        self._apply(month_deltas(columns))
+
+    def on_update(self, old, new):
+        self._apply(month_deltas(new, 1, month_deltas(old, -1)))
+
+    def on_delete(self, old):
+        self._apply(month_deltas(old, -1))
+
+    def month_total(self, month):
+        """
+        Get the total and count of a month.
+
+        Args:
+            month (str): The month in 'YYYY-MM' format.
+
+        Returns:
+            tuple: The total amount and the number of expenses.
+        """
+        cents, count = self._by_month.get(month, (0, 0))
+        return cents / 100, count
+
+    def category_total(self, description):
+        """
+        Get the total and count of a description.
+
+        Args:
+            description (str): The description of the expenses.
+
+        Returns:
+            tuple: The total amount and the number of expenses.
+        """
+        cents, count = self._by_category.get(description, (0, 0))
+        return cents / 100, count
+
+    def by_month(self):
+        """
+        Get the totals of all months.
+
+        Returns:
+            pandas.DataFrame: 'Total' and 'Count' per month, oldest first.
+        """
+        months = sorted(self._by_month)
+        return self._report(self._by_month, months, 'month')
+
+    def by_category(self, n=None):
+        """
+        Get the totals of all descriptions.
+
+        Args:
+            n (int, optional): Only return the n categories with the highest
+                               total. Defaults to None, all categories.
+
+        Returns:
+            pandas.DataFrame: 'Total' and 'Count' per description, highest total first.
+        """
+        report = self._report(self._by_category, list(self._by_category), 'Description')
+        report = report.sort_values('Total', ascending=False, kind='stable')
+        return report if n is None else report.head(n)
+
+    @staticmethod
+    def _report(buckets, keys, name):
+        values = np.array([buckets[key] for key in keys], dtype=np.int64).reshape(-1, 2)
+        return pd.DataFrame({'Total': values[:, 0] / 100, 'Count': values[:, 1]},
+                            index=pd.Index(keys, name=name))
+
+
+def _compare(problems, name, expected, actual):
+    for key in sorted(set(expected) | set(actual), key=str):
+        want = expected.get(key, (0, 0))
+        got = actual.get(key, (0, 0))
+        if want != tuple(got):
+            problems.append(f"{name} {key}: expected {want[0] / 100:.2f} over {want[1]} expenses, "
+                            f"found {got[0] / 100:.2f} over {got[1]}")
+
+
+def check_consistency(aggregates, store):
+    """
+    Check the aggregates against a full recompute from the store.
+
+    Totals are compared in whole cents, so they must match exactly.
+
+    Args:
+        aggregates (ExpenseAggregates): The aggregates to check.
+        store (ExpenseStore): The store they follow.
+
+    Returns:
+        list: A description of every difference found; empty if consistent.
+    """
+    problems = []
+    _compare(problems, "total", {'all': (int(store.raw_column('Amount').sum()), len(store))},
+             {'all': (aggregates.total_cents, aggregates.count)})
+    months = totals_by_period(store, 'month')
+    expected = {str(np.datetime64(month, 'M')): (cents, count)
+                for month, cents, count in zip(months.index, to_cents(months['Total']).tolist(),
+                                                months['Count'].tolist())}
+    _compare(problems, "month", expected, aggregates._by_month)
+    categories = totals_by_category(store)
+    expected = {category: (cents, count)
+                for category, cents, count in zip(categories.index, to_cents(categories['Total']).tolist(),
+                                                   categories['Count'].tolist())}
+    _compare(problems, "category", expected, aggregates._by_category)
+    return problems
+
+
+def benchmark(size=1000000, changes=100000, seed=11):
+    """
+    Compare reading totals from the aggregates with recomputing them, and
+    measure what keeping the aggregates up to date costs per change.
+
+    Args:
+        size (int): The number of expenses in the store.
+        changes (int): The number of updates applied to the aggregates.
+        seed (int): Seed for the random generator, for repeatable runs.
+
+    Returns:
+        None
+    """
+    rng = np.random.default_rng(seed)
+    descriptions = np.array(['Lunch', 'Rent', 'Bus', 'Groceries', 'Coffee'], dtype=object)
+    store = ExpenseStore(size)
+    store.add_columns({
+        'ID': np.arange(1, size + 1),
+        'Description': rng.choice(descriptions, size),
+        'Amount': rng.integers(100, 100000, size) / 100,
+        'Date Spent': np.datetime64('2015-01-01') + rng.integers(0, 3650, size),
+    })
+    start = time.perf_counter()
+    aggregates = ExpenseAggregates(store)
+    print(f"Aggregating {size} existing expenses: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    cases = [
+        ("recompute total", lambda: store.raw_column('Amount').sum()),
+        ("recompute by month", lambda: totals_by_period(store, 'month')),
+        ("recompute by category", lambda: totals_by_category(store)),
+        ("aggregate total", lambda: aggregates.total),
+        ("aggregate month", lambda: aggregates.month_total('2020-06')),
+        ("aggregate category", lambda: aggregates.category_total('Rent')),
+    ]
+    for name, case in cases:
+        start = time.perf_counter()
+        case()
+        print(f"{name:>24}: {(time.perf_counter() - start) * 1e6:9.1f} us")
+
+    rows = rng.integers(0, size, changes)
+    start = time.perf_counter()
+    for row in rows.tolist():
+        old = store.row(row)
+        new = dict(old, Amount=old['Amount'] + 1.0, Description=descriptions[row % 5])
+        aggregates.on_update(old, new)
+        aggregates.on_update(new, old)
+    elapsed = time.perf_counter() - start
+    print(f"{'delta per update':>24}: {elapsed / (2 * changes) * 1e6:9.1f} us")
+    problems = check_consistency(aggregates, store)
+    print(f"Consistency check: {'ok' if not problems else problems[:5]}")
+
+
+if __name__ == "__main__":
+    benchmark()
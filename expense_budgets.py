@@ -0,0 +1,343 @@
+"""
+Expense Budgets
+
+Description:
+Budget alerts for the Expense Tracker. A budget caps the spending of one
+description (category) or of all expenses, in one month or in every month. An
+ExpenseBudgets object listens to an ExpenseStore and keeps the spending of
+every (category, month) bucket, and of every month as a whole, up to date with
+the difference each add, update or delete makes, like ExpenseAggregates does.
+
+A change touches at most two buckets per side of the change, and each bucket
+has at most two budgets (the one for its month and the recurring one), so
+checking the budgets is a few dictionary lookups per change, however many
+expenses and budgets there are. An alert is raised when the spending of a
+bucket goes past a threshold of its budget, by default 80% and 100%. Spending
+that drops back below a threshold, e.g. after a delete, arms it again.
+
+Budgets are saved as JSON, replaced atomically on every change.
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python expense_budgets.py    # time alerting as the number of expenses grows
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from expense_aggregates import month_deltas
+from expense_store import ExpenseStore, to_cents
+
+# Shares of a budget at which an alert is raised when spending goes past them
+ALERT_THRESHOLDS = (0.8, 1.0)
+
+
+def format_alert(alert):
+    """
+    Describe a budget alert for the user.
+
+    Args:
+        alert (dict): An alert returned by ExpenseBudgets.pop_alerts().
+
+    Returns:
+        str: The message.
+    """
+    what = alert['category'] or "All expenses"
+    state = "over" if alert['threshold'] >= 1 else f"at {alert['spent'] / alert['limit']:.0%} of"
+    return (f"Budget alert: {what} in {alert['month']} is {state} the budget of "
+            f"{alert['limit']:.2f} ({alert['spent']:.2f} spent).")
+
+
+class ExpenseBudgets:
+    """
+    Budgets by (category, month), checked on every change of an ExpenseStore.
+
+    Args:
+        store (ExpenseStore, optional): A store to follow. Its current
+                                        expenses are counted without raising
+                                        alerts, and the budgets are registered
+                                        as its listener. Defaults to None.
+        path (str, optional): The JSON file the budgets are kept in. It is
+                              created on first change. Defaults to None, which
+                              keeps the budgets in memory only.
+        thresholds (tuple, optional): The shares of a budget that raise an
+                                      alert. Defaults to ALERT_THRESHOLDS.
+        history (callable, optional): Reads the saved expenses of a month,
+                                      given as 'YYYY-MM', as a mapping of
+                                      'Description', 'Amount' and 'Date Spent'
+                                      to their values. A month is counted from
+                                      it the first time a change or status()
+                                      touches it, so saved expenses need not
+                                      be loaded into the store. Defaults to None.
+
+    Note:
+        A category of None stands for all expenses and a month of None for
+        every month. Spending is kept in cents for every bucket, with or
+        without a budget, so a budget set later starts from the right amount.
+
+        With a history, the store should hold none of the saved expenses, and
+        the budgets must be registered before the storage the history reads,
+        so a change is never read back before the budgets count it.
+    """
+
+    def __init__(self, store=None, path=None, thresholds=ALERT_THRESHOLDS, history=None):
+        self.path = path
+        self.thresholds = tuple(sorted(thresholds))
+        self._limits = {}
+        self._spent = {}
+        self._alerts = []
+        self._history = history
+        # Months whose saved spending was read from the history
+        self._counted = set()
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as budgets_file:
+                for budget in json.load(budgets_file)['budgets']:
+                    self._limits[(budget['category'], budget['month'])] = to_cents(budget['limit'])
+        if store is not None:
+            if len(store):
+                self._apply(self._spending(month_deltas({name: store.column(name)
+                                                         for name in ('Description', 'Amount', 'Date Spent')})),
+                            check=False)
+            store.add_listener(self)
+
+    def __len__(self):
+        return len(self._limits)
+
+    def _save(self):
+        if not self.path:
+            return
+        budgets = [{'category': category, 'month': month, 'limit': limit / 100}
+                   for (category, month), limit in self._limits.items()]
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as budgets_file:
+            json.dump({'budgets': budgets}, budgets_file)
+            budgets_file.flush()
+            os.fsync(budgets_file.fileno())
+        os.replace(temp_path, self.path)
+
+    def set_budget(self, limit, category=None, month=None):
+        """
+        Set or change a budget.
+
+        Args:
+            limit (float): The most that may be spent.
+            category (str, optional): The description the budget is for.
+                                      Defaults to None, all expenses.
+            month (str, optional): The month in 'YYYY-MM' format. Defaults to
+                                   None, every month.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the limit is not positive or the month is invalid.
+        """
+        limit = to_cents(limit)
+        if limit <= 0:
+            raise ValueError("A budget must be more than 0.")
+        if month is not None:
+            month = str(np.datetime64(month, 'M'))
+        self._limits[(category, month)] = limit
+        self._save()
+
+    def remove_budget(self, category=None, month=None):
+        """
+        Remove a budget.
+
+        Args:
+            category (str, optional): The description of the budget. Defaults to None.
+            month (str, optional): The month of the budget. Defaults to None.
+
+        Returns:
+            bool: True if the budget existed.
+        """
+        if month is not None:
+            month = str(np.datetime64(month, 'M'))
+        if self._limits.pop((category, month), None) is None:
+            return False
+        self._save()
+        return True
+
+    def status(self, month, category=None):
+        """
+        Get the spending of a bucket against its budget.
+
+        Args:
+            month (str): The month in 'YYYY-MM' format.
+            category (str, optional): The description. Defaults to None, all expenses.
+
+        Returns:
+            tuple: The amount spent and the budget that applies, or None if
+                   there is no budget; the budget of the month wins over the
+                   recurring one.
+        """
+        if self._history is not None:
+            self._count_months([month])
+        limit = self._limits.get((category, month), self._limits.get((category, None)))
+        return self._spent.get((category, month), 0) / 100, None if limit is None else limit / 100
+
+    def report(self, month):
+        """
+        Get the spending against every budget that applies in a month.
+
+        Args:
+            month (str): The month in 'YYYY-MM' format.
+
+        Returns:
+            pandas.DataFrame: 'Budget', 'Spent' and 'Left' per category, the
+                              total of all expenses listed as 'All expenses'.
+        """
+        categories = {category for category, budget_month in self._limits if budget_month in (month, None)}
+        rows = []
+        for category in sorted(categories, key=lambda category: (category is not None, category or '')):
+            spent, limit = self.status(month, category)
+            rows.append((category or 'All expenses', limit, spent, limit - spent))
+        return pd.DataFrame(rows, columns=['Category', 'Budget', 'Spent', 'Left']).set_index('Category')
+
+    def pop_alerts(self):
+        """
+        Take the alerts raised since the last call.
+
+        Returns:
+            list: The alerts, oldest first, as dicts with 'category', 'month',
+                  'limit', 'spent' and 'threshold'.
+        """
+        alerts, self._alerts = self._alerts, []
+        return alerts
+
+    def _check(self, bucket, before, after):
+        # A bucket has at most two budgets: the one for its month and the recurring one
+        category, month = bucket
+        for key in (bucket, (category, None)):
+            limit = self._limits.get(key)
+            if limit is None:
+                continue
+            # Only the highest threshold passed by one change is reported
+            for threshold in reversed(self.thresholds):
+                if before <= limit * threshold < after:
+                    self._alerts.append({'category': category, 'month': month, 'limit': limit / 100,
+                                         'spent': after / 100, 'threshold': threshold})
+                    break
+            if key == bucket:
+                # The budget of the month replaces the recurring one
+                break
+
+    def _count_months(self, months):
+        for month in sorted(set(months) - self._counted):
+            self._counted.add(month)
+            columns = self._history(month)
+            if len(columns['Amount']):
+                self._apply(self._spending(month_deltas(columns)), check=False)
+
+    def _apply(self, deltas, check=True):
+        if self._history is not None:
+            self._count_months([month for _, month in deltas])
+        for bucket, cents in deltas.items():
+            if not cents:
+                continue
+            before = self._spent.get(bucket, 0)
+            after = before + cents
+            if after:
+                self._spent[bucket] = after
+            else:
+                del self._spent[bucket]
+            if check:
+                self._check(bucket, before, after)
+
+    @staticmethod
+    def _spending(deltas):
+        # The spending of a (category, month) pair also counts toward all expenses of the month
+        spending = {}
+        for (category, month), (cents, _) in deltas.items():
+            for bucket in ((category, month), (None, month)):
+                spending[bucket] = spending.get(bucket, 0) + cents
+        return spending
+
+    def on_add(self, columns):
+        self._apply(self._spending(month_deltas(columns)))
+
+    def on_update(self, old, new):
+        # Net the two sides, so moving spending within a bucket raises nothing
+        self._apply(self._spending(month_deltas(new, 1, month_deltas(old, -1))))
+
+    def on_delete(self, old):
+        self._apply(self._spending(month_deltas(old, -1)))
+
+
+def benchmark(sizes=(10000, 100000, 1000000, 10000000), categories=200, months=24, changes=20000, seed=23):
+    """
+    Time adding and updating expenses with thousands of budgets checked on
+    every change, against recomputing the spending of the changed bucket with
+    a boolean mask, as the store grows.
+
+    Args:
+        sizes (tuple): The numbers of expenses in the store.
+        categories (int): The number of descriptions; each gets a budget for
+                          every month and a recurring one.
+        months (int): The number of months the expenses are spread over.
+        changes (int): The number of adds and of updates timed per size.
+        seed (int): Seed for the random generator, for repeatable runs.
+
+    Returns:
+        None
+    """
+    rng = np.random.default_rng(seed)
+    names = np.array([f"Category {i}" for i in range(categories)], dtype=object)
+    first = np.datetime64('2023-01', 'M')
+    print(f"{categories * (months + 1)} budgets over {categories} categories and {months} months")
+    print(f"{'expenses':>10} {'add':>9} {'add+budgets':>12} {'update+budgets':>15} {'mask recompute':>15}")
+    for size in sizes:
+        store = ExpenseStore(size + changes)
+        days = (first.astype('datetime64[D]') + rng.integers(0, months * 28, size + changes))
+        picks = rng.integers(0, categories, size + changes)
+        amounts = rng.integers(100, 10000, size + changes) / 100
+        store.add_columns({'ID': np.arange(1, size + 1), 'Description': names[picks[:size]],
+                           'Amount': amounts[:size], 'Date Spent': days[:size]})
+        budgets = ExpenseBudgets(store)
+        for i, name in enumerate(names.tolist()):
+            budgets.set_budget(5000 + i, name)
+            for month in range(months):
+                budgets.set_budget(5000 + i, name, str(first + month))
+
+        new_ids = list(range(size + 1, size + changes + 1))
+        rows = list(zip(new_ids, names[picks[size:]].tolist(), amounts[size:].tolist(), days[size:].tolist()))
+        half = changes // 2
+
+        store.remove_listener(budgets)
+        start = time.perf_counter()
+        for expense_id, description, amount, day in rows[:half]:
+            store.add(expense_id, description, amount, day)
+        plain = (time.perf_counter() - start) / half
+
+        store.add_listener(budgets)
+        start = time.perf_counter()
+        for expense_id, description, amount, day in rows[half:]:
+            store.add(expense_id, description, amount, day)
+        with_budgets = (time.perf_counter() - start) / (changes - half)
+
+        start = time.perf_counter()
+        for expense_id in new_ids[half:]:
+            store.update(expense_id, amount=12.5)
+        update = (time.perf_counter() - start) / (changes - half)
+        budgets.pop_alerts()
+
+        # What a check costs without running totals: sum the bucket from the columns
+        checks = 20
+        start = time.perf_counter()
+        for _, description, _, day in rows[:checks]:
+            in_month = store.raw_column('Date Spent').astype('datetime64[M]') == np.datetime64(day, 'M')
+            in_category = store.column('Description') == description
+            store.raw_column('Amount')[in_month & in_category].sum()
+        recompute = (time.perf_counter() - start) / checks
+        print(f"{size:>10} {plain * 1e6:>7.1f}us {with_budgets * 1e6:>10.1f}us {update * 1e6:>13.1f}us "
+              f"{recompute * 1e3:>13.1f}ms")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,252 @@
+"""
+Expense IDs
+
+Description:
+Unbounded, monotonic ID sequence for the Expense Tracker, persisted across
+runs. The sequence file only records a high-water mark: whenever the IDs
+handed out reach it, the mark is moved a whole block ahead with a single
+atomic write. Handing out an ID is therefore a counter increment, and handing
+out a block of any size is one write, however many IDs it holds.
+
+IDs up to the high-water mark of a run that ended are skipped by the next run,
+so the sequence may have gaps, but an ID is never handed out twice.
+
+ID formats:
+- 'date': '<YYYY-MM-DD>_<sequence number>', the format the tracker used to
+  give; the date is the day the expense was entered
+- 'integer' (the tracker's default): the sequence number alone, stored as a
+  compact int64; the date of an expense is its 'Date Spent' column
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python expense_ids.py    # time handing out IDs and blocks past 10M
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+ID_FORMATS = ('date', 'integer')
+
+# Number of IDs the high-water mark is moved ahead at a time
+BLOCK_SIZE = 1000
+
+
+class ExpenseIdSequence:
+    """
+    Persistent, monotonic, thread-safe sequence of expense numbers.
+
+    Args:
+        path (str, optional): The file the high-water mark is kept in. It is
+                              created on first use. Defaults to None, which
+                              keeps the sequence in memory only.
+        block_size (int, optional): The number of IDs reserved on disk at a
+                                    time. Defaults to BLOCK_SIZE.
+    """
+
+    def __init__(self, path=None, block_size=BLOCK_SIZE):
+        self.path = path
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._last_id = 0
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as sequence_file:
+                self._last_id = json.load(sequence_file)['high_water']
+        self._high_water = self._last_id
+
+    @property
+    def last_id(self):
+        """int: The highest number handed out or observed so far."""
+        return self._last_id
+
+    def _persist(self, high_water):
+        if self.path:
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as sequence_file:
+                json.dump({'high_water': high_water}, sequence_file)
+                sequence_file.flush()
+                os.fsync(sequence_file.fileno())
+            os.replace(temp_path, self.path)
+        self._high_water = high_water
+
+    def next_id(self):
+        """
+        Hand out the next number.
+
+        Returns:
+            int: The number.
+        """
+        with self._lock:
+            self._last_id += 1
+            if self._last_id > self._high_water:
+                self._persist(self._last_id + self.block_size - 1)
+            return self._last_id
+
+    def reserve(self, count):
+        """
+        Hand out a block of consecutive numbers in one step.
+
+        Args:
+            count (int): The number of IDs to hand out.
+
+        Returns:
+            range: The numbers.
+
+        Raises:
+            ValueError: If count is negative.
+        """
+        if count < 0:
+            raise ValueError("Cannot reserve a negative number of IDs.")
+        with self._lock:
+            start = self._last_id + 1
+            self._last_id += count
+            if self._last_id > self._high_water:
+                self._persist(self._last_id + self.block_size)
+            return range(start, start + count)
+
+    def observe(self, number):
+        """
+        Record a number that is already in use, e.g. by a loaded expense, so it
+        is never handed out again.
+
+        Args:
+            number (int): The number in use.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if number > self._last_id:
+                self._last_id = number
+                if number > self._high_water:
+                    self._persist(number + self.block_size)
+
+
+def format_id(number, id_format='date', today=None):
+    """
+    Turn a sequence number into an expense ID.
+
+    Args:
+        number (int): The sequence number.
+        id_format (str, optional): 'date' or 'integer'. Defaults to 'date'.
+        today (str, optional): The date part of 'date' IDs, 'YYYY-MM-DD'.
+                               Defaults to None, today's date.
+
+    Returns:
+        str or int: The expense ID.
+    """
+    if id_format == 'integer':
+        return number
+    if today is None:
+        today = time.strftime('%Y-%m-%d')
+    return f"{today}_{number}"
+
+
+def format_ids(numbers, id_format='date', today=None):
+    """
+    Turn a block of sequence numbers into expense IDs at once.
+
+    Args:
+        numbers (range or array-like): The sequence numbers.
+        id_format (str, optional): 'date' or 'integer'. Defaults to 'date'.
+        today (str, optional): The date part of 'date' IDs, 'YYYY-MM-DD'.
+                               Defaults to None, today's date.
+
+    Returns:
+        numpy.ndarray: The expense IDs, as an int64 array for 'integer' IDs
+                       and an object array of strings for 'date' IDs.
+    """
+    numbers = np.asarray(numbers, dtype=np.int64)
+    if id_format == 'integer':
+        return numbers
+    if today is None:
+        today = time.strftime('%Y-%m-%d')
+    return (f"{today}_" + pd.Series(numbers).astype(str)).to_numpy(dtype=object)
+
+
+def max_sequence_number(expense_ids):
+    """
+    Get the highest sequence number among many expense IDs at once.
+
+    Args:
+        expense_ids (array-like): Expense IDs in either format.
+
+    Returns:
+        int: The highest sequence number, or 0 if there is none.
+    """
+    expense_ids = np.asarray(expense_ids)
+    if not len(expense_ids):
+        return 0
+    if expense_ids.dtype.kind in 'iu':
+        return int(expense_ids.max())
+    numbers = pd.to_numeric(pd.Series(expense_ids, dtype=object).astype(str).str.rpartition('_')[2],
+                            errors='coerce')
+    highest = numbers.max()
+    return 0 if pd.isna(highest) else int(highest)
+
+
+def parse_id(text, id_format='date'):
+    """
+    Parse an expense ID typed by the user.
+
+    Args:
+        text (str): The typed ID.
+        id_format (str, optional): 'date' or 'integer'. Defaults to 'date'.
+
+    Returns:
+        str or int or None: The expense ID, or None if it is not a valid
+                            integer ID.
+    """
+    text = text.strip()
+    if id_format != 'integer':
+        return text
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def benchmark(size=12000000, block=5000000):
+    """
+    Time handing out IDs one at a time and in blocks, past 10M, and check that
+    the sequence continues after a restart.
+
+    Args:
+        size (int): The number of IDs handed out one at a time.
+        block (int): The size of the blocks handed out afterwards.
+
+    Returns:
+        None
+    """
+    directory = tempfile.mkdtemp(prefix='expense_ids_')
+    try:
+        path = os.path.join(directory, 'expense_ids.json')
+        sequence = ExpenseIdSequence(path)
+        start = time.perf_counter()
+        for _ in range(size):
+            sequence.next_id()
+        elapsed = time.perf_counter() - start
+        print(f"next_id x {size}: {elapsed:.2f}s ({elapsed / size * 1e9:.0f} ns per ID), last ID {sequence.last_id}")
+
+        for _ in range(3):
+            start = time.perf_counter()
+            ids = sequence.reserve(block)
+            print(f"reserve({block}): {(time.perf_counter() - start) * 1e6:.1f} us, IDs {ids.start}-{ids.stop - 1}")
+
+        restarted = ExpenseIdSequence(path)
+        first = restarted.next_id()
+        print(f"After a restart the next ID is {first} (last handed out: {sequence.last_id})")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    benchmark()
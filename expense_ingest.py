@@ -0,0 +1,487 @@
+"""
+Expense Statement Ingestion
+
+Description:
+Streaming bulk import of bank statement exports into the Expense Tracker.
+Statements are read in chunks of rows, so a multi-gigabyte export needs only
+the memory of one chunk on top of the expenses themselves. Every chunk goes
+through the same vectorized pipeline:
+
+1. Dates are parsed and validated for the whole chunk at once, the vectorized
+   equivalent of get_valid_date
+2. Amounts are normalized: currency symbols, thousands separators and spaces
+   are removed, '(12.50)' is read as -12.50, and the sign is turned into a
+   positive expense amount
+3. Descriptions are trimmed and their inner whitespace collapsed
+4. Every expense gets a content hash of its date, description and amount, and
+   expenses already in the store or earlier in the file are skipped
+5. The remaining expenses get a block of IDs and are added to the store in
+   one batch
+
+Invalid rows are skipped and the first few are reported with their line
+number. Progress is printed with the rows per second.
+
+File formats:
+- CSV with a header line. The date, description and amount columns are found
+  by their usual names ('Date', 'Transaction Date', 'Description', 'Payee',
+  'Amount', 'Debit', ...) or given explicitly.
+- OFX/QFX statements. Every <STMTTRN> gives an expense from its DTPOSTED,
+  NAME (or MEMO) and TRNAMT.
+
+Note:
+    Two statement rows with the same date, description and amount are taken
+    to be the same expense.
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python expense_tracker.py --import statement.csv
+    python expense_ingest.py    # time ingesting a generated statement
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from expense_ids import ExpenseIdSequence, format_ids
+from expense_store import ExpenseStore
+
+FORMATS = ('csv', 'ofx')
+SPENDING_SIGNS = ('any', 'negative', 'positive')
+
+# Number of statement rows parsed and added per chunk
+CHUNK_SIZE = 100000
+
+# Number of rows between two progress reports
+PROGRESS_EVERY = 1000000
+
+# Number of invalid rows reported individually before only counting them
+MAX_REPORTED_ERRORS = 10
+
+# Bytes of an OFX file read at a time
+OFX_READ_SIZE = 1 << 20
+
+DATE_COLUMNS = ('date spent', 'date', 'transaction date', 'posting date', 'posted date', 'booking date')
+DESCRIPTION_COLUMNS = ('description', 'payee', 'name', 'merchant', 'narrative', 'details', 'memo')
+AMOUNT_COLUMNS = ('amount', 'debit', 'withdrawal', 'amount spent', 'value')
+
+OFX_TRANSACTION = re.compile(r'<STMTTRN>(.*?)</STMTTRN>', re.S | re.I)
+OFX_FIELD = re.compile(r'<(\w+)>([^<\r\n]*)')
+AMOUNT_NOISE = re.compile(r'[^0-9.()\-+]')
+
+
+def detect_format(path):
+    """
+    Guess the statement format from the file extension.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        str: 'csv' or 'ofx'.
+
+    Raises:
+        ValueError: If the extension is not recognised.
+    """
+    lowered = path.lower()
+    if lowered.endswith(('.ofx', '.qfx')):
+        return 'ofx'
+    if lowered.endswith(('.csv', '.txt')):
+        return 'csv'
+    raise ValueError(f"Cannot tell the format of '{path}'. Use one of: {', '.join(FORMATS)}.")
+
+
+class IngestErrors:
+    """
+    Collects the invalid rows of an import.
+
+    Only the first few rows are kept with their details, the rest are counted.
+
+    Args:
+        limit (int, optional): Number of rows kept with details.
+                               Defaults to MAX_REPORTED_ERRORS.
+    """
+
+    def __init__(self, limit=MAX_REPORTED_ERRORS):
+        self.limit = limit
+        self.count = 0
+        self.details = []
+
+    def add_rows(self, lines, messages):
+        """
+        Record invalid rows.
+
+        Args:
+            lines (array-like): The line numbers of the rows, in file order.
+            messages (array-like): Why each row is invalid.
+
+        Returns:
+            None
+        """
+        self.count += len(lines)
+        kept = max(self.limit - len(self.details), 0)
+        for line, message in zip(list(lines[:kept]), list(messages[:kept])):
+            self.details.append((int(line), str(message)))
+
+
+def _find_column(columns, wanted, candidates, role):
+    by_name = {str(column).strip().lower(): column for column in columns}
+    if wanted is not None:
+        if wanted.strip().lower() not in by_name:
+            raise ValueError(f"The statement has no '{wanted}' column.")
+        return by_name[wanted.strip().lower()]
+    for candidate in candidates:
+        if candidate in by_name:
+            return by_name[candidate]
+    raise ValueError(f"Cannot find the {role} column. Name it with the matching option.")
+
+
+def read_csv_chunks(path, chunk_size=CHUNK_SIZE, date_column=None, description_column=None,
+                    amount_column=None):
+    """
+    Read a CSV statement lazily, chunk by chunk.
+
+    Args:
+        path (str): The statement file.
+        chunk_size (int, optional): Rows per chunk. Defaults to CHUNK_SIZE.
+        date_column (str, optional): The name of the date column. Defaults to
+                                     None, which looks for the usual names.
+        description_column (str, optional): The name of the description column.
+        amount_column (str, optional): The name of the amount column.
+
+    Yields:
+        pandas.DataFrame: The raw text of 'date', 'description' and 'amount'
+                          and the 'line' number of every row.
+    """
+    reader = pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_size,
+                         skipinitialspace=True, encoding='utf-8-sig')
+    names = None
+    line = 2
+    with reader:
+        for chunk in reader:
+            if names is None:
+                names = (_find_column(chunk.columns, date_column, DATE_COLUMNS, 'date'),
+                         _find_column(chunk.columns, description_column, DESCRIPTION_COLUMNS, 'description'),
+                         _find_column(chunk.columns, amount_column, AMOUNT_COLUMNS, 'amount'))
+            yield pd.DataFrame({'date': chunk[names[0]].to_numpy(),
+                                'description': chunk[names[1]].to_numpy(),
+                                'amount': chunk[names[2]].to_numpy(),
+                                'line': np.arange(line, line + len(chunk))})
+            line += len(chunk)
+
+
+def read_ofx_chunks(path, chunk_size=CHUNK_SIZE):
+    """
+    Read the transactions of an OFX statement lazily, chunk by chunk.
+
+    Args:
+        path (str): The statement file.
+        chunk_size (int, optional): Transactions per chunk. Defaults to CHUNK_SIZE.
+
+    Yields:
+        pandas.DataFrame: The raw text of 'date' (YYYYMMDD), 'description' and
+                          'amount' and the 'line' number of every transaction.
+    """
+    rows = []
+    buffer = ''
+    line = 1
+    with open(path, encoding='utf-8', errors='replace') as statement:
+        while True:
+            piece = statement.read(OFX_READ_SIZE)
+            buffer += piece
+            counted = consumed = 0
+            for match in OFX_TRANSACTION.finditer(buffer):
+                line += buffer.count('\n', counted, match.start())
+                counted, consumed = match.start(), match.end()
+                fields = {name.upper(): value.strip() for name, value in OFX_FIELD.findall(match.group(1))}
+                rows.append((fields.get('DTPOSTED', '')[:8], fields.get('NAME') or fields.get('MEMO', ''),
+                             fields.get('TRNAMT', ''), line))
+                if len(rows) >= chunk_size:
+                    yield pd.DataFrame(rows, columns=['date', 'description', 'amount', 'line'])
+                    rows = []
+            # Keep only the text that may hold the start of an unfinished transaction
+            keep = buffer.upper().find('<STMTTRN>', consumed)
+            if keep < 0:
+                keep = max(len(buffer) - len('<STMTTRN>'), consumed)
+            line += buffer.count('\n', counted, keep)
+            buffer = buffer[keep:]
+            if not piece:
+                break
+    if rows:
+        yield pd.DataFrame(rows, columns=['date', 'description', 'amount', 'line'])
+
+
+def parse_dates(texts, date_format='%Y-%m-%d'):
+    """
+    Parse and validate dates for a whole column at once.
+
+    Args:
+        texts (pandas.Series): The date strings.
+        date_format (str, optional): The strptime format. Defaults to '%Y-%m-%d',
+                                     the format get_valid_date accepts.
+
+    Returns:
+        numpy.ndarray: datetime64[D] dates, NaT where a string is not a valid date.
+    """
+    dates = pd.to_datetime(texts.str.strip(), format=date_format, errors='coerce')
+    return dates.to_numpy(dtype='datetime64[D]')
+
+
+def normalize_amounts(texts, spending='any'):
+    """
+    Turn statement amount strings into positive expense amounts.
+
+    Args:
+        texts (pandas.Series): The amount strings, e.g. '$1,234.50', '-12.00' or '(3.10)'.
+        spending (str, optional): How the statement signs spending:
+                                  'negative' keeps only negative amounts (bank
+                                  exports listing spending as withdrawals),
+                                  'positive' keeps only positive amounts, and
+                                  'any' keeps both. Defaults to 'any'.
+
+    Returns:
+        numpy.ndarray: The amounts as positive floats rounded to cents, NaN where
+                       the text is not a number, zero or of the wrong sign.
+    """
+    cleaned = texts.str.replace(AMOUNT_NOISE, '', regex=True)
+    negative = cleaned.str.startswith('(') & cleaned.str.endswith(')')
+    cleaned = cleaned.str.strip('()')
+    values = pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=np.float64)
+    values = np.where(negative.to_numpy(), -values, values)
+    if spending == 'negative':
+        values = np.where(values < 0, -values, np.nan)
+    elif spending == 'positive':
+        values = np.where(values > 0, values, np.nan)
+    else:
+        values = np.abs(values)
+    values = np.round(values, 2)
+    values[values == 0] = np.nan
+    return values
+
+
+def normalize_descriptions(texts):
+    """
+    Trim descriptions and collapse their inner whitespace.
+
+    Args:
+        texts (pandas.Series): The description strings.
+
+    Returns:
+        pandas.Series: The normalized descriptions.
+    """
+    return texts.astype(str).str.replace(r'\s+', ' ', regex=True).str.strip()
+
+
+def content_hashes(dates, descriptions, amounts):
+    """
+    Hash expenses by their content.
+
+    Args:
+        dates (numpy.ndarray): datetime64[D] dates.
+        descriptions (array-like): Descriptions normalized by normalize_descriptions();
+                                   case is ignored.
+        amounts (numpy.ndarray): Amounts; compared to the cent.
+
+    Returns:
+        numpy.ndarray: A uint64 hash per expense.
+    """
+    frame = pd.DataFrame({
+        'date': np.asarray(dates, dtype='datetime64[D]').astype(np.int64),
+        'description': pd.Series(descriptions, dtype=object).str.casefold(),
+        'cents': np.round(np.asarray(amounts, dtype=np.float64) * 100).astype(np.int64),
+    })
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+class HashSet:
+    """
+    Set of uint64 content hashes kept as a few sorted NumPy arrays.
+
+    New hashes are added as a sorted run; the runs are merged when there are
+    too many, so adding and looking up a chunk stays cheap while the set
+    needs only 8 bytes per hash.
+
+    Args:
+        hashes (numpy.ndarray, optional): The initial hashes. Defaults to None.
+        max_runs (int, optional): The number of runs kept before merging. Defaults to 8.
+    """
+
+    def __init__(self, hashes=None, max_runs=8):
+        self.max_runs = max_runs
+        self._runs = []
+        if hashes is not None and len(hashes):
+            self.add(hashes)
+
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
+
+    def contains(self, hashes):
+        """
+        Check many hashes at once.
+
+        Args:
+            hashes (numpy.ndarray): The hashes to look up.
+
+        Returns:
+            numpy.ndarray: True for every hash in the set.
+        """
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[positions] == hashes
+        return found
+
+    def add(self, hashes):
+        """
+        Add hashes to the set.
+
+        Args:
+            hashes (numpy.ndarray): The hashes to add.
+
+        Returns:
+            None
+        """
+        if not len(hashes):
+            return
+        self._runs.append(np.unique(hashes))
+        if len(self._runs) > self.max_runs:
+            self._runs = [np.unique(np.concatenate(self._runs))]
+
+
+def ingest_statement(store, path, sequence, fmt=None, id_format=None, date_format=None,
+                     spending='any', date_column=None, description_column=None, amount_column=None,
+                     chunk_size=CHUNK_SIZE, progress_every=PROGRESS_EVERY):
+    """
+    Import the expenses of a bank statement into the store.
+
+    Args:
+        store (ExpenseStore): The store to add the expenses to.
+        path (str): The statement file.
+        sequence (ExpenseIdSequence): The sequence the new expense IDs come from.
+        fmt (str, optional): 'csv' or 'ofx'. Defaults to None, which detects the
+                             format from the file extension.
+        id_format (str, optional): 'date' or 'integer' IDs. Defaults to None,
+                                   the ID format of the store.
+        date_format (str, optional): The strptime format of the dates. Defaults
+                                     to None: '%Y-%m-%d' for CSV, '%Y%m%d' for OFX.
+        spending (str, optional): How the statement signs spending, see
+                                  normalize_amounts(). Defaults to 'any'.
+        date_column (str, optional): The CSV date column. Defaults to None.
+        description_column (str, optional): The CSV description column. Defaults to None.
+        amount_column (str, optional): The CSV amount column. Defaults to None.
+        chunk_size (int, optional): Rows per chunk. Defaults to CHUNK_SIZE.
+        progress_every (int, optional): Rows between progress reports.
+
+    Returns:
+        tuple: The numbers of imported, invalid and duplicate rows.
+
+    Raises:
+        ValueError: If the format, the spending sign or a CSV column is unknown.
+    """
+    fmt = fmt or detect_format(path)
+    if spending not in SPENDING_SIGNS:
+        raise ValueError(f"Unknown spending sign '{spending}'. Use one of: {', '.join(SPENDING_SIGNS)}.")
+    if fmt == 'ofx':
+        chunks = read_ofx_chunks(path, chunk_size)
+        date_format = date_format or '%Y%m%d'
+    else:
+        chunks = read_csv_chunks(path, chunk_size, date_column, description_column, amount_column)
+        date_format = date_format or '%Y-%m-%d'
+
+    known = HashSet()
+    if len(store):
+        # Normalize every distinct description once, then expand by code
+        categories = normalize_descriptions(pd.Series(store.categories, dtype=object)).to_numpy(dtype=object)
+        known.add(content_hashes(store.raw_column('Date Spent'),
+                                 categories[store.raw_column('Description')],
+                                 store.column('Amount')))
+    errors = IngestErrors()
+    imported = duplicates = rows = 0
+    next_report = progress_every
+    start = time.perf_counter()
+    for chunk in chunks:
+        rows += len(chunk)
+        lines = chunk['line'].to_numpy()
+        dates = parse_dates(chunk['date'], date_format)
+        amounts = normalize_amounts(chunk['amount'], spending)
+        descriptions = normalize_descriptions(chunk['description'])
+
+        bad_date = np.isnat(dates)
+        bad_amount = np.isnan(amounts) & ~bad_date
+        bad_description = (descriptions == '').to_numpy() & ~bad_date & ~bad_amount
+        valid = ~(bad_date | bad_amount | bad_description)
+        # Recorded in file order, so the rows reported are the first invalid ones whatever the chunk size
+        messages = np.select([bad_date, bad_amount], [f"invalid date (expected {date_format})",
+                                                      "invalid amount, or not spending"], "missing description")
+        errors.add_rows(lines[~valid], messages[~valid])
+
+        dates, amounts = dates[valid], amounts[valid]
+        descriptions = descriptions.to_numpy(dtype=object)[valid]
+        hashes = content_hashes(dates, descriptions, amounts)
+        fresh = ~known.contains(hashes) & ~pd.Series(hashes).duplicated().to_numpy()
+        duplicates += len(hashes) - int(fresh.sum())
+        known.add(hashes[fresh])
+
+        count = int(fresh.sum())
+        if count:
+            store.add_columns({
+                'ID': format_ids(sequence.reserve(count), id_format or store.id_format),
+                'Description': descriptions[fresh],
+                'Amount': amounts[fresh],
+                'Date Spent': dates[fresh],
+            })
+            imported += count
+        if rows >= next_report:
+            rate = rows / (time.perf_counter() - start)
+            print(f"{rows} rows read, {imported} expenses imported ({rate:.0f} rows/sec)")
+            next_report += progress_every
+    elapsed = time.perf_counter() - start
+
+    for line, message in sorted(errors.details):
+        print(f"Skipped line {line}: {message}")
+    print(f"Imported {imported} expenses from {rows} rows in {elapsed:.2f}s "
+          f"({rows / elapsed if elapsed else 0:.0f} rows/sec), "
+          f"skipped {errors.count} invalid and {duplicates} duplicate rows.")
+    return imported, errors.count, duplicates
+
+
+def benchmark(size=2000000, seed=17):
+    """
+    Time ingesting a generated CSV statement twice; the second run only finds duplicates.
+
+    Args:
+        size (int): The number of statement rows.
+        seed (int): Seed for the random generator, for repeatable runs.
+
+    Returns:
+        None
+    """
+    rng = np.random.default_rng(seed)
+    directory = tempfile.mkdtemp(prefix='expense_ingest_')
+    try:
+        path = os.path.join(directory, 'statement.csv')
+        dates = np.datetime64('2020-01-01') + rng.integers(0, 1500, size)
+        pd.DataFrame({
+            'Transaction Date': np.datetime_as_string(dates),
+            'Payee': rng.choice(['Coffee  Shop', 'Rent', 'Bus', 'Groceries', 'Lunch'], size)
+                     + ' #' + rng.integers(0, 100000, size).astype(str),
+            'Amount': np.char.add('-$', (rng.integers(100, 500000, size) / 100).astype(str)),
+        }).to_csv(path, index=False)
+        print(f"Statement: {size} rows, {os.path.getsize(path) / 1e6:.0f} MB")
+
+        store = ExpenseStore()
+        sequence = ExpenseIdSequence()
+        for _ in range(2):
+            ingest_statement(store, path, sequence, spending='negative')
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,193 @@
+"""
+Expense Query
+
+Description:
+Query API for the Expense Tracker: find the expenses of a date range, an
+amount range and a description, sorted and limited, without printing the
+whole table.
+
+Date ranges are answered by binary search on the date index of the
+ExpenseStore, so a query reads only the rows of the range asked for, however
+many expenses there are. Amount and description filters then run on just those
+rows. Descriptions are matched once per distinct description, not once per
+expense, and the matches are looked up by description code.
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python expense_query.py    # time range queries over 10M expenses against full scans
+"""
+
+import re
+import time
+
+import numpy as np
+
+from expense_store import ExpenseStore, to_cents
+
+# Sort orders of query_expenses() and the columns they sort by
+SORT_KEYS = {'date': 'Date Spent', 'amount': 'Amount', 'description': 'Description', 'id': 'ID'}
+
+
+def matching_descriptions(store, pattern, regex=False, case=False):
+    """
+    Match a pattern against every distinct description of the store.
+
+    Args:
+        store (ExpenseStore): The expenses.
+        pattern (str): The text to look for, or a regular expression.
+        regex (bool, optional): Treat the pattern as a regular expression.
+                                Defaults to False, a plain substring.
+        case (bool, optional): Match case. Defaults to False.
+
+    Returns:
+        numpy.ndarray: True for every description code that matches.
+
+    Raises:
+        ValueError: If the regular expression is invalid.
+    """
+    if not regex:
+        pattern = re.escape(pattern)
+    try:
+        compiled = re.compile(pattern, 0 if case else re.IGNORECASE)
+    except re.error as error:
+        raise ValueError(f"Invalid pattern '{pattern}': {error}") from None
+    return np.array([compiled.search(description) is not None for description in store.categories], dtype=bool)
+
+
+def _sort_keys(store, rows, sort):
+    if sort == 'description':
+        # Rank the distinct descriptions alphabetically, then look up each code's rank
+        ranks = np.empty(len(store.categories), dtype=np.int64)
+        ranks[np.argsort(np.array(store.categories, dtype=object), kind='stable')] = np.arange(len(ranks))
+        return ranks[store.raw_column('Description', rows)]
+    return store.raw_column(SORT_KEYS[sort], rows)
+
+
+def query_expenses(store, start=None, end=None, min_amount=None, max_amount=None, description=None,
+                   regex=False, case=False, sort='date', descending=False, limit=None):
+    """
+    Find expenses by date, amount and description.
+
+    Args:
+        store (ExpenseStore): The expenses.
+        start (str, optional): The first date spent, 'YYYY-MM-DD'. Defaults to None.
+        end (str, optional): The last date spent, 'YYYY-MM-DD'. Defaults to None.
+        min_amount (float, optional): The smallest amount. Defaults to None.
+        max_amount (float, optional): The largest amount. Defaults to None.
+        description (str, optional): Text the description must contain, see
+                                     matching_descriptions(). Defaults to None.
+        regex (bool, optional): Treat description as a regular expression. Defaults to False.
+        case (bool, optional): Match the description's case. Defaults to False.
+        sort (str, optional): 'date', 'amount', 'description' or 'id'. Defaults to 'date'.
+        descending (bool, optional): Sort from the highest value. Defaults to False.
+        limit (int, optional): The most expenses returned. Defaults to None, all.
+
+    Returns:
+        pandas.DataFrame: The matching expenses with the COLUMNS. Ties keep
+                          date order.
+
+    Raises:
+        ValueError: If a date, the pattern or the sort order is invalid.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort order '{sort}'. Use one of: {', '.join(SORT_KEYS)}.")
+    rows = store.date_rows(start, end)
+    if min_amount is not None or max_amount is not None:
+        cents = store.raw_column('Amount', rows)
+        keep = np.ones(len(rows), dtype=bool)
+        if min_amount is not None:
+            keep &= cents >= to_cents(min_amount)
+        if max_amount is not None:
+            keep &= cents <= to_cents(max_amount)
+        rows = rows[keep]
+    if description is not None:
+        matches = matching_descriptions(store, description, regex, case)
+        rows = rows[matches[store.raw_column('Description', rows)]]
+
+    if sort == 'date':
+        if descending:
+            rows = rows[::-1]
+    else:
+        keys = _sort_keys(store, rows, sort)
+        if descending:
+            keys = -keys if keys.dtype != object else keys
+        if limit is not None and limit < len(rows) and keys.dtype != object:
+            # Partition first so only the rows returned are sorted. Every row tied
+            # with the last one returned stays a candidate, so ties keep date order
+            candidates = np.flatnonzero(keys <= np.partition(keys, limit - 1)[limit - 1]) if limit > 0 else np.arange(0)
+            rows, keys = rows[candidates], keys[candidates]
+        if descending and keys.dtype == object:
+            # Sort the reversed keys, then reverse back, so ties keep date order
+            order = (len(keys) - 1 - np.argsort(keys[::-1], kind='stable'))[::-1]
+        else:
+            order = np.argsort(keys, kind='stable')
+        rows = rows[order]
+    if limit is not None:
+        rows = rows[:max(limit, 0)]
+    return store.take_rows(rows)
+
+
+def benchmark(size=10000000, days=3650, seed=29):
+    """
+    Time date range queries of growing length through the date index against
+    a full scan of the date column, and queries with the other filters.
+
+    Args:
+        size (int): The number of expenses, added in random date order.
+        days (int): The number of days the expenses are spread over.
+        seed (int): Seed for the random generator, for repeatable runs.
+
+    Returns:
+        None
+    """
+    rng = np.random.default_rng(seed)
+    first = np.datetime64('2015-01-01')
+    store = ExpenseStore(size)
+    store.add_columns({
+        'ID': np.arange(1, size + 1),
+        'Description': rng.choice(np.array(['Lunch', 'Rent', 'Bus ticket', 'Groceries', 'Coffee', 'Train ticket'],
+                                           dtype=object), size),
+        'Amount': rng.integers(100, 100000, size) / 100,
+        'Date Spent': first + rng.integers(0, days, size),
+    })
+    start = time.perf_counter()
+    store.date_rows()
+    print(f"Date index over {size} expenses built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    print(f"{'range':>8} {'matches':>10} {'index':>10} {'full scan':>10}")
+    for length in (1, 7, 30, 365):
+        low, high = first + 1000, first + 1000 + length - 1
+        start = time.perf_counter()
+        rows = store.date_rows(low, high)
+        indexed = time.perf_counter() - start
+        start = time.perf_counter()
+        dates = store.raw_column('Date Spent')
+        np.flatnonzero((dates >= low) & (dates <= high))
+        scanned = time.perf_counter() - start
+        print(f"{length:>6}d {len(rows):>10} {indexed * 1000:>8.2f}ms {scanned * 1000:>8.2f}ms")
+
+    cases = [
+        ("one day as a DataFrame", lambda: query_expenses(store, '2017-09-27', '2017-09-27')),
+        ("month, amount 50-100", lambda: query_expenses(store, '2017-09-01', '2017-09-30', 50, 100)),
+        ("month, 'ticket' regex", lambda: query_expenses(store, '2017-09-01', '2017-09-30',
+                                                         description=r'(bus|train) ticket', regex=True)),
+        ("year, top 20 by amount", lambda: query_expenses(store, '2017-01-01', '2017-12-31',
+                                                          sort='amount', descending=True, limit=20)),
+        ("all, newest 20", lambda: query_expenses(store, descending=True, limit=20)),
+    ]
+    for name, case in cases:
+        start = time.perf_counter()
+        case()
+        print(f"{name:>24}: {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+    for i in range(1000):
+        store.add(size + i + 1, 'Lunch', 12.5, first + int(rng.integers(0, days)))
+    start = time.perf_counter()
+    query_expenses(store, '2017-09-27', '2017-09-27')
+    print(f"{'after 1000 adds':>24}: {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,244 @@
+"""
+Expense Reports
+
+Description:
+Vectorized reporting engine for the Expense Tracker. Every report works on the
+columns of an ExpenseStore at once with NumPy and pandas, never looping over
+expenses in Python, so reports over ten million expenses take a fraction of a
+second.
+
+Dates are datetime64[D] values, that is whole day numbers, so the expenses are
+totalled per day with a single weighted bincount. Months and years are then
+summed from the daily totals, which are only a few thousand values.
+Descriptions are already stored as integer codes and are grouped the same way.
+Amounts are summed as whole cents, so totals are exact to the cent.
+
+Reports:
+- Total and count of all expenses
+- Totals by day, month or year
+- Totals by description (category)
+- Rolling average of daily spending
+- Top-N largest expenses
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python expense_reports.py    # time every report over 10M expenses
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from expense_store import ExpenseStore
+
+PERIODS = {'day': 'datetime64[D]', 'month': 'datetime64[M]', 'year': 'datetime64[Y]'}
+
+
+def total(store):
+    """
+    Total all expenses.
+
+    Args:
+        store (ExpenseStore): The expenses.
+
+    Returns:
+        float: The sum of all amounts.
+    """
+    return int(store.raw_column('Amount').sum()) / 100
+
+
+def totals_by_period(store, period='month'):
+    """
+    Total the expenses of every day, month or year.
+
+    Args:
+        store (ExpenseStore): The expenses.
+        period (str, optional): 'day', 'month' or 'year'. Defaults to 'month'.
+
+    Returns:
+        pandas.DataFrame: 'Total' and 'Count' per period, indexed by the start
+                          of the period, oldest first. Periods without
+                          expenses are left out.
+
+    Raises:
+        ValueError: If the period is unknown.
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period '{period}'. Use one of: {', '.join(PERIODS)}.")
+    unit = PERIODS[period]
+    if not len(store):
+        return pd.DataFrame({'Total': [], 'Count': []}, index=pd.DatetimeIndex([], name=period))
+    totals, counts, first = _daily(store)
+    used = np.flatnonzero(counts)
+    days = (used + first).astype('datetime64[D]')
+    totals, counts = totals[used], counts[used]
+    if period != 'day':
+        # Only the days with expenses are cast to the coarser unit, and the
+        # days are sorted, so every period is a run of neighbouring days
+        buckets = days.astype(unit)
+        starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+        days = buckets[starts]
+        totals = np.add.reduceat(totals, starts)
+        counts = np.add.reduceat(counts, starts)
+    index = pd.DatetimeIndex(days.astype(unit), name=period)
+    return pd.DataFrame({'Total': totals / 100, 'Count': counts}, index=index)
+
+
+def _daily(store):
+    """
+    Total and count the expenses of every day from the first to the last expense.
+
+    Returns:
+        tuple: The totals in cents and the counts as arrays indexed by days
+               since the first expense, and the first day as an integer day number.
+    """
+    days = store.raw_column('Date Spent').astype(np.int64)
+    first = days.min()
+    offsets = days - first
+    # Float sums of whole cents are exact up to 2**53 cents
+    return np.bincount(offsets, weights=store.raw_column('Amount')), np.bincount(offsets), first
+
+
+def totals_by_category(store, n=None):
+    """
+    Total the expenses of every description.
+
+    Args:
+        store (ExpenseStore): The expenses.
+        n (int, optional): Only return the n categories with the highest total.
+                           Defaults to None, all categories.
+
+    Returns:
+        pandas.DataFrame: 'Total' and 'Count' per description, highest total first.
+    """
+    codes = store.raw_column('Description')
+    categories = store.categories
+    totals = np.bincount(codes, weights=store.raw_column('Amount'), minlength=len(categories))
+    counts = np.bincount(codes, minlength=len(categories))
+    # Descriptions of deleted or changed expenses stay in the categories
+    used = np.flatnonzero(counts)
+    report = pd.DataFrame({'Total': totals[used] / 100, 'Count': counts[used]},
+                          index=pd.Index(np.asarray(categories, dtype=object)[used], name='Description'))
+    report = report.sort_values('Total', ascending=False, kind='stable')
+    return report if n is None else report.head(n)
+
+
+def rolling_average(store, window=7):
+    """
+    Average the daily spending over a moving window of days.
+
+    Days without expenses count as zero spending.
+
+    Args:
+        store (ExpenseStore): The expenses.
+        window (int, optional): The window length in days. Defaults to 7.
+
+    Returns:
+        pandas.Series: The average over the window ending on every day from the
+                       first to the last expense.
+    """
+    if not len(store):
+        return pd.Series([], dtype=np.float64, index=pd.DatetimeIndex([], name='day'))
+    daily, _, first = _daily(store)
+    # Moving sums from the cumulative sum, padded so the first days average over fewer days
+    cumulative = np.concatenate(([0.0], np.cumsum(daily)))
+    ends = np.arange(1, len(daily) + 1)
+    starts = np.maximum(ends - window, 0)
+    averages = (cumulative[ends] - cumulative[starts]) / (ends - starts) / 100
+    index = pd.DatetimeIndex((np.arange(len(daily)) + first).astype('datetime64[D]'), name='day')
+    return pd.Series(averages, index=index, name=f"{window}-day average")
+
+
+def top_expenses(store, n=10):
+    """
+    Find the largest expenses.
+
+    Args:
+        store (ExpenseStore): The expenses.
+        n (int, optional): The number of expenses to return. Defaults to 10.
+
+    Returns:
+        pandas.DataFrame: The n expenses with the highest amounts, highest first.
+    """
+    amounts = store.raw_column('Amount')
+    n = min(n, len(amounts))
+    if n <= 0:
+        return store.to_frame().head(0)
+    # Partition first so only n amounts are sorted
+    rows = np.argpartition(amounts, len(amounts) - n)[len(amounts) - n:]
+    rows = rows[np.argsort(amounts[rows], kind='stable')[::-1]]
+    return store.take(rows)
+
+
+def print_summary(store, aggregates=None, top=5, window=7):
+    """
+    Print the total and the main reports of the expenses.
+
+    Args:
+        store (ExpenseStore): The expenses.
+        aggregates (ExpenseAggregates, optional): Running totals of the store.
+                                                  When given, the total and the
+                                                  month and category totals are
+                                                  read from them instead of
+                                                  recomputed. Defaults to None.
+        top (int, optional): The number of categories and expenses listed. Defaults to 5.
+        window (int, optional): The rolling average window in days. Defaults to 7.
+
+    Returns:
+        None
+    """
+    print("Total expenses summary : ", aggregates.total if aggregates else total(store))
+    if not len(store):
+        return
+    print("\nTotals by month:")
+    months = aggregates.by_month() if aggregates else totals_by_period(store, 'month')
+    print(months.to_string())
+    print(f"\nTop {top} categories:")
+    categories = aggregates.by_category(top) if aggregates else totals_by_category(store, top)
+    print(categories.to_string())
+    print(f"\nTop {top} expenses:")
+    print(top_expenses(store, top).to_string(index=False))
+    latest = rolling_average(store, window)
+    print(f"\n{window}-day average spending up to {latest.index[-1].date()}: {latest.iloc[-1]:.2f}")
+
+
+def benchmark(size=10000000, seed=5):
+    """
+    Time every report over a store of generated expenses.
+
+    Args:
+        size (int): The number of expenses.
+        seed (int): Seed for the random generator, for repeatable runs.
+
+    Returns:
+        None
+    """
+    rng = np.random.default_rng(seed)
+    store = ExpenseStore(size)
+    store.add_columns({
+        'ID': np.arange(1, size + 1),
+        'Description': rng.choice(np.array(['Lunch', 'Rent', 'Bus', 'Groceries', 'Coffee'], dtype=object), size),
+        'Amount': rng.integers(100, 100000, size) / 100,
+        'Date Spent': np.datetime64('2015-01-01') + rng.integers(0, 3650, size),
+    })
+    cases = [
+        ("total", lambda: total(store)),
+        ("totals by day", lambda: totals_by_period(store, 'day')),
+        ("totals by month", lambda: totals_by_period(store, 'month')),
+        ("totals by year", lambda: totals_by_period(store, 'year')),
+        ("totals by category", lambda: totals_by_category(store)),
+        ("7-day rolling average", lambda: rolling_average(store)),
+        ("top 10 expenses", lambda: top_expenses(store)),
+    ]
+    print(f"Reports over {size} expenses")
+    for name, case in cases:
+        start = time.perf_counter()
+        case()
+        print(f"{name:>24}: {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,513 @@
+"""
+Expense Storage
+
+Description:
+Columnar on-disk persistence for the Expense Tracker. Expenses are written to
+Parquet or Feather files partitioned by the month of 'Date Spent', one
+directory per month:
+
+    expense_data/
+        manifest.json
+        month=2024-08/part-000001.parquet
+        month=2024-08/part-000007.parquet
+        month=2024-09/part-000002.parquet
+
+New expenses are only ever appended as new part files, so adding an expense
+never rewrites history. Updates and deletes rewrite just the month they touch.
+compact() merges the many small part files left by appends into one file per
+month.
+
+The manifest lists the part files of every month with their row count and
+amount total. It is replaced atomically after every write, so a crash can only
+leave behind unlisted files, never a half-listed one. Loads read only the months
+and columns asked for, memory-mapped, and the summary of the stored history is
+answered from the manifest without opening any data file.
+
+Requires pyarrow.
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python expense_storage.py    # time appends, loads and compaction
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from expense_store import COLUMNS, to_cents
+
+FORMATS = ('parquet', 'feather')
+MANIFEST_FILE = 'manifest.json'
+
+# A month with more part files than this is compacted after an append
+MAX_PARTS_PER_MONTH = 32
+
+# A month with more deleted or replaced expenses than this is compacted
+MAX_DELETED_PER_MONTH = 256
+
+# Changes kept in memory before they are written as one part file
+MAX_PENDING_CHANGES = 1024
+
+
+def month_of(date_spent):
+    """
+    Get the partition month of a date.
+
+    Args:
+        date_spent (numpy.datetime64 or str): The date, or a string in 'YYYY-MM-DD' format.
+
+    Returns:
+        str: The month in 'YYYY-MM' format.
+    """
+    return str(np.datetime64(date_spent, 'M'))
+
+
+def _schema(id_format=None):
+    # Integer IDs are written as int64, date IDs as strings
+    id_type = pa.string() if id_format == 'date' else pa.int64()
+    return pa.schema([('ID', id_type), ('Description', pa.string()),
+                      ('Amount', pa.float64()), ('Date Spent', pa.date32())])
+
+
+def _part_number(part):
+    # Part files are named part-<number>.<format>
+    return int(os.path.basename(part['file']).split('.')[0][len('part-'):])
+
+
+class PartitionedExpenseStorage:
+    """
+    Month-partitioned Parquet/Feather files holding the expenses.
+
+    Args:
+        directory (str): The directory of the files. It is created if needed.
+        fmt (str, optional): 'parquet' or 'feather', used for new files.
+                             Defaults to 'parquet'. Existing files keep the
+                             format they were written in.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+
+    Note:
+        Register the storage as a listener of an ExpenseStore to write every
+        change of the store through to disk.
+
+        Changes from the store are collected in memory and written together
+        once MAX_PENDING_CHANGES of them are waiting, or when flush() is
+        called; loads and compaction flush first. Deleting or updating an
+        expense does not rewrite its month: the manifest records a tombstone
+        with the ID, which hides the expense in the part files written before
+        it, and the new version is written like an added expense. A month is
+        only rewritten once it collects more than MAX_DELETED_PER_MONTH
+        tombstones or MAX_PARTS_PER_MONTH part files.
+    """
+
+    def __init__(self, directory, fmt='parquet'):
+        if pa is None:
+            raise ImportError("pyarrow is required to store expenses on disk.")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}'. Use one of: {', '.join(FORMATS)}.")
+        self.directory = directory
+        self.fmt = fmt
+        os.makedirs(directory, exist_ok=True)
+        self._manifest_path = os.path.join(directory, MANIFEST_FILE)
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, encoding='utf-8') as manifest_file:
+                manifest = json.load(manifest_file)
+        else:
+            manifest = {'next_part': 1, 'partitions': {}}
+        self._next_part = manifest['next_part']
+        self._partitions = manifest['partitions']
+        # Tombstones per month: [ID, first part file number it spares, amount]
+        self._deleted = manifest.get('deleted', {})
+        self._id_format = manifest.get('id_format')
+        self._pending = []
+        self._pending_deleted = []
+        self._pending_changes = 0
+
+    @property
+    def months(self):
+        """list: The stored months in 'YYYY-MM' format, oldest first."""
+        return sorted(self._partitions)
+
+    def parts(self, month):
+        """
+        Get the part files of a month.
+
+        Args:
+            month (str): The month in 'YYYY-MM' format.
+
+        Returns:
+            list: The manifest entries, each with 'file', 'rows' and 'amount'.
+        """
+        return list(self._partitions.get(month, ()))
+
+    def deleted(self, month):
+        """
+        Get the tombstones of a month.
+
+        Args:
+            month (str): The month in 'YYYY-MM' format.
+
+        Returns:
+            list: The IDs of the expenses deleted or replaced since the month
+                  was last compacted.
+        """
+        return [entry[0] for entry in self._deleted.get(month, ())]
+
+    @property
+    def id_format(self):
+        """str or None: 'integer' or 'date', the ID format of the stored expenses; None if there are none."""
+        if self._id_format is None:
+            # Manifests written before the format was recorded
+            for month in self.months:
+                for part in self._partitions[month]:
+                    table = self._read_part(os.path.join(self.directory, part['file']), ['ID'])
+                    return 'integer' if pa.types.is_integer(table.schema.field('ID').type) else 'date'
+        return self._id_format
+
+    def summary(self, start_month=None, end_month=None):
+        """
+        Count and total the stored expenses without reading any data file.
+
+        Args:
+            start_month (str, optional): The first month to include. Defaults to None.
+            end_month (str, optional): The last month to include. Defaults to None.
+
+        Returns:
+            tuple: The number of expenses and the total amount.
+        """
+        self.flush()
+        rows = 0
+        cents = 0
+        for month in self._select(start_month, end_month):
+            for part in self._partitions[month]:
+                rows += part['rows']
+                cents += to_cents(part['amount'])
+            for _, _, amount in self._deleted.get(month, ()):
+                rows -= 1
+                cents -= to_cents(amount)
+        return rows, cents / 100
+
+    def _select(self, start_month, end_month):
+        return [month for month in self.months
+                if (start_month is None or month >= start_month)
+                and (end_month is None or month <= end_month)]
+
+    def _save_manifest(self):
+        manifest = {'next_part': self._next_part, 'partitions': self._partitions,
+                    'deleted': self._deleted, 'id_format': self._id_format}
+        temp_path = self._manifest_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file)
+            manifest_file.flush()
+            os.fsync(manifest_file.fileno())
+        os.replace(temp_path, self._manifest_path)
+
+    def _write_part(self, month, frame):
+        name = f"part-{self._next_part:06d}.{self.fmt}"
+        self._next_part += 1
+        relative = os.path.join(f"month={month}", name)
+        path = os.path.join(self.directory, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # IDs are strings or integers depending on the tracker's ID format
+        ids = pa.array(frame['ID'].to_numpy())
+        if self._id_format is None:
+            self._id_format = 'integer' if pa.types.is_integer(ids.type) else 'date'
+        table = pa.table({
+            'ID': ids.cast(_schema(self._id_format).field('ID').type),
+            'Description': pa.array(frame['Description'].to_numpy(), pa.string()),
+            'Amount': pa.array(frame['Amount'].to_numpy(), pa.float64()),
+            'Date Spent': pa.array(frame['Date Spent'].to_numpy('datetime64[D]'), pa.date32()),
+        })
+        if self.fmt == 'parquet':
+            pq.write_table(table, path)
+        else:
+            # Uncompressed Feather files can be memory-mapped without copying
+            feather.write_feather(table, path, compression='uncompressed')
+        return {'file': relative, 'rows': len(frame), 'amount': int(to_cents(frame['Amount']).sum()) / 100}
+
+    @staticmethod
+    def _read_part(path, columns):
+        if path.endswith('.feather'):
+            return feather.read_table(path, columns=columns, memory_map=True)
+        return pq.read_table(path, columns=columns, memory_map=True)
+
+    def _read_month(self, month, columns=None):
+        deleted = self._deleted.get(month, ())
+        tables = []
+        for part in self._partitions.get(month, ()):
+            path = os.path.join(self.directory, part['file'])
+            number = _part_number(part)
+            dead = [expense_id for expense_id, spares, _ in deleted if number < spares]
+            if not dead:
+                tables.append(self._read_part(path, columns))
+                continue
+            # The ID column is needed to drop the deleted expenses
+            read = None if columns is None else list(dict.fromkeys([*columns, 'ID']))
+            table = self._read_part(path, read)
+            alive = pc.invert(pc.is_in(table['ID'], value_set=pa.array(dead, table.schema.field('ID').type)))
+            table = table.filter(alive)
+            tables.append(table if columns is None else table.select(columns))
+        return tables
+
+    def load(self, start_month=None, end_month=None, columns=None):
+        """
+        Read stored expenses, pruned to the months and columns asked for.
+
+        Only the part files of the selected months are opened, only the
+        selected columns are read, and files are memory-mapped.
+
+        Args:
+            start_month (str, optional): The first month to read, 'YYYY-MM'.
+                                         Defaults to None, the oldest month.
+            end_month (str, optional): The last month to read, 'YYYY-MM'.
+                                       Defaults to None, the newest month.
+            columns (list, optional): The columns to read. Defaults to all COLUMNS.
+
+        Returns:
+            pandas.DataFrame: The expenses, ordered by month.
+        """
+        self.flush()
+        columns = list(columns or COLUMNS)
+        tables = []
+        for month in self._select(start_month, end_month):
+            tables.extend(self._read_month(month, columns))
+        if not tables:
+            return _schema(self._id_format).empty_table().select(columns).to_pandas(date_as_object=False)
+        return pa.concat_tables(tables).to_pandas(date_as_object=False)
+
+    def load_into(self, store, start_month=None, end_month=None):
+        """
+        Add the stored expenses to an ExpenseStore.
+
+        Expenses the store holds already, e.g. ones added since the storage
+        was opened, are skipped.
+
+        Args:
+            store (ExpenseStore): The store to fill. This storage must not be
+                                  a listener of the store while it loads, or
+                                  the expenses are written a second time.
+                                  Its ID format must be the stored one.
+            start_month (str, optional): The first month to load. Defaults to None.
+            end_month (str, optional): The last month to load. Defaults to None.
+
+        Returns:
+            int: The number of expenses loaded.
+        """
+        frame = self.load(start_month, end_month)
+        if len(store):
+            frame = frame[~frame['ID'].isin(store.column('ID'))]
+        if store.id_format == 'integer':
+            # Added in ID order, the store finds integer IDs by binary search
+            frame = frame.sort_values('ID', kind='stable')
+        return store.add_columns({name: frame[name].to_numpy() for name in COLUMNS})
+
+    def append(self, frame):
+        """
+        Append expenses as new part files, one per month they fall in.
+
+        Args:
+            frame (pandas.DataFrame): The expenses to append, with the COLUMNS.
+
+        Returns:
+            None
+
+        Note:
+            Existing files are never changed. A month that collects more than
+            MAX_PARTS_PER_MONTH part files is compacted afterwards.
+        """
+        self.flush()
+        self._write(frame, [])
+
+    def flush(self):
+        """
+        Write the changes collected in memory: one part file per month for the
+        added and updated expenses, and one manifest update for everything.
+
+        Returns:
+            None
+        """
+        if not self._pending_changes:
+            return
+        frame = pd.DataFrame({name: np.concatenate([columns[name] for columns in self._pending])
+                              for name in COLUMNS}) if self._pending else pd.DataFrame(columns=list(COLUMNS))
+        deleted = self._pending_deleted
+        self._pending = []
+        self._pending_deleted = []
+        self._pending_changes = 0
+        self._write(frame, deleted)
+
+    def _write(self, frame, deleted):
+        crowded = set()
+        # Tombstones hide their expense in the part files written before them
+        spares = self._next_part
+        for month, expense_id, amount in deleted:
+            self._deleted.setdefault(month, []).append([expense_id, spares, amount])
+            if len(self._deleted[month]) > MAX_DELETED_PER_MONTH:
+                crowded.add(month)
+        if len(frame):
+            months = frame['Date Spent'].to_numpy(dtype='datetime64[M]').astype(str)
+            for month, rows in frame.groupby(months, sort=True):
+                self._partitions.setdefault(month, []).append(self._write_part(month, rows))
+                if len(self._partitions[month]) > MAX_PARTS_PER_MONTH:
+                    crowded.add(month)
+        if len(frame) or deleted:
+            self._save_manifest()
+        for month in sorted(crowded):
+            self._rewrite_month(month)
+
+    def _rewrite_month(self, month):
+        """
+        Replace all part files of a month with a single one without the
+        deleted expenses.
+
+        Args:
+            month (str): The month to rewrite.
+
+        Returns:
+            None
+        """
+        old_parts = self._partitions.get(month, [])
+        tables = self._read_month(month)
+        frame = pa.concat_tables(tables).to_pandas(date_as_object=False) if tables else None
+        if frame is not None and len(frame):
+            self._partitions[month] = [self._write_part(month, frame)]
+        else:
+            self._partitions.pop(month, None)
+        self._deleted.pop(month, None)
+        self._save_manifest()
+        for part in old_parts:
+            os.remove(os.path.join(self.directory, part['file']))
+        if month not in self._partitions:
+            shutil.rmtree(os.path.join(self.directory, f"month={month}"), ignore_errors=True)
+
+    def compact(self, min_parts=2):
+        """
+        Merge the part files of every month that has several of them, or
+        tombstones to apply.
+
+        Args:
+            min_parts (int, optional): Compact months with at least this many
+                                       part files. Defaults to 2.
+
+        Returns:
+            int: The number of months compacted.
+        """
+        self.flush()
+        months = [month for month in self.months
+                  if len(self._partitions[month]) >= min_parts or self._deleted.get(month)]
+        for month in months:
+            self._rewrite_month(month)
+        return len(months)
+
+    def on_add(self, columns):
+        self._add({name: np.asarray(columns[name]) for name in COLUMNS})
+
+    def on_update(self, old, new):
+        self._delete(old)
+        self._add({name: np.array([new[name]]) for name in COLUMNS})
+
+    def on_delete(self, old):
+        self._delete(old)
+
+    def _add(self, columns):
+        self._pending.append(columns)
+        self._pending_changes += len(columns['ID'])
+        if self._pending_changes >= MAX_PENDING_CHANGES:
+            self.flush()
+
+    def _delete(self, old):
+        expense_id = old['ID'].item() if isinstance(old['ID'], np.generic) else old['ID']
+        # An expense that was not written yet is simply dropped
+        for index, columns in enumerate(self._pending):
+            match = columns['ID'] == expense_id
+            if match.any():
+                self._pending[index] = {name: values[~match] for name, values in columns.items()}
+                self._pending_changes -= int(match.sum())
+                return
+        self._pending_deleted.append((month_of(old['Date Spent']), expense_id, float(old['Amount'])))
+        self._pending_changes += 1
+        if self._pending_changes >= MAX_PENDING_CHANGES:
+            self.flush()
+
+
+def benchmark(size=2000000, months=24, batches=200, seed=3, edits=1000):
+    """
+    Time appends, single adds and deletes from a store, full and pruned loads,
+    the manifest summary and compaction.
+
+    Args:
+        size (int): The number of expenses stored.
+        months (int): The number of months the expenses are spread over.
+        batches (int): The number of appends the expenses are written in.
+        seed (int): Seed for the random generator, for repeatable runs.
+        edits (int): The number of single adds and deletes timed.
+
+    Returns:
+        None
+    """
+    rng = np.random.default_rng(seed)
+    days = np.datetime64('2023-01-01') + np.sort(rng.integers(0, months * 30, size))
+    frame = pd.DataFrame({
+        'ID': [f"e{i}" for i in range(size)],
+        'Description': rng.choice(['Lunch', 'Rent', 'Bus', 'Groceries', 'Coffee'], size),
+        'Amount': rng.integers(100, 100000, size) / 100,
+        'Date Spent': days,
+    })
+    step = -(-size // batches)
+
+    columns = {name: frame[name].to_numpy() for name in COLUMNS}
+
+    def single_adds(storage):
+        for i in range(edits):
+            added = {name: values[i:i + 1] for name, values in columns.items()}
+            storage.on_add(dict(added, ID=np.array([f"n{i}"], dtype=object)))
+        storage.flush()
+
+    def single_deletes(storage):
+        for i in range(0, size, size // edits)[:edits]:
+            storage.on_delete({name: values[i] for name, values in columns.items()})
+        storage.flush()
+
+    for fmt in FORMATS:
+        directory = tempfile.mkdtemp(prefix='expense_storage_')
+        try:
+            storage = PartitionedExpenseStorage(directory, fmt)
+            print(f"{fmt}: {size} expenses over {months} months")
+            cases = [
+                (f"append in {batches} batches", lambda: [storage.append(frame[i:i + step])
+                                                          for i in range(0, size, step)]),
+                (f"{edits} single adds", lambda: single_adds(storage)),
+                (f"{edits} single deletes", lambda: single_deletes(storage)),
+                ("summary from manifest", storage.summary),
+                ("load everything", storage.load),
+                ("load one month", lambda: storage.load(storage.months[-1], storage.months[-1])),
+                ("load Amount column", lambda: storage.load(columns=['Amount'])),
+                ("compact", storage.compact),
+                ("load after compaction", storage.load),
+            ]
+            for name, case in cases:
+                start = time.perf_counter()
+                case()
+                print(f"{name:>28}: {(time.perf_counter() - start) * 1000:9.1f} ms")
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,746 @@
+"""
+Expense Store
+
+Description:
+Columnar in-memory storage for the Expense Tracker. Every column of the expense
+table (ID, Description, Amount, Date Spent) is kept in its own preallocated
+NumPy array. When an array is full its capacity is doubled, so adding N
+expenses copies each row only a constant number of times on average. The pandas
+DataFrame shown by the tracker is built lazily, only when a view or summary
+asks for it, and is cached until the expenses change.
+
+The columns use a compact schema, 28 bytes per expense:
+- ID: int64 ('integer' IDs) or Python strings ('date' IDs)
+- Description: int32 codes into the list of distinct descriptions, so every
+  description is stored once, however many expenses share it
+- Amount: int64 cents, so totals are exact instead of rounded float sums
+- Date Spent: datetime64[D]
+
+column() and row() turn codes back into descriptions and cents into amounts;
+raw_column() gives the stored values.
+
+Integer IDs handed out by the ID sequence only grow, so the ID column stays
+sorted and an expense is found by binary search on it, without any index. Only
+when IDs arrive out of order, and always for 'date' IDs, a dictionary maps
+every ID to its row. Either way finding, updating and deleting an expense take
+microseconds no matter how many expenses there are. Updates
+change the row in place. Deletes only mark the row as deleted (a tombstone);
+the rows are compacted once a quarter of them are tombstones, so the cost of
+moving rows is spread over many deletes.
+
+Queries by date are answered from a second index, the rows sorted by date,
+by binary search. It is built on the first query and then kept up to date
+without sorting again.
+
+Other parts of the tracker, such as the on-disk storage, follow the changes of
+a store by registering a listener with add_listener().
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python expense_store.py    # benchmark adds, lookups against boolean masks, and memory per row
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ('ID', 'Description', 'Amount', 'Date Spent')
+# Stored dtypes of the columns; the ID dtype depends on the ID format
+DTYPES = {'Description': np.int32, 'Amount': np.int64, 'Date Spent': 'datetime64[D]'}
+ID_DTYPES = {'integer': np.int64, 'date': object}
+
+# Number of rows the columns have room for before they first grow
+INITIAL_CAPACITY = 1024
+
+# Rows are compacted when tombstones make up this share of them...
+COMPACT_RATIO = 0.25
+
+# ...and there are at least this many tombstones
+COMPACT_MIN_TOMBSTONES = 1024
+
+
+def to_cents(amounts):
+    """
+    Convert amounts to whole cents, rounding to the nearest cent.
+
+    Args:
+        amounts (float or array-like): The amounts.
+
+    Returns:
+        int or numpy.ndarray: The amounts in cents, as an int or an int64 array.
+    """
+    if isinstance(amounts, (int, float, np.generic)) or np.ndim(amounts) == 0:
+        return int(round(float(amounts) * 100))
+    return np.rint(np.asarray(amounts, dtype=np.float64) * 100).astype(np.int64)
+
+
+class ExpenseStore:
+    """
+    Expense table stored as growable NumPy columns.
+
+    Args:
+        capacity (int, optional): The number of rows to preallocate.
+                                  Defaults to INITIAL_CAPACITY.
+        id_format (str, optional): 'integer' for int64 IDs or 'date' for
+                                   '<date>_<number>' string IDs. Defaults to 'integer'.
+
+    Note:
+        Rows are numbered in the order expenses were added, and deleted rows
+        keep their number until the next compaction. Row numbers returned by
+        find() are therefore only valid until the next change.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY, id_format='integer'):
+        if id_format not in ID_DTYPES:
+            raise ValueError(f"Unknown ID format '{id_format}'. Use one of: {', '.join(ID_DTYPES)}.")
+        capacity = max(capacity, 1)
+        self.id_format = id_format
+        dtypes = dict(DTYPES, ID=ID_DTYPES[id_format])
+        self._columns = {name: np.empty(capacity, dtype=dtypes[name]) for name in COLUMNS}
+        self._live = np.zeros(capacity, dtype=bool)
+        # None while the IDs are sorted integers, found by binary search
+        self._index = None if id_format == 'integer' else {}
+        self._categories = []
+        self._codes = {}
+        self._dtype = None
+        self._category_array = None
+        self._size = 0
+        self._tombstones = 0
+        self._frame = None
+        self._listeners = []
+        # Rows sorted by date, with their dates, covering the rows below _dated
+        self._date_rows = None
+        self._date_keys = None
+        self._dated = 0
+
+    def add_listener(self, listener):
+        """
+        Register an object that is told about every change of the store.
+
+        The listener must have three methods:
+        - on_add(columns): called after expenses were added, with a dict of the
+          COLUMNS names to the new rows, as returned by column() except that
+          descriptions are an object array
+        - on_update(old, new): called after an expense changed, with dicts of
+          the expense before and after the change, as returned by row()
+        - on_delete(old): called after an expense was deleted, with a dict of
+          the deleted expense
+
+        Args:
+            listener: The object to notify.
+
+        Returns:
+            None
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Stop notifying a listener registered with add_listener().
+
+        Args:
+            listener: The object to stop notifying.
+
+        Returns:
+            None
+        """
+        self._listeners.remove(listener)
+
+    def __len__(self):
+        return self._size - self._tombstones
+
+    def __contains__(self, expense_id):
+        return self.find(expense_id) is not None
+
+    @property
+    def capacity(self):
+        return len(self._columns['ID'])
+
+    @property
+    def categories(self):
+        """list: The distinct descriptions, indexed by the codes in raw_column('Description')."""
+        return self._categories
+
+    def _reserve(self, needed):
+        capacity = self.capacity
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+        live = np.zeros(capacity, dtype=bool)
+        live[:self._size] = self._live[:self._size]
+        self._live = live
+
+    def _code(self, description):
+        code = self._codes.get(description)
+        if code is None:
+            code = self._codes[description] = len(self._categories)
+            self._categories.append(description)
+            self._dtype = None
+            self._category_array = None
+        return code
+
+    def _encode(self, descriptions):
+        codes, uniques = pd.factorize(np.asarray(descriptions, dtype=object))
+        # Only the distinct descriptions go through the dictionary
+        mapping = np.array([self._code(description) for description in uniques], dtype=np.int32)
+        return mapping[codes]
+
+    def _decode(self, name, values):
+        if name == 'Amount':
+            return values / 100
+        if name == 'Description':
+            if self._dtype is None:
+                self._dtype = pd.CategoricalDtype(pd.Index(self._categories, dtype=object))
+            return pd.Categorical.from_codes(values, dtype=self._dtype)
+        return values
+
+    def _descriptions(self, codes):
+        # An object array is much cheaper than a Categorical for a few rows
+        if self._category_array is None:
+            self._category_array = np.array(self._categories, dtype=object)
+        return self._category_array[codes]
+
+    def raw_column(self, name, rows=None):
+        """
+        Get a column of all expenses as stored.
+
+        Args:
+            name (str): One of COLUMNS.
+            rows (array-like, optional): Only get the values of these row
+                                         numbers, e.g. from date_rows().
+                                         Defaults to None, all expenses.
+
+        Returns:
+            numpy.ndarray: The values in row order: int64 cents for 'Amount'
+                           and int32 codes into categories for 'Description'.
+                           Without tombstones this is a view of the column,
+                           otherwise a copy without the deleted rows; either is
+                           only valid until the next change.
+        """
+        if rows is not None:
+            return self._columns[name][rows]
+        values = self._columns[name][:self._size]
+        if self._tombstones:
+            return values[self._live[:self._size]]
+        return values
+
+    def column(self, name):
+        """
+        Get a column of all expenses.
+
+        Args:
+            name (str): One of COLUMNS.
+
+        Returns:
+            numpy.ndarray or pandas.Categorical: The values in row order:
+                float64 amounts for 'Amount' and a Categorical for
+                'Description'. IDs and dates are a view when there are no
+                tombstones, only valid until the next change.
+        """
+        return self._decode(name, self.raw_column(name))
+
+    def take(self, positions):
+        """
+        Get some expenses by their position in column() order.
+
+        Args:
+            positions (array-like): Positions of the expenses, as indexes into column().
+
+        Returns:
+            pandas.DataFrame: The expenses with the columns in COLUMNS.
+        """
+        rows = np.asarray(positions, dtype=np.intp)
+        if self._tombstones:
+            rows = np.flatnonzero(self._live[:self._size])[rows]
+        return self.take_rows(rows)
+
+    def take_rows(self, rows):
+        """
+        Get some expenses by their row number.
+
+        Args:
+            rows (array-like): Row numbers, e.g. from find() or date_rows().
+
+        Returns:
+            pandas.DataFrame: The expenses with the columns in COLUMNS, in the given order.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        return pd.DataFrame({name: self._decode(name, self._columns[name][rows]) for name in COLUMNS})
+
+    def _index_dates(self):
+        if self._date_rows is None:
+            rows = np.flatnonzero(self._live[:self._size])
+            dates = self._columns['Date Spent'][rows]
+            order = np.argsort(dates, kind='stable')
+            self._date_rows, self._date_keys = rows[order], dates[order]
+        elif self._dated < self._size:
+            # Merge the rows added since, so the index is never sorted again
+            rows = np.arange(self._dated, self._size)
+            rows = rows[self._live[rows]]
+            dates = self._columns['Date Spent'][rows]
+            order = np.argsort(dates, kind='stable')
+            at = self._date_keys.searchsorted(dates[order], side='right')
+            self._date_rows = np.insert(self._date_rows, at, rows[order])
+            self._date_keys = np.insert(self._date_keys, at, dates[order])
+        self._dated = self._size
+
+    def _move_date(self, row, old_date, new_date):
+        keys = self._date_keys
+        start, end = keys.searchsorted(old_date, 'left'), keys.searchsorted(old_date, 'right')
+        at = start + int(self._date_rows[start:end].searchsorted(row))
+        self._date_rows = np.delete(self._date_rows, at)
+        self._date_keys = keys = np.delete(keys, at)
+        # Rows of the same day stay in row order
+        start, end = keys.searchsorted(new_date, 'left'), keys.searchsorted(new_date, 'right')
+        at = start + int(self._date_rows[start:end].searchsorted(row))
+        self._date_rows = np.insert(self._date_rows, at, row)
+        self._date_keys = np.insert(keys, at, new_date)
+
+    def date_rows(self, start=None, end=None):
+        """
+        Find the expenses spent between two dates by binary search.
+
+        The rows are kept sorted by date in an index that is built by the
+        first call and then kept up to date: added rows are merged in, a
+        changed date moves one row, and deleted rows are skipped. Only the
+        part of the index between the two dates is read.
+
+        Args:
+            start (str or numpy.datetime64, optional): The first date. Defaults
+                                                       to None, the first expense.
+            end (str or numpy.datetime64, optional): The last date. Defaults to
+                                                     None, the last expense.
+
+        Returns:
+            numpy.ndarray: The row numbers of the expenses, oldest first and in
+                           row order within a day; valid until the next change.
+
+        Raises:
+            ValueError: If a date is not valid.
+        """
+        start = None if start is None else np.datetime64(start, 'D')
+        end = None if end is None else np.datetime64(end, 'D')
+        self._index_dates()
+        low = 0 if start is None else int(self._date_keys.searchsorted(start, 'left'))
+        high = len(self._date_keys) if end is None else int(self._date_keys.searchsorted(end, 'right'))
+        rows = self._date_rows[low:max(low, high)]
+        if self._tombstones:
+            rows = rows[self._live[rows]]
+        return rows
+
+    def compact(self):
+        """
+        Drop the rows of deleted expenses and renumber the remaining rows.
+
+        Returns:
+            int: The number of rows dropped.
+        """
+        dropped = self._tombstones
+        if not dropped:
+            return 0
+        live = self._live[:self._size]
+        size = self._size - dropped
+        for column in self._columns.values():
+            column[:size] = column[:self._size][live]
+            if column.dtype == object:
+                # Release the references held by the rows past the end
+                column[size:self._size] = None
+        if self._date_rows is not None:
+            # Renumber the date index instead of sorting again
+            indexed = self._live[self._date_rows]
+            renumbered = np.cumsum(live) - 1
+            self._date_rows = renumbered[self._date_rows[indexed]]
+            self._date_keys = self._date_keys[indexed]
+            self._dated = int(live[:self._dated].sum())
+        self._live[:size] = True
+        self._live[size:self._size] = False
+        self._size = size
+        self._tombstones = 0
+        if self._index is not None:
+            self._index = dict(zip(self._columns['ID'][:size].tolist(), range(size)))
+        return dropped
+
+    def row(self, row):
+        """
+        Get the expense stored in a row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            dict: The fields of the expense, keyed by the COLUMNS names, with
+                  the amount as a float.
+        """
+        columns = self._columns
+        return {'ID': columns['ID'][row].item() if self.id_format == 'integer' else columns['ID'][row],
+                'Description': self._categories[columns['Description'][row]],
+                'Amount': int(columns['Amount'][row]) / 100,
+                'Date Spent': columns['Date Spent'][row]}
+
+    def add(self, expense_id, description, amount, date_spent):
+        """
+        Append an expense.
+
+        Args:
+            expense_id (int or str): The ID of the expense.
+            description (str): The description of the expense.
+            amount (float): The amount spent; stored to the cent.
+            date_spent (str or numpy.datetime64): The date spent, as a string
+                                                 in 'YYYY-MM-DD' format or a date.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If date_spent is not a valid date, the ID does not
+                        match the ID format, or an expense with the same ID exists.
+        """
+        if self._index is None and self._size and not expense_id > self._columns['ID'][self._size - 1]:
+            self._build_index()
+        if self._index is not None and expense_id in self._index:
+            raise ValueError(f"Expense with ID {expense_id} already exists.")
+        self._reserve(self._size + 1)
+        row = self._size
+        columns = self._columns
+        columns['Date Spent'][row] = date_spent
+        columns['ID'][row] = expense_id
+        columns['Amount'][row] = to_cents(amount)
+        columns['Description'][row] = self._code(description)
+        self._live[row] = True
+        if self._index is not None:
+            self._index[expense_id] = row
+        self._size += 1
+        self._frame = None
+        if self._listeners:
+            self._notify_add(row, self._size)
+
+    def add_many(self, rows):
+        """
+        Append many expenses at once.
+
+        Args:
+            rows (iterable): (expense_id, description, amount, date_spent) tuples.
+
+        Returns:
+            int: The number of expenses added.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        return self.add_columns(dict(zip(COLUMNS, zip(*rows))))
+
+    def add_columns(self, columns):
+        """
+        Append many expenses given column by column, e.g. from a DataFrame.
+
+        Args:
+            columns: A mapping of every name in COLUMNS to a sequence of values,
+                     all of the same length.
+
+        Returns:
+            int: The number of expenses added.
+
+        Raises:
+            ValueError: If an ID is used twice or by an existing expense; then
+                        nothing is added.
+        """
+        count = len(columns['ID'])
+        if not count:
+            return 0
+        start = self._size
+        end = start + count
+        ids = np.asarray(columns['ID'], dtype=self._columns['ID'].dtype)
+        if self._index is None and not ((not start or ids[0] > self._columns['ID'][start - 1])
+                                        and (ids[1:] > ids[:-1]).all()):
+            self._build_index()
+        if self._index is not None:
+            index = dict(zip(ids.tolist(), range(start, end)))
+            if len(index) != count or not self._index.keys().isdisjoint(index):
+                raise ValueError("Expense IDs must be unique.")
+        values = {'ID': ids,
+                  'Amount': to_cents(columns['Amount']),
+                  'Date Spent': np.asarray(columns['Date Spent'], dtype=DTYPES['Date Spent'])}
+        values['Description'] = self._encode(columns['Description'])
+        self._reserve(end)
+        for name in COLUMNS:
+            self._columns[name][start:end] = values[name]
+        self._live[start:end] = True
+        if self._index is not None:
+            self._index.update(index)
+        self._size = end
+        self._frame = None
+        if self._listeners:
+            self._notify_add(start, end)
+        return count
+
+    def _build_index(self):
+        # IDs arrived out of order: switch from binary search to a dictionary
+        ids = self._columns['ID'][:self._size]
+        live = np.flatnonzero(self._live[:self._size])
+        self._index = dict(zip(ids[live].tolist(), live.tolist()))
+
+    def _notify_add(self, start, end):
+        added = {name: self._decode(name, self._columns[name][start:end]) if name != 'Description'
+                 else self._descriptions(self._columns[name][start:end]) for name in COLUMNS}
+        for listener in self._listeners:
+            listener.on_add(added)
+
+    def find(self, expense_id):
+        """
+        Find the row of an expense.
+
+        Args:
+            expense_id (int or str): The ID of the expense.
+
+        Returns:
+            int or None: The row number, or None if there is no such expense.
+        """
+        if self._index is not None:
+            return self._index.get(expense_id)
+        if not isinstance(expense_id, (int, np.integer)):
+            return None
+        ids = self._columns['ID'][:self._size]
+        row = int(ids.searchsorted(expense_id))
+        if row < self._size and ids[row] == expense_id and self._live[row]:
+            return row
+        return None
+
+    def update(self, expense_id, description=None, amount=None, date_spent=None):
+        """
+        Change the fields of an expense in place.
+
+        Args:
+            expense_id (int or str): The ID of the expense.
+            description (str, optional): The new description. Defaults to None.
+            amount (float, optional): The new amount spent. Defaults to None.
+            date_spent (str, optional): The new date spent. Defaults to None.
+
+        Returns:
+            bool: True if the expense exists.
+
+        Raises:
+            ValueError: If date_spent is not a valid date.
+
+        Note:
+            Fields given as None are left unchanged.
+        """
+        if date_spent is not None:
+            date_spent = np.datetime64(date_spent, 'D')
+        row = self.find(expense_id)
+        if row is None:
+            return False
+        old = self.row(row) if self._listeners else None
+        if date_spent is not None and self._date_rows is not None and row < self._dated:
+            old_date = self._columns['Date Spent'][row]
+            if old_date != date_spent:
+                self._move_date(row, old_date, date_spent)
+        if description is not None:
+            self._columns['Description'][row] = self._code(description)
+        if amount is not None:
+            self._columns['Amount'][row] = to_cents(amount)
+        if date_spent is not None:
+            self._columns['Date Spent'][row] = date_spent
+        self._frame = None
+        if self._listeners:
+            new = self.row(row)
+            for listener in self._listeners:
+                listener.on_update(old, new)
+        return True
+
+    def delete(self, expense_id):
+        """
+        Remove an expense, keeping the remaining rows in order.
+
+        The row is marked as deleted and dropped by the next compaction, which
+        runs once COMPACT_RATIO of the rows are deleted.
+
+        Args:
+            expense_id (int or str): The ID of the expense.
+
+        Returns:
+            bool: True if the expense existed.
+        """
+        row = self.find(expense_id)
+        if row is None:
+            return False
+        old = self.row(row) if self._listeners else None
+        if self._index is not None:
+            del self._index[expense_id]
+        self._live[row] = False
+        self._tombstones += 1
+        self._frame = None
+        if self._tombstones >= max(COMPACT_MIN_TOMBSTONES, self._size * COMPACT_RATIO):
+            self.compact()
+        for listener in self._listeners:
+            listener.on_delete(old)
+        return True
+
+    def to_frame(self):
+        """
+        Get the expenses as a pandas DataFrame.
+
+        The DataFrame is built on the first call after a change and reused
+        until the next one.
+
+        Returns:
+            pandas.DataFrame: The expenses with the columns in COLUMNS, the
+                              descriptions as a categorical column.
+
+        Note:
+            The DataFrame is a copy; changing it does not change the store.
+        """
+        if self._frame is None:
+            self._frame = pd.DataFrame({name: self._decode(name, self.raw_column(name).copy())
+                                        for name in COLUMNS})
+        return self._frame
+
+
+def benchmark(sizes=(250000, 500000, 1000000), rebuild_sizes=(1000, 2000, 4000)):
+    """
+    Compare adding expenses one at a time to an ExpenseStore with rebuilding a
+    DataFrame from a list after every add, as addExpense used to do.
+
+    The time per add stays flat for the store, so the total cost is linear,
+    while it grows with the number of expenses when the DataFrame is rebuilt.
+
+    Args:
+        sizes (tuple): The numbers of expenses added to the store.
+        rebuild_sizes (tuple): The numbers of expenses added with a rebuild per add.
+
+    Returns:
+        None
+    """
+    print(f"{'method':>18} {'expenses':>10} {'total':>10} {'per add':>10}")
+    for size in rebuild_sizes:
+        tracker_list = []
+        start = time.perf_counter()
+        for i in range(size):
+            tracker_list.append([f"2024-08-12_{i}", "Lunch", 12.5, "2024-08-12"])
+            pd.DataFrame(tracker_list, columns=list(COLUMNS))
+        elapsed = time.perf_counter() - start
+        print(f"{'DataFrame rebuild':>18} {size:>10} {elapsed:>9.2f}s {elapsed / size * 1e6:>8.1f}us")
+
+    for size in sizes:
+        store = ExpenseStore(id_format='date')
+        start = time.perf_counter()
+        for i in range(size):
+            store.add(f"2024-08-12_{i}", "Lunch", 12.5, "2024-08-12")
+        store.to_frame()
+        elapsed = time.perf_counter() - start
+        print(f"{'ExpenseStore':>18} {size:>10} {elapsed:>9.2f}s {elapsed / size * 1e6:>8.1f}us")
+
+
+def benchmark_lookups(sizes=(100000, 1000000, 3000000), mask_operations=20, operations=100000, seed=13):
+    """
+    Compare updating and deleting single expenses through the ID index with
+    the boolean masks over a DataFrame that the tracker used to build.
+
+    Args:
+        sizes (tuple): The numbers of expenses.
+        mask_operations (int): The number of updates and deletes timed with masks.
+        operations (int): The number of updates and deletes timed with the index.
+        seed (int): Seed for the random generator, for repeatable runs.
+
+    Returns:
+        None
+    """
+    rng = np.random.default_rng(seed)
+    print(f"{'method':>14} {'expenses':>10} {'update':>12} {'delete':>12}")
+    for size in sizes:
+        ids = np.array([f"2024-08-12_{i}" for i in range(size)], dtype=object)
+        columns = {'ID': ids, 'Description': np.full(size, 'Lunch', dtype=object),
+                   'Amount': np.full(size, 12.5), 'Date Spent': np.full(size, '2024-08-12', dtype='datetime64[D]')}
+        picks = ids[rng.permutation(size)]
+
+        df = pd.DataFrame(columns)
+        start = time.perf_counter()
+        for expense_id in picks[:mask_operations]:
+            df.loc[df['ID'] == expense_id, 'Amount'] = 20.0
+        update_time = (time.perf_counter() - start) / mask_operations
+        start = time.perf_counter()
+        for expense_id in picks[:mask_operations]:
+            if (df['ID'] == expense_id).any():
+                df = df.drop(df[df['ID'] == expense_id].index)
+        delete_time = (time.perf_counter() - start) / mask_operations
+        print(f"{'boolean mask':>14} {size:>10} {update_time * 1e6:>10.1f}us {delete_time * 1e6:>10.1f}us")
+
+        store = ExpenseStore(size, id_format='date')
+        store.add_columns(columns)
+        count = min(operations, size // 2)
+        start = time.perf_counter()
+        for expense_id in picks[:count]:
+            store.update(expense_id, amount=20.0)
+        update_time = (time.perf_counter() - start) / count
+        start = time.perf_counter()
+        for expense_id in picks[:count]:
+            store.delete(expense_id)
+        delete_time = (time.perf_counter() - start) / count
+        print(f"{'ID index':>14} {size:>10} {update_time * 1e6:>10.1f}us {delete_time * 1e6:>10.1f}us")
+
+
+def _index_bytes(index):
+    # The dictionary itself plus the int and str objects it holds
+    if index is None:
+        return 0
+    return sys.getsizeof(index) + sum(map(sys.getsizeof, index)) + sum(map(sys.getsizeof, index.values()))
+
+
+def benchmark_memory(size=10000000, seed=19):
+    """
+    Compare the memory per expense of the DataFrame the tracker used to build,
+    with Python strings for IDs, descriptions and dates and float amounts, and
+    of the compact ExpenseStore columns.
+
+    Args:
+        size (int): The number of expenses.
+        seed (int): Seed for the random generator, for repeatable runs.
+
+    Returns:
+        None
+    """
+    rng = np.random.default_rng(seed)
+    descriptions = ['Lunch', 'Rent', 'Bus', 'Groceries', 'Coffee', 'Electricity bill', 'Cinema tickets']
+    picks = rng.integers(0, len(descriptions), size)
+    days = np.datetime64('2015-01-01') + rng.integers(0, 3650, size)
+    cents = rng.integers(100, 100000, size)
+
+    print(f"Memory of {size} expenses")
+    start = time.perf_counter()
+    # Every row of the old DataFrame came from input() or str(), so no two
+    # rows shared a string object
+    old = pd.DataFrame({
+        'ID': pd.Series([f"2024-08-12_{i}" for i in range(size)], dtype=object),
+        'Description': pd.Series([descriptions[i] + '' for i in picks.tolist()], dtype=object),
+        'Amount': cents / 100,
+        'Date Spent': pd.Series([str(day) for day in days.tolist()], dtype=object),
+    })
+    old_bytes = int(old.memory_usage(deep=True, index=False).sum())
+    print(f"{'object DataFrame':>24}: {old_bytes / size:8.1f} bytes per row ({time.perf_counter() - start:.1f}s to build)")
+    del old
+
+    store = ExpenseStore(size)
+    start = time.perf_counter()
+    store.add_columns({'ID': np.arange(1, size + 1), 'Description': np.array(descriptions, dtype=object)[picks],
+                       'Amount': cents / 100, 'Date Spent': days})
+    elapsed = time.perf_counter() - start
+    column_bytes = sum(store.raw_column(name).nbytes for name in COLUMNS)
+    column_bytes += sum(map(sys.getsizeof, store.categories))
+    print(f"{'ExpenseStore columns':>24}: {column_bytes / size:8.1f} bytes per row ({elapsed:.1f}s to add)")
+    print(f"{'  plus the ID index':>24}: {(column_bytes + _index_bytes(store._index)) / size:8.1f} bytes per row")
+    frame_bytes = int(store.to_frame().memory_usage(deep=True, index=False).sum())
+    print(f"{'compact DataFrame':>24}: {frame_bytes / size:8.1f} bytes per row")
+
+
+if __name__ == "__main__":
+    benchmark()
+    benchmark_lookups()
+    benchmark_memory()
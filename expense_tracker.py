@@ -13,11 +13,21 @@ Github URL: https://github.com/girishSaiWork/BegineerPythonProjects
 
 Features:
 - Add new expenses with description, amount, and date
-- View all recorded expenses
+- Unique expense IDs from a sequence that continues across runs, as plain
+  integers or, with --id-format date, as '<date>_<number>'
+- View all recorded expenses, or query them from the command line by date
+  range, amount range and description, sorted and limited
 - Update existing expense entries
 - Delete specific expenses
-- Generate a summary of total expenses
-- Utilizes pandas DataFrame for efficient data manipulation
+- Import bank statements (CSV or OFX) in bulk, skipping expenses already recorded
+- Generate a summary of total expenses, with totals by month and category,
+  the largest expenses and the average daily spending; saved expenses are
+  summed from the storage manifest and only their newest month is read
+- Budgets per category and month, with an alert as soon as an added or
+  updated expense takes the spending past 80% or 100% of a budget
+- Stores expenses in growable columnar arrays with a compact schema (integer
+  IDs and cents, coded descriptions), shown as a pandas DataFrame on demand
+- Saves expenses across runs in month-partitioned Parquet files (requires pyarrow)
 - Simple and intuitive command-line interface
 
 This project demonstrates practical implementation of CRUD operations,
@@ -27,29 +37,38 @@ application development and basic data analysis concepts.
 """
 
 # Importing packages
+import argparse
+import os
 from datetime import date,datetime
+
 import pandas as pd
 
+from expense_aggregates import ExpenseAggregates
+from expense_budgets import ExpenseBudgets,format_alert
+from expense_ids import ID_FORMATS,ExpenseIdSequence,format_id,max_sequence_number,parse_id
+from expense_ingest import SPENDING_SIGNS,ingest_statement
+from expense_query import SORT_KEYS,query_expenses
+from expense_reports import print_summary,top_expenses,totals_by_category
+from expense_storage import PartitionedExpenseStorage,month_of
+from expense_store import ExpenseStore
+
+EXPENSE_DATA_DIR = 'expense_data'
 
-def id_getter(id_list):
+
+def id_getter(sequence):
     """
-    Generate and return the next available ID from the given ID list.
+    Generate and return the next available ID number from the given ID sequence.
 
-    This function takes the first ID from the provided list of IDs,
-    removes it from the list, and returns it. This ensures that each
-    new expense gets a unique sequential ID.
+    The sequence is unbounded and saved across runs, so each new expense gets
+    a unique sequential number, even after the tracker is restarted.
 
     Args:
-        id_list (list): A list of available IDs.
+        sequence (ExpenseIdSequence): The expense ID sequence.
 
     Returns:
-        int: The next available ID.
-
-    Note:
-        This function modifies the input list by removing the returned ID.
+        int: The next available ID number.
     """
-    current_id = id_list.pop(0)
-    return current_id
+    return sequence.next_id()
 
 # Function to validate date input
 def get_valid_date(prompt):
@@ -83,31 +102,30 @@ def get_valid_date(prompt):
             print("Invalid date format. Please enter the date in YYYY-MM-DD format.")
 
 
-trackerList = []
-
-def addExpense(id_list):
+def addExpense(store,sequence,id_format='integer'):
     """
     Add a new expense to the expense tracker.
 
     This function prompts the user for expense details, generates a unique ID,
-    and adds the expense to the tracker list. It then converts the list to a
-    pandas DataFrame and returns it.
+    and appends the expense to the expense store. No DataFrame is built here;
+    the store builds one only when the expenses are viewed.
 
     Args:
-        id_list (list): A list of available sequential IDs.
+        store (ExpenseStore): The store holding all expenses.
+        sequence (ExpenseIdSequence): The expense ID sequence.
+        id_format (str, optional): 'integer' for plain integer IDs or 'date'
+                                   for '<date>_<number>' IDs. Defaults to 'integer'.
 
     Returns:
-        pandas.DataFrame: A DataFrame containing all expenses, including the newly added one.
+        int or str: The ID of the new expense.
 
     Note:
-        This function modifies the global trackerList by appending the new expense.
         It uses the id_getter function to obtain a unique sequential ID.
         The expense date can be set to the current date or a user-specified date.
     """
     # get current date
     current_Date_str = str(date.today())
-    seq_id = id_getter(id_list)
-    expense_id = current_Date_str + '_' + str(seq_id)
+    expense_id = format_id(id_getter(sequence),id_format,current_Date_str)
     expense_description = input("Enter the description of expense : ")
     amount_spent = float(input("Enter the amount spent : "))
     date_flag = input('Is the expense today say Y or N : ')
@@ -117,33 +135,29 @@ def addExpense(id_list):
         # Ask user to enter the date in YYYY-MM-DD format
         date_spent = get_valid_date('Enter the date in YYYY-MM-DD format: ')
 
-    expenseList = [expense_id,expense_description,amount_spent,date_spent]
-    trackerList.append(expenseList)
-    df_cols = ['ID','Description','Amount','Date Spent']
-    trackerDF = pd.DataFrame(trackerList, columns=df_cols)
-    return trackerDF
+    store.add(expense_id,expense_description,amount_spent,date_spent)
+    return expense_id
 
-def viewExpnses(trackerDF):
+def viewExpnses(store):
     """
     Display all expenses in the expense tracker.
 
-    This function prints out all expenses currently stored in the trackerDF DataFrame.
-    It displays the entire DataFrame, including all columns (ID, Description, Amount, Date Spent).
-    If there are no expenses in the DataFrame, it will display an empty DataFrame.
+    This function prints out all expenses currently held by the expense store as a
+    DataFrame, including all columns (ID, Description, Amount, Date Spent).
+    If there are no expenses, it will display an empty DataFrame.
 
     Args:
-        trackerDF (pandas.DataFrame): The DataFrame containing all the expense records.
+        store (ExpenseStore): The store holding all expenses.
 
     Returns:
         None
 
     Note:
-        This function does not modify the trackerDF; it only reads and displays the information.
-        The actual printing of the DataFrame is done by the print statement following this docstring.
+        This function does not modify the store; it only reads and displays the information.
     """
-    print(trackerDF)
+    print(store.to_frame())
 
-def updateExpnses(df,expense_id,description=None,amount_spent=None,date_spent=None):
+def updateExpnses(store,expense_id,description=None,amount_spent=None,date_spent=None):
     """
     Update an existing expense in the expense tracker.
 
@@ -151,61 +165,336 @@ def updateExpnses(df,expense_id,description=None,amount_spent=None,date_spent=No
     identified by its expense_id. If a parameter is not provided, that field remains unchanged.
 
     Args:
-        df (pandas.DataFrame): The DataFrame containing all the expense records.
-        expense_id (str): The ID of the expense to be updated.
+        store (ExpenseStore): The store holding all expenses.
+        expense_id (str or int): The ID of the expense to be updated.
         description (str, optional): The new description for the expense. Defaults to None.
         amount_spent (float, optional): The new amount spent for the expense. Defaults to None.
         date_spent (str, optional): The new date spent for the expense in 'YYYY-MM-DD' format. Defaults to None.
 
     Returns:
-        pandas.DataFrame: The updated DataFrame containing all expenses.
+        bool: True if the expense was updated.
 
     Note:
-        If the expense_id is not found in the DataFrame, a message is printed indicating that
-        the expense was not found. The function will still return the unchanged DataFrame in this case.
+        If the expense_id is not found in the store or the new date is invalid, a message is
+        printed and nothing is changed.
     """
-    # Find the row with the matching expense_id
-    mask = df['ID'] == expense_id
-
-    # Update the fields if new values are provided
-    if description:
-        df.loc[mask, 'Description'] = description
-    if amount_spent:
-        df.loc[mask, 'Amount'] = float(amount_spent)
     if date_spent:
-        df.loc[mask, 'Date Spent'] = date_spent
+        try:
+            datetime.strptime(date_spent, '%Y-%m-%d')
+        except ValueError:
+            print("Invalid date format. Please enter the date in YYYY-MM-DD format.")
+            return False
 
-    print(f"Expense with ID {expense_id} updated successfully.")
-    
-    return df
+    # Update the fields if new values are provided
+    updated = store.update(expense_id,
+                           description=description or None,
+                           amount=float(amount_spent) if amount_spent else None,
+                           date_spent=date_spent or None)
+    if updated:
+        print(f"Expense with ID {expense_id} updated successfully.")
+    else:
+        print(f"Expense with ID {expense_id} not found.")
+    return updated
 
-def delExpnses(df,expense_id):
+def delExpnses(store,expense_id):
     """
     Delete an expense from the expense tracker based on its ID.
 
-    This function removes an expense from the DataFrame if an expense with the given expense_id exists.
+    This function removes an expense from the store if an expense with the given expense_id exists.
     If no expense with the given ID is found, an appropriate message is displayed.
 
     Args:
-        df (pandas.DataFrame): The DataFrame containing all the expense records.
-        expense_id (str): The ID of the expense to be deleted.
+        store (ExpenseStore): The store holding all expenses.
+        expense_id (str or int): The ID of the expense to be deleted.
 
     Returns:
-        pandas.DataFrame: The updated DataFrame with the specified expense removed (if found).
+        bool: True if the expense was deleted.
 
     Note:
-        If the expense_id is not found in the DataFrame, the function will print a message
-        and return the unchanged DataFrame.
+        If the expense_id is not found in the store, the function will print a message
+        and leave the store unchanged.
     """
-    mask = df['ID'] == expense_id
-    if not mask.any():
+    deleted = store.delete(expense_id)
+    if not deleted:
         print(f"Expense with ID {expense_id} not found.")
-    else:
-        # Delete rows where the city is Chicago
-        df = df.drop(df[df['ID'] == expense_id].index)
-    return df
+    return deleted
     
-def main():
+def openSequence(store,data_dir=EXPENSE_DATA_DIR,storage=None):
+    """
+    Open the saved expense ID sequence.
+
+    Args:
+        store (ExpenseStore): The store holding all loaded expenses. Their ID
+                              numbers are never handed out again, even if the
+                              sequence file was lost.
+        data_dir (str, optional): The directory of the sequence file. Defaults to EXPENSE_DATA_DIR.
+        storage (PartitionedExpenseStorage, optional): The saved expenses. If
+                              the sequence file was lost, their IDs are read
+                              so they are never handed out again. Defaults to None.
+
+    Returns:
+        ExpenseIdSequence: The sequence.
+    """
+    os.makedirs(data_dir,exist_ok=True)
+    path = os.path.join(data_dir,'expense_ids.json')
+    lost = not os.path.exists(path)
+    sequence = ExpenseIdSequence(path)
+    if len(store):
+        sequence.observe(max_sequence_number(store.column('ID')))
+    if lost and storage is not None:
+        # Only the ID column is read, and only when the sequence file is gone
+        sequence.observe(max_sequence_number(storage.load(columns=['ID'])['ID'].to_numpy()))
+    return sequence
+
+def readExpenseId(prompt,id_format):
+    """
+    Prompt the user for an expense ID.
+
+    Args:
+        prompt (str): The message to display when prompting the user for input.
+        id_format (str): The ID format of the tracker, 'date' or 'integer'.
+
+    Returns:
+        str or int or None: The expense ID, or None if it is not a valid ID.
+    """
+    text = input(prompt)
+    expense_id = parse_id(text,id_format)
+    if expense_id is None:
+        print(f"Expense with ID {text} not found.")
+    return expense_id
+
+def openStorage(data_dir=EXPENSE_DATA_DIR):
+    """
+    Open the saved expenses.
+
+    Args:
+        data_dir (str, optional): The directory of the saved expenses. Defaults to EXPENSE_DATA_DIR.
+
+    Returns:
+        PartitionedExpenseStorage: The storage, or None if pyarrow is not installed.
+
+    Note:
+        Without pyarrow the tracker still works, but expenses are lost on exit.
+    """
+    try:
+        return PartitionedExpenseStorage(data_dir)
+    except ImportError:
+        print("pyarrow is not installed. Expenses will not be saved.")
+        return None
+
+def printBudgetAlerts(budgets):
+    """
+    Print the budget alerts raised by the latest changes.
+
+    Args:
+        budgets (ExpenseBudgets): The budgets of the tracker.
+
+    Returns:
+        None
+    """
+    for alert in budgets.pop_alerts():
+        print(format_alert(alert))
+
+def setBudget(budgets):
+    """
+    Set a budget for a category or for all expenses, in one month or every month.
+
+    This function prompts the user for the category, the month and the limit of
+    the budget and shows the budgets of the current month afterwards.
+
+    Args:
+        budgets (ExpenseBudgets): The budgets of the tracker.
+
+    Returns:
+        bool: True if the budget was set.
+
+    Note:
+        If the month or the limit is invalid, a message is printed and nothing is changed.
+    """
+    category = input("Enter the description the budget is for (leave blank for all expenses): ").strip()
+    month = input("Enter the month in YYYY-MM format (leave blank for every month): ").strip()
+    limit = input("Enter the budget amount: ")
+    if month:
+        try:
+            datetime.strptime(month, '%Y-%m')
+        except ValueError:
+            print("Invalid month format. Please enter the month in YYYY-MM format.")
+            return False
+    try:
+        budgets.set_budget(float(limit),category or None,month or None)
+    except ValueError:
+        print("Invalid amount. Please enter an amount greater than 0.")
+        return False
+    print(budgets.report(date.today().strftime('%Y-%m')))
+    return True
+
+def openTracker(id_format='integer'):
+    """
+    Open the saved expenses with everything that follows their changes.
+
+    Args:
+        id_format (str, optional): The ID format asked for, 'integer' or 'date'.
+                                   Saved expenses keep the format they use.
+                                   Defaults to 'integer'.
+
+    Returns:
+        tuple: The ExpenseStore, the storage (None without pyarrow), the
+               ExpenseAggregates, the ExpenseBudgets, the ExpenseIdSequence
+               and the ID format.
+
+    Note:
+        No saved expense is read here: the store starts empty and
+        loadHistory() fills it once an operation needs every expense. The
+        budgets read the saved spending of a month from the storage the
+        first time a change touches it.
+    """
+    storage = openStorage()
+    # Saved expenses fix the ID format, so all IDs have the same type
+    saved_format = storage.id_format if storage is not None else None
+    if saved_format and saved_format != id_format:
+        print(f"Saved expenses use {saved_format} IDs. Using {saved_format} IDs.")
+        id_format = saved_format
+    trackerStore = ExpenseStore(id_format=id_format)
+    history = None
+    if storage is not None:
+        def history(month):
+            # Only the columns the budgets count
+            return storage.load(month,month,['Description','Amount','Date Spent'])
+    # Budgets are checked against running spending on every change. They are told
+    # about a change before the storage, so reading a month never returns it early
+    budgets = ExpenseBudgets(trackerStore,os.path.join(EXPENSE_DATA_DIR,'budgets.json'),history=history)
+    # Running totals of the loaded expenses, kept up to date on every change
+    aggregates = ExpenseAggregates(trackerStore)
+    if storage is not None:
+        # Save every later change
+        trackerStore.add_listener(storage)
+    sequence = openSequence(trackerStore,storage=storage)
+    return trackerStore,storage,aggregates,budgets,sequence,id_format
+
+def loadHistory(store,storage,budgets):
+    """
+    Load the saved expenses into the store, for operations that need all of them.
+
+    Args:
+        store (ExpenseStore): The store opened by openTracker().
+        storage (PartitionedExpenseStorage): The saved expenses, or None.
+        budgets (ExpenseBudgets): The budgets of the tracker.
+
+    Returns:
+        int: The number of expenses loaded.
+
+    Note:
+        Expenses added since the tracker was opened are in the store already
+        and are not loaded twice.
+    """
+    if storage is None:
+        return 0
+    # The storage holds these expenses and the budgets read them from it, so neither is told
+    store.remove_listener(budgets)
+    store.remove_listener(storage)
+    try:
+        loaded = storage.load_into(store)
+    finally:
+        store.add_listener(budgets)
+        store.add_listener(storage)
+    if loaded:
+        print(f"Loaded {loaded} saved expenses.")
+    return loaded
+
+def printSummary(store,storage,aggregates,top=5):
+    """
+    Print the summary of all expenses.
+
+    Saved expenses are summed from the storage manifest without reading them;
+    only the newest month is read, for its top categories and expenses.
+
+    Args:
+        store (ExpenseStore): The store opened by openTracker().
+        storage (PartitionedExpenseStorage): The saved expenses, or None.
+        aggregates (ExpenseAggregates): Running totals of the store.
+        top (int, optional): The number of categories and expenses listed. Defaults to 5.
+
+    Returns:
+        None
+    """
+    if storage is None:
+        print_summary(store,aggregates,top)
+        return
+    count,total = storage.summary()
+    print("Total expenses summary : ",total)
+    if not count:
+        return
+    totals = {}
+    for month in storage.months:
+        month_count,month_total = storage.summary(month,month)
+        if month_count:
+            totals[month] = (month_total,month_count)
+    print("\nTotals by month:")
+    print(pd.DataFrame(list(totals.values()),columns=['Total','Count'],
+                       index=pd.Index(list(totals),name='month')).to_string())
+    latest_month = list(totals)[-1]
+    latest = ExpenseStore(id_format=store.id_format)
+    storage.load_into(latest,latest_month,latest_month)
+    print(f"\nTop {top} categories in {latest_month}:")
+    print(totals_by_category(latest,top).to_string())
+    print(f"\nTop {top} expenses in {latest_month}:")
+    print(top_expenses(latest,top).to_string(index=False))
+
+def importStatements(paths,id_format='integer',**options):
+    """
+    Import bank statements into the saved expenses.
+
+    Args:
+        paths (list): The CSV or OFX statement files.
+        id_format (str, optional): 'integer' or 'date' IDs. Defaults to 'integer'.
+        **options: Passed on to ingest_statement, e.g. date_format or spending.
+
+    Returns:
+        None
+    """
+    trackerStore,storage,aggregates,budgets,sequence,id_format = openTracker(id_format)
+    # Statements are deduplicated against every saved expense
+    loadHistory(trackerStore,storage,budgets)
+    for path in paths:
+        try:
+            ingest_statement(trackerStore,path,sequence,**options)
+        except (OSError,ValueError) as error:
+            print(f"Could not import {path}: {error}")
+        printBudgetAlerts(budgets)
+    if storage is not None:
+        storage.compact()
+    print("Total expenses summary : ",aggregates.total)
+
+def queryExpenses(id_format='integer',**filters):
+    """
+    Print the saved expenses that match the given filters.
+
+    Args:
+        id_format (str, optional): 'integer' or 'date' IDs. Defaults to 'integer'.
+        **filters: Passed on to query_expenses, e.g. start, end or description.
+
+    Returns:
+        pandas.DataFrame: The matching expenses, or None if the filters are invalid.
+
+    Note:
+        Only the saved months within the start and end dates are read.
+    """
+    storage = openStorage()
+    trackerStore = ExpenseStore(id_format=(storage.id_format if storage is not None else None) or id_format)
+    if storage is not None:
+        start,end = filters.get('start'),filters.get('end')
+        storage.load_into(trackerStore,start and month_of(start),end and month_of(end))
+    try:
+        expenses = query_expenses(trackerStore,**filters)
+    except ValueError as error:
+        print(error)
+        return None
+    if len(expenses):
+        print(expenses.to_string(index=False))
+    print(f"Expenses found: {len(expenses)}")
+    return expenses
+
+def main(id_format='integer'):
     """
     Main function to run the Expense Tracker CLI application.
 
@@ -217,7 +506,8 @@ def main():
     3. Update Expense
     4. Delete Expense
     5. Summary Expense
-    6. Exit
+    6. Set Budget
+    7. Exit
 
     For each option, the function prompts for necessary inputs and calls the
     corresponding function to perform the requested operation.
@@ -225,7 +515,12 @@ def main():
     The function handles invalid inputs by displaying an error message and
     continuing the loop.
 
-    The function uses a pandas DataFrame to store and manipulate expense data.
+    The function keeps the expenses in an ExpenseStore, which is shown as a
+    pandas DataFrame when the expenses are viewed.
+
+    Args:
+        id_format (str, optional): 'integer' for plain integer IDs or 'date'
+                                   for '<date>_<number>' IDs. Defaults to 'integer'.
 
     Returns:
         None
@@ -234,48 +529,131 @@ def main():
     print("#                               EXPENSE TRACKER IN PYTHON                                          #")
     print("####################################################################################################")
 
-    id_list = list(range(1,1001)) 
+    trackerStore,storage,aggregates,budgets,sequence,id_format = openTracker(id_format)
+    historyLoaded = False
     while True:
+        if storage is not None:
+            # Write the changes of the last choice to disk
+            storage.flush()
         print("\nExpense Tracker CLI")
         print("1. Add Expense")
         print("2. View All Expenses")
         print("3. Update Expense")
         print("4. Delete Expense")
         print("5. Summary Expense")
-        print("6. Exit")
+        print("6. Set Budget")
+        print("7. Exit")
     
         choice = input("Enter your choice: ")
+        if choice in ('2','3','4') and not historyLoaded:
+            # Viewing, updating and deleting need every expense; adding and the summary do not
+            loadHistory(trackerStore,storage,budgets)
+            historyLoaded = True
         if choice == '1':
-            trackerDF = addExpense(id_list)
+            addExpense(trackerStore,sequence,id_format)
+            printBudgetAlerts(budgets)
         elif choice == '2':
-            viewExpnses(trackerDF)
+            viewExpnses(trackerStore)
         elif choice == '3':
-            if not trackerList:
+            if not len(trackerStore):
                 print("No expenses to update. Please add expenses first.")
             else:
-                expense_id = input("Enter expense ID to update: ")
-                # Find the row with the matching expense_id
-                mask = trackerDF['ID'] == expense_id
-                if not mask.any():
+                expense_id = readExpenseId("Enter expense ID to update: ",id_format)
+                if expense_id is None:
+                    pass
+                elif expense_id not in trackerStore:
                     print(f"Expense with ID {expense_id} not found.")
                 else:
                     description = input("Enter new description (leave blank to keep current): ")
                     amount_spent = input("Enter new amount (leave blank to keep current): ")
                     date_spent = input("Enter new date (leave blank to keep current): ")
-                    updateExpnses(trackerDF,expense_id,description,amount_spent,date_spent)
-                    print(trackerDF)
+                    updateExpnses(trackerStore,expense_id,description,amount_spent,date_spent)
+                    printBudgetAlerts(budgets)
+                    viewExpnses(trackerStore)
         elif choice == '4':
-            expense_id = input("Enter expense ID to delete: ")
-            trackerDF = delExpnses(trackerDF,expense_id)
-            print(trackerDF)
+            expense_id = readExpenseId("Enter expense ID to delete: ",id_format)
+            if expense_id is not None:
+                delExpnses(trackerStore,expense_id)
+                viewExpnses(trackerStore)
         elif choice == '5':
-            total_expenses = sum(trackerDF['Amount'].values)
-            print("Total expenses summary : ", total_expenses)
+            printSummary(trackerStore,storage,aggregates)
+            if len(budgets):
+                print("\nBudgets this month:")
+                print(budgets.report(date.today().strftime('%Y-%m')))
         elif choice == '6':
+            setBudget(budgets)
+        elif choice == '7':
+                if storage is not None:
+                    # Merge the small files written by this session's adds
+                    storage.compact()
                 print("Exiting Task Tracker. Goodbye!")
                 break
         else:
             print("Invalid choice. Please try again.")
 
+def dateArgument(text):
+    """
+    Check a date given on the command line.
+
+    Args:
+        text (str): The date in YYYY-MM-DD format.
+
+    Returns:
+        str: The date.
+
+    Raises:
+        argparse.ArgumentTypeError: If the date is invalid.
+    """
+    try:
+        return str(datetime.strptime(text,'%Y-%m-%d').date())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{text}', expected YYYY-MM-DD") from None
+
+def build_parser():
+    """
+    Build the command-line parser of the Expense Tracker.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(description="Expense Tracker CLI")
+    parser.add_argument('--id-format', choices=ID_FORMATS, default='integer',
+                        help="give new expenses plain integer IDs (default) or '<date>_<number>' IDs")
+    parser.add_argument('--import', dest='statements', nargs='+', metavar='FILE',
+                        help="import CSV or OFX bank statements instead of opening the menu")
+    parser.add_argument('--date-format',
+                        help="strptime format of the statement dates (default: %%Y-%%m-%%d, %%Y%%m%%d for OFX)")
+    parser.add_argument('--spending', choices=SPENDING_SIGNS, default='any',
+                        help="how the statement signs spending; rows of the other sign are skipped")
+    parser.add_argument('--date-column', help="name of the CSV date column")
+    parser.add_argument('--description-column', help="name of the CSV description column")
+    parser.add_argument('--amount-column', help="name of the CSV amount column")
+    query = parser.add_argument_group("query", "print the matching expenses instead of opening the menu")
+    query.add_argument('--from', dest='start', type=dateArgument, metavar='DATE',
+                       help="only expenses spent on or after DATE (YYYY-MM-DD)")
+    query.add_argument('--to', dest='end', type=dateArgument, metavar='DATE',
+                       help="only expenses spent on or before DATE (YYYY-MM-DD)")
+    query.add_argument('--min-amount', type=float, help="only expenses of at least this amount")
+    query.add_argument('--max-amount', type=float, help="only expenses of at most this amount")
+    query.add_argument('--description', metavar='TEXT', help="only expenses whose description contains TEXT")
+    query.add_argument('--regex', action='store_true', help="match --description as a regular expression")
+    query.add_argument('--case-sensitive', action='store_true', help="match the case of --description")
+    query.add_argument('--sort', choices=SORT_KEYS, help="sort the expenses (default: date)")
+    query.add_argument('--descending', action='store_true', help="sort from the highest value")
+    query.add_argument('--limit', type=int, help="print at most this many expenses")
+    return parser
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = build_parser().parse_args()
+    if args.statements:
+        importStatements(args.statements,args.id_format,date_format=args.date_format,
+                         spending=args.spending,date_column=args.date_column,
+                         description_column=args.description_column,amount_column=args.amount_column)
+    elif any(value not in (None,False) for value in (args.start,args.end,args.min_amount,args.max_amount,
+                                                     args.description,args.sort,args.descending,args.limit)):
+        queryExpenses(args.id_format,start=args.start,end=args.end,min_amount=args.min_amount,
+                      max_amount=args.max_amount,description=args.description,regex=args.regex,
+                      case=args.case_sensitive,sort=args.sort or 'date',descending=args.descending,
+                      limit=args.limit)
+    else:
+        main(args.id_format)
\ No newline at end of file
@@ -0,0 +1,589 @@
+"""
+Task API
+
+Description:
+Asynchronous JSON API over HTTP for the Task Tracker. It serves the task
+operations of task_tracker.py (add, update, delete, search and listing by
+status) from a single asyncio event loop, so thousands of open connections cost
+no threads. Connections are kept alive between requests, pipelined requests are
+answered in order, and a batch endpoint applies many changes in one request.
+
+Endpoints:
+- GET    /tasks                 list tasks (?status=, ?q= to search, ?mode=and|or,
+                                ?page= and ?limit= to page)
+- POST   /tasks                 add a task: {"title", "description", "status"}
+- GET    /tasks/<id>            get one task
+- PATCH  /tasks/<id>            update a task: any of "title", "description", "status"
+- DELETE /tasks/<id>            delete a task
+- POST   /tasks/batch           apply {"operations": [{"op": "add"|"update"|"delete", ...}]}
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python task_api.py serve --port 8080
+    python task_api.py loadtest --spawn
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from task_store import VALID_STATUSES
+from task_tracker import ENGINES, TASK_DATA_DIR, open_task_store
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+# Seconds an idle keep-alive connection stays open
+KEEP_ALIVE_TIMEOUT = 30
+
+# Largest task ID and page offset, the range of a SQLite INTEGER
+MAX_TASK_ID = 2 ** 63 - 1
+
+
+class APIError(Exception):
+    """
+    Error answered with an HTTP error status and a JSON message.
+
+    Args:
+        status (HTTPStatus): The HTTP status of the response.
+        message (str): The error message.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def task_to_json(task):
+    """
+    Convert a task to the field names used by the API.
+
+    Args:
+        task (dict): The task from the store.
+
+    Returns:
+        dict: The task with 'id', 'title', 'description' and 'status'.
+    """
+    return {'id': task['id'], 'title': task['task_title'],
+            'description': task['description'], 'status': task['task_status']}
+
+
+def _check_status(status):
+    if status is not None and status not in VALID_STATUSES:
+        raise APIError(HTTPStatus.BAD_REQUEST,
+                       f"Invalid status '{status}'. Use one of: {', '.join(VALID_STATUSES)}.")
+
+
+def _check_text(fields, name, required=False):
+    value = fields.get(name)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str) or (required and not value.strip()):
+        raise APIError(HTTPStatus.BAD_REQUEST, f"Field '{name}' must be a non-empty string.")
+    return value
+
+
+def _int_param(params, name, default):
+    try:
+        value = int(params[name][0]) if name in params else default
+    except ValueError:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"Parameter '{name}' must be an integer.")
+    if not 1 <= value <= MAX_TASK_ID:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"Parameter '{name}' must be between 1 and {MAX_TASK_ID}.")
+    return value
+
+
+def _check_task_id(task_id):
+    if not 1 <= task_id <= MAX_TASK_ID:
+        raise APIError(HTTPStatus.BAD_REQUEST, f"Task IDs range from 1 to {MAX_TASK_ID}.")
+    return task_id
+
+
+class TaskAPI:
+    """
+    Request handlers of the task API.
+
+    Args:
+        store: The task store to serve.
+
+    Note:
+        TaskAPIServer runs all handlers on one worker thread, one at a time,
+        so the store needs no locking as long as only this API uses it.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def handle(self, method, target, body):
+        """
+        Answer one request.
+
+        Args:
+            method (str): The HTTP method.
+            target (str): The request target, path and query string.
+            body (bytes): The request body.
+
+        Returns:
+            tuple: The HTTPStatus and the JSON-serialisable response, or None
+                   for an empty response.
+
+        Raises:
+            APIError: If the request is invalid or refers to a missing task.
+        """
+        url = urlsplit(target)
+        parts = [part for part in url.path.split('/') if part]
+        if not parts or parts[0] != 'tasks' or len(parts) > 2:
+            raise APIError(HTTPStatus.NOT_FOUND, f"No such resource: {url.path}")
+        params = parse_qs(url.query)
+
+        if len(parts) == 1:
+            if method == 'GET':
+                return HTTPStatus.OK, self.list_tasks(params)
+            if method == 'POST':
+                return HTTPStatus.CREATED, self.add_task(self._json(body))
+            raise APIError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not allowed on /tasks")
+
+        if parts[1] == 'batch':
+            if method != 'POST':
+                raise APIError(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST for /tasks/batch")
+            return HTTPStatus.OK, self.batch(self._json(body))
+
+        try:
+            task_id = _check_task_id(int(parts[1]))
+        except ValueError:
+            raise APIError(HTTPStatus.NOT_FOUND, f"No such resource: {url.path}")
+        if method == 'GET':
+            task = self.store.get(task_id)
+        elif method == 'PATCH':
+            task = self.update_task(task_id, self._json(body))
+        elif method == 'DELETE':
+            task = self.store.delete(task_id)
+        else:
+            raise APIError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not allowed on /tasks/<id>")
+        if task is None:
+            raise APIError(HTTPStatus.NOT_FOUND, f"Task ID {task_id} not found.")
+        return HTTPStatus.OK, task_to_json(task)
+
+    def list_tasks(self, params):
+        """
+        List, filter or search tasks.
+
+        Args:
+            params (dict): The parsed query string.
+
+        Returns:
+            dict: The tasks of the requested page and the total number of matches.
+        """
+        page = _int_param(params, 'page', 1)
+        limit = _int_param(params, 'limit', 100)
+        offset = (page - 1) * limit
+        if offset + limit > MAX_TASK_ID:
+            raise APIError(HTTPStatus.BAD_REQUEST, "Parameters 'page' and 'limit' are too large.")
+        status = params.get('status', [None])[0]
+        _check_status(status)
+        if 'q' in params:
+            query = params['q'][0]
+            mode = params.get('mode', ['and'])[0]
+            if mode not in ('and', 'or'):
+                raise APIError(HTTPStatus.BAD_REQUEST, "Parameter 'mode' must be 'and' or 'or'.")
+            tasks = self.store.search(query, mode=mode, limit=limit, offset=offset, status=status)
+            total = self.store.count_matches(query, mode=mode, status=status)
+        elif status:
+            tasks = self.store.by_status(status, limit=limit, offset=offset)
+            total = self.store.count_status(status)
+        else:
+            tasks = self.store.all_tasks(limit=limit, offset=offset)
+            total = len(self.store)
+        return {'tasks': [task_to_json(task) for task in tasks],
+                'total': total, 'page': page, 'limit': limit}
+
+    def add_task(self, fields):
+        """
+        Add a task from its JSON fields.
+
+        Args:
+            fields (dict): 'title' and optionally 'description' and 'status'.
+
+        Returns:
+            dict: The added task.
+        """
+        title = _check_text(fields, 'title', required=True)
+        description = _check_text(fields, 'description') or ''
+        status = fields.get('status') or 'pending'
+        _check_status(status)
+        return task_to_json(self.store.add(title, description, status))
+
+    def update_task(self, task_id, fields):
+        """
+        Update a task from JSON fields.
+
+        Args:
+            task_id (int): The ID of the task.
+            fields (dict): Any of 'title', 'description' and 'status'.
+
+        Returns:
+            dict or None: The updated task as stored, or None if it does not exist.
+        """
+        title = _check_text(fields, 'title')
+        description = _check_text(fields, 'description')
+        status = fields.get('status')
+        _check_status(status)
+        return self.store.update(task_id, title, description, status)
+
+    def batch(self, fields):
+        """
+        Apply many adds, updates and deletes in one store transaction.
+
+        Args:
+            fields (dict): {"operations": [...]} where every operation has an
+                           "op" of 'add', 'update' or 'delete', an "id" for
+                           updates and deletes, and the task fields.
+
+        Returns:
+            dict: One result per operation, in order, each with 'ok' and either
+                  the resulting 'task' or an 'error'.
+        """
+        operations = fields.get('operations')
+        if not isinstance(operations, list):
+            raise APIError(HTTPStatus.BAD_REQUEST, "Field 'operations' must be a list.")
+        results = []
+        with self.store.transaction():
+            for operation in operations:
+                try:
+                    results.append({'ok': True, 'task': self._apply(operation)})
+                except APIError as error:
+                    results.append({'ok': False, 'error': error.message})
+        return {'results': results}
+
+    def _apply(self, operation):
+        if not isinstance(operation, dict):
+            raise APIError(HTTPStatus.BAD_REQUEST, "Every operation must be an object.")
+        op = operation.get('op')
+        if op == 'add':
+            return self.add_task(operation)
+        task_id = operation.get('id')
+        if not isinstance(task_id, int) or isinstance(task_id, bool):
+            raise APIError(HTTPStatus.BAD_REQUEST, "Field 'id' must be an integer.")
+        _check_task_id(task_id)
+        if op == 'update':
+            task = self.update_task(task_id, operation)
+        elif op == 'delete':
+            task = self.store.delete(task_id)
+        else:
+            raise APIError(HTTPStatus.BAD_REQUEST, f"Unknown operation '{op}'.")
+        if task is None:
+            raise APIError(HTTPStatus.NOT_FOUND, f"Task ID {task_id} not found.")
+        return task_to_json(task)
+
+    @staticmethod
+    def _json(body):
+        try:
+            fields = json.loads(body or b'{}')
+        except ValueError:
+            raise APIError(HTTPStatus.BAD_REQUEST, "The request body is not valid JSON.")
+        if not isinstance(fields, dict):
+            raise APIError(HTTPStatus.BAD_REQUEST, "The request body must be a JSON object.")
+        return fields
+
+
+def build_response(status, payload, keep_alive):
+    """
+    Encode an HTTP/1.1 response.
+
+    Args:
+        status (HTTPStatus): The response status.
+        payload: The JSON-serialisable body, or None for an empty body.
+        keep_alive (bool): Whether the connection stays open.
+
+    Returns:
+        bytes: The complete response.
+    """
+    body = b'' if payload is None else json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('ascii') + body
+
+
+async def read_request(reader):
+    """
+    Read one HTTP request from a connection.
+
+    Args:
+        reader (asyncio.StreamReader): The connection.
+
+    Returns:
+        tuple or None: The method, target, HTTP version, lowercased headers and
+                       body, or None when the client closed the connection.
+
+    Raises:
+        APIError: If the request is malformed or its body is too large.
+    """
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise APIError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Request headers are too large.")
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise APIError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    if 'transfer-encoding' in headers:
+        # Without decoding the chunks the body would be read as the next request
+        raise APIError(HTTPStatus.LENGTH_REQUIRED, "Send the request body with a Content-Length.")
+    length = headers.get('content-length', '0')
+    if not length.isdigit() or not length.isascii():
+        raise APIError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+    length = int(length)
+    if length > MAX_BODY_SIZE:
+        raise APIError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "The request body is too large.")
+    body = await reader.readexactly(length) if length else b''
+    return method, target, version, headers, body
+
+
+class TaskAPIServer:
+    """
+    asyncio HTTP/1.1 server for a TaskAPI.
+
+    Args:
+        api (TaskAPI): The request handlers.
+        host (str, optional): The interface to listen on. Defaults to '127.0.0.1'.
+        port (int, optional): The port to listen on. Defaults to 8080.
+
+    Note:
+        Requests of a connection are read and answered one after another, so
+        pipelined requests are answered in the order they were sent.
+
+        The handlers run on a single worker thread rather than the event loop,
+        so journal fsyncs and snapshots do not hold up the other connections.
+    """
+
+    def __init__(self, api, host='127.0.0.1', port=8080):
+        self.api = api
+        self.host = host
+        self.port = port
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='task-api')
+
+    async def serve_forever(self):
+        """
+        Listen for connections until the task is cancelled.
+
+        Returns:
+            None
+        """
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        print(f"Task API listening on http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._executor.shutdown()
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve the requests of one connection until it is closed.
+
+        Args:
+            reader (asyncio.StreamReader): The incoming stream.
+            writer (asyncio.StreamWriter): The outgoing stream.
+
+        Returns:
+            None
+        """
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                except APIError as error:
+                    writer.write(build_response(error.status, {'error': error.message}, False))
+                    break
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+                try:
+                    status, payload = await asyncio.get_running_loop().run_in_executor(
+                        self._executor, self.api.handle, method, target, body)
+                except APIError as error:
+                    status, payload = error.status, {'error': error.message}
+                except Exception:
+                    traceback.print_exc()
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': "Internal server error."}
+                writer.write(build_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _client(host, port, requests, pipeline, max_id, latencies, errors, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        sent = 0
+        while sent < requests:
+            burst = min(pipeline, requests - sent)
+            started = []
+            for _ in range(burst):
+                kind = rng.random()
+                if kind < 0.6:
+                    request = f"GET /tasks/{rng.randint(1, max_id)} HTTP/1.1\r\nHost: {host}\r\n\r\n"
+                elif kind < 0.8:
+                    status = rng.choice(VALID_STATUSES).replace(' ', '+')
+                    request = f"GET /tasks?status={status}&limit=10 HTTP/1.1\r\nHost: {host}\r\n\r\n"
+                else:
+                    body = json.dumps({'title': f"Load test {rng.random()}"})
+                    request = (f"POST /tasks HTTP/1.1\r\nHost: {host}\r\n"
+                               f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n{body}")
+                writer.write(request.encode('ascii'))
+                started.append(time.perf_counter())
+            await writer.drain()
+            for start in started:
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+                await reader.readexactly(length)
+                latencies.append(time.perf_counter() - start)
+                if not head.startswith((b'HTTP/1.1 2', b'HTTP/1.1 404')):
+                    errors.append(head.split(b'\r\n')[0])
+            sent += burst
+    finally:
+        writer.close()
+
+
+async def load_test(host='127.0.0.1', port=8080, connections=50, requests=20000, pipeline=1,
+                    max_id=1000, seed=1):
+    """
+    Drive a running task API with keep-alive connections and report latency.
+
+    The requests are 60% single task lookups, 20% status listings and 20% adds,
+    spread evenly over the connections.
+
+    Args:
+        host (str): The host of the API.
+        port (int): The port of the API.
+        connections (int): The number of concurrent keep-alive connections.
+        requests (int): The total number of requests.
+        pipeline (int): The number of requests sent on a connection before
+                        reading their responses.
+        max_id (int): The highest task ID used for lookups.
+        seed (int): Seed for the random generators, for repeatable runs.
+
+    Returns:
+        dict: 'requests_per_sec', 'p50_ms', 'p99_ms' and 'errors'.
+    """
+    latencies = []
+    errors = []
+    per_connection = max(requests // connections, 1)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, per_connection, pipeline, max_id, latencies, errors, random.Random(seed + i))
+        for i in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    result = {
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000,
+        'errors': len(errors),
+    }
+    print(f"{len(latencies)} requests over {connections} connections (pipeline {pipeline}): "
+          f"{result['requests_per_sec']:.0f} req/sec, p50 {result['p50_ms']:.2f} ms, "
+          f"p99 {result['p99_ms']:.2f} ms, {result['errors']} errors")
+    return result
+
+
+def _wait_for_port(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1.0).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"The task API did not start on {host}:{port}")
+
+
+def main(argv=None):
+    """
+    Run the API server or the load test from the command line.
+
+    Args:
+        argv (list, optional): The command-line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Task Tracker HTTP API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help="serve the task API")
+    serve_parser.add_argument('--engine', choices=ENGINES, default='memory')
+    serve_parser.add_argument('--data-dir', default=TASK_DATA_DIR)
+
+    load_parser = commands.add_parser('loadtest', help="run the load test against a running API")
+    load_parser.add_argument('--connections', type=int, default=50)
+    load_parser.add_argument('--requests', type=int, default=20000)
+    load_parser.add_argument('--pipeline', type=int, default=1)
+    load_parser.add_argument('--spawn', action='store_true',
+                             help="start a server with a temporary in-memory store for the test")
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        store = open_task_store(args.engine, args.data_dir)
+        try:
+            asyncio.run(TaskAPIServer(TaskAPI(store), args.host, args.port).serve_forever())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            store.close()
+        return
+
+    server = None
+    if args.spawn:
+        data_dir = tempfile.mkdtemp(prefix='task_api_')
+        server = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--host', args.host,
+                                   '--port', str(args.port), 'serve', '--data-dir', data_dir],
+                                  stdout=subprocess.DEVNULL)
+        _wait_for_port(args.host, args.port)
+        if server.poll() is not None:
+            print(f"The task API could not start on {args.host}:{args.port}.")
+            return
+    try:
+        asyncio.run(load_test(args.host, args.port, args.connections, args.requests, args.pipeline))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Task Bulk Import/Export
+
+Description:
+Streaming import and export of tasks in JSONL and CSV format for the Task
+Tracker. Input files are read line by line through generators and added to
+the task store in batches, so importing a backlog of millions of tasks needs
+only constant memory besides the store itself. Exports are written task by
+task the same way.
+
+File format:
+Every task is one JSON object per line (JSONL) or one CSV row with a header.
+The fields are 'title', 'description' and 'status'. A missing or empty status
+means 'pending'. Exports also contain the 'id' field; on import it is ignored
+and every task gets a new ID from the store.
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+"""
+
+import csv
+import json
+import time
+from itertools import islice
+
+from task_store import VALID_STATUSES
+
+FORMATS = ('jsonl', 'csv')
+FIELDS = ('id', 'title', 'description', 'status')
+
+# Number of tasks added to the store per batch
+IMPORT_BATCH_SIZE = 10000
+
+# Number of tasks between two progress reports
+PROGRESS_EVERY = 100000
+
+# Number of invalid rows reported individually before only counting them
+MAX_REPORTED_ERRORS = 10
+
+
+def detect_format(path):
+    """
+    Guess the file format from the file extension.
+
+    Args:
+        path (str): The file path.
+
+    Returns:
+        str: 'jsonl' or 'csv'.
+
+    Raises:
+        ValueError: If the extension is not recognised.
+    """
+    lowered = path.lower()
+    if lowered.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if lowered.endswith('.csv'):
+        return 'csv'
+    raise ValueError(f"Cannot tell the format of '{path}'. Use one of: {', '.join(FORMATS)}.")
+
+
+def read_jsonl(lines):
+    """
+    Parse JSONL records lazily.
+
+    Args:
+        lines (iterable): Lines of text, e.g. an open file.
+
+    Yields:
+        tuple: The line number and the parsed record (or the ValueError raised
+               while parsing it).
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if line.strip():
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as error:
+                yield line_number, error
+
+
+def read_csv(lines):
+    """
+    Parse CSV rows with a header line lazily.
+
+    Args:
+        lines (iterable): Lines of text, e.g. an open file.
+
+    Yields:
+        tuple: The line number and the row as a dictionary.
+
+    Raises:
+        ValueError: If the file is not valid CSV.
+    """
+    reader = csv.DictReader(lines)
+    try:
+        for row in reader:
+            yield reader.line_num, row
+    except csv.Error as error:
+        # A malformed file, e.g. one with an oversized field, cannot be read past this point
+        raise ValueError(f"after line {reader.line_num}: {error}") from None
+
+
+class ImportErrors:
+    """
+    Collects the invalid rows of an import.
+
+    Only the first few rows are kept with their details, the rest are counted,
+    so a file full of bad rows does not fill up memory.
+
+    Args:
+        limit (int, optional): Number of rows kept with details.
+                               Defaults to MAX_REPORTED_ERRORS.
+    """
+
+    def __init__(self, limit=MAX_REPORTED_ERRORS):
+        self.limit = limit
+        self.count = 0
+        self.details = []
+
+    def add(self, line_number, message):
+        """
+        Record an invalid row.
+
+        Args:
+            line_number (int): The line number of the row.
+            message (str): Why the row is invalid.
+
+        Returns:
+            None
+        """
+        self.count += 1
+        if len(self.details) < self.limit:
+            self.details.append((line_number, message))
+
+
+def validate_tasks(records, errors):
+    """
+    Turn parsed records into task rows, skipping the invalid ones.
+
+    Args:
+        records (iterable): (line number, record) pairs from read_jsonl or read_csv.
+        errors (ImportErrors): Receives every invalid record.
+
+    Yields:
+        tuple: (title, description, status) for every valid record.
+    """
+    for line_number, record in records:
+        if not isinstance(record, dict):
+            errors.add(line_number, f"not a task record: {record}")
+            continue
+        title = record.get('title')
+        if not isinstance(title, str) or not title.strip():
+            errors.add(line_number, "missing title")
+            continue
+        description = record.get('description') or ''
+        status = str(record.get('status') or 'pending').strip().lower()
+        if status not in VALID_STATUSES:
+            errors.add(line_number, f"invalid status '{status}'")
+            continue
+        yield title, str(description), status
+
+
+def batched(iterable, size):
+    """
+    Split an iterable into lists of at most size items.
+
+    Args:
+        iterable (iterable): The items to split.
+        size (int): The maximum batch size.
+
+    Yields:
+        list: The next batch.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_tasks(store, path, fmt=None, batch_size=IMPORT_BATCH_SIZE, progress_every=PROGRESS_EVERY):
+    """
+    Import tasks from a JSONL or CSV file into the store.
+
+    Args:
+        store: The task store to add the tasks to.
+        path (str): The file to import.
+        fmt (str, optional): 'jsonl' or 'csv'. Defaults to None, which detects
+                             the format from the file extension.
+        batch_size (int, optional): Number of tasks added per batch.
+        progress_every (int, optional): Number of tasks between progress reports.
+
+    Returns:
+        tuple: The number of imported tasks and the number of skipped rows.
+
+    Note:
+        Invalid rows are skipped. The first MAX_REPORTED_ERRORS of them are
+        printed with their line number.
+    """
+    fmt = fmt or detect_format(path)
+    reader = read_jsonl if fmt == 'jsonl' else read_csv
+    errors = ImportErrors()
+    imported = 0
+    next_report = progress_every
+    start = time.perf_counter()
+    with open(path, newline='', encoding='utf-8') as input_file:
+        for batch in batched(validate_tasks(reader(input_file), errors), batch_size):
+            store.add_many(batch)
+            imported += len(batch)
+            if imported >= next_report:
+                rate = imported / (time.perf_counter() - start)
+                print(f"{imported} tasks imported ({rate:.0f} tasks/sec)")
+                next_report += progress_every
+    elapsed = time.perf_counter() - start
+
+    for line_number, message in errors.details:
+        print(f"Skipped line {line_number}: {message}")
+    print(f"Imported {imported} tasks in {elapsed:.2f}s "
+          f"({imported / elapsed if elapsed else 0:.0f} tasks/sec), skipped {errors.count} rows.")
+    return imported, errors.count
+
+
+def export_tasks(store, path, fmt=None, progress_every=PROGRESS_EVERY):
+    """
+    Export all tasks of the store to a JSONL or CSV file.
+
+    Tasks are written one at a time while iterating the store, so the output
+    is never built in memory as a whole.
+
+    Args:
+        store: The task store to export.
+        path (str): The file to write.
+        fmt (str, optional): 'jsonl' or 'csv'. Defaults to None, which detects
+                             the format from the file extension.
+        progress_every (int, optional): Number of tasks between progress reports.
+
+    Returns:
+        int: The number of exported tasks.
+    """
+    fmt = fmt or detect_format(path)
+    exported = 0
+    start = time.perf_counter()
+    with open(path, 'w', newline='', encoding='utf-8') as output_file:
+        if fmt == 'csv':
+            writer = csv.writer(output_file)
+            writer.writerow(FIELDS)
+            write = writer.writerow
+        else:
+            def write(row):
+                output_file.write(json.dumps(dict(zip(FIELDS, row))) + '\n')
+        for task in store:
+            write((task['id'], task['task_title'], task['description'], task['task_status']))
+            exported += 1
+            if exported % progress_every == 0:
+                rate = exported / (time.perf_counter() - start)
+                print(f"{exported} tasks exported ({rate:.0f} tasks/sec)")
+    elapsed = time.perf_counter() - start
+    print(f"Exported {exported} tasks in {elapsed:.2f}s "
+          f"({exported / elapsed if elapsed else 0:.0f} tasks/sec).")
+    return exported
@@ -0,0 +1,322 @@
+"""
+Task Concurrency
+
+Description:
+Thread-safe access layer for the task stores of the Task Tracker, so the same
+tasks can be served to several worker threads. A reader/writer lock lets any
+number of threads list and search tasks at the same time, while adds, updates
+and deletes get exclusive access. Tasks are copied on write by the store, so a
+task handed to a reader never changes while it is being used.
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python task_concurrency.py    # run the reader/writer stress test
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from task_store import TaskStore, VALID_STATUSES
+
+
+class ReadWriteLock:
+    """
+    Lock that allows many readers or a single writer at a time.
+
+    Waiting writers take priority over new readers, so a steady stream of
+    readers cannot starve the writers.
+
+    Note:
+        The lock is not reentrant. A thread holding the write lock must not try
+        to take the read lock, and the other way round.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._condition:
+            self._readers -= 1
+            if self._readers == 0:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self):
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """Hold the read lock for the duration of a with block."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """Hold the write lock for the duration of a with block."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ConcurrentTaskStore:
+    """
+    Thread-safe wrapper around any task store.
+
+    Args:
+        store: The store to protect, e.g. a TaskStore, PersistentTaskStore or
+               SQLiteTaskStore.
+
+    Note:
+        Every method takes the lock once, so each call is atomic. Use reading()
+        for several reads that must see the same state, and transaction() for
+        several writes that must be applied together. Both yield the wrapped
+        store, which must be used directly inside the block.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.lock = ReadWriteLock()
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+    def __len__(self):
+        with self.lock.read_locked():
+            return len(self.store)
+
+    def __bool__(self):
+        with self.lock.read_locked():
+            return bool(self.store)
+
+    def __iter__(self):
+        with self.lock.read_locked():
+            return iter(list(self.store))
+
+    def __contains__(self, task_id):
+        with self.lock.read_locked():
+            return task_id in self.store
+
+    @contextmanager
+    def reading(self):
+        """
+        Hold the read lock for several reads that must be consistent.
+
+        Yields:
+            The wrapped store.
+        """
+        with self.lock.read_locked():
+            yield self.store
+
+    @contextmanager
+    def transaction(self):
+        """
+        Hold the write lock for several writes that must be applied together.
+
+        No reader sees the state between the writes of the block. Stores with
+        real transactions, such as SQLiteTaskStore, also commit them together.
+
+        Yields:
+            The wrapped store.
+        """
+        with self.lock.write_locked():
+            with self.store.transaction():
+                yield self.store
+
+    def get(self, task_id):
+        with self.lock.read_locked():
+            return self.store.get(task_id)
+
+    def by_status(self, status, limit=None, offset=0):
+        with self.lock.read_locked():
+            return self.store.by_status(status, limit, offset)
+
+    def count_status(self, status):
+        with self.lock.read_locked():
+            return self.store.count_status(status)
+
+    def all_tasks(self, limit=None, offset=0):
+        with self.lock.read_locked():
+            return self.store.all_tasks(limit, offset)
+
+    def search(self, query, mode='and', limit=None, offset=0, status=None):
+        with self.lock.read_locked():
+            return self.store.search(query, mode=mode, limit=limit, offset=offset, status=status)
+
+    def count_matches(self, query, mode='and', status=None):
+        with self.lock.read_locked():
+            return self.store.count_matches(query, mode=mode, status=status)
+
+    def add(self, title, description, status='pending', task_id=None):
+        with self.lock.write_locked():
+            return self.store.add(title, description, status, task_id)
+
+    def add_many(self, rows):
+        with self.lock.write_locked():
+            return self.store.add_many(rows)
+
+    def reserve_ids(self, count):
+        with self.lock.write_locked():
+            return self.store.reserve_ids(count)
+
+    def update(self, task_id, title=None, description=None, status=None):
+        with self.lock.write_locked():
+            return self.store.update(task_id, title, description, status)
+
+    def delete(self, task_id):
+        with self.lock.write_locked():
+            return self.store.delete(task_id)
+
+    def close(self):
+        with self.lock.write_locked():
+            self.store.close()
+
+
+def check_invariants(store):
+    """
+    Check that the indexes of a store agree with its tasks.
+
+    Args:
+        store: The store to check, usually the store yielded by reading().
+
+    Returns:
+        list: A description of every problem found; empty if the store is consistent.
+    """
+    problems = []
+    tasks = list(store)
+    if len(tasks) != len(store):
+        problems.append(f"iterated {len(tasks)} tasks but the store holds {len(store)}")
+    if len({task['id'] for task in tasks}) != len(tasks):
+        problems.append("duplicate task IDs")
+    counted = 0
+    for status in VALID_STATUSES:
+        bucket = store.by_status(status)
+        counted += len(bucket)
+        if len(bucket) != store.count_status(status):
+            problems.append(f"count of '{status}' does not match its tasks")
+        if any(task['task_status'] != status for task in bucket):
+            problems.append(f"task with another status listed under '{status}'")
+    if counted != len(tasks):
+        problems.append(f"status indexes hold {counted} tasks, the store {len(tasks)}")
+    return problems
+
+
+def stress_test(reader_counts=(1, 2, 4, 8), writers=2, duration=1.0, size=10000, seed=7):
+    """
+    Hammer a ConcurrentTaskStore with reader and writer threads.
+
+    Writers add, update and delete tasks, and swap the statuses of pairs of
+    tasks inside a transaction. Readers mostly look up and search tasks, and
+    now and then list tasks by status or check all store invariants under a
+    read lock. Any violated invariant is reported, and the reads and writes
+    per second are printed for every reader count.
+
+    Args:
+        reader_counts (tuple): The numbers of reader threads to run with.
+        writers (int): The number of writer threads.
+        duration (float): Seconds each configuration runs.
+        size (int): The number of tasks the store starts with.
+        seed (int): Seed for the random generators, for repeatable runs.
+
+    Returns:
+        bool: True if no invariant was violated.
+    """
+    ok = True
+    print(f"{'readers':>8} {'reads/sec':>12} {'writes/sec':>12} {'violations':>11}")
+    for reader_count in reader_counts:
+        store = ConcurrentTaskStore(TaskStore())
+        store.add_many((f"Task {i}", f"Description {i}", VALID_STATUSES[i % 3]) for i in range(size))
+        stop = threading.Event()
+        reads = [0] * reader_count
+        writes = [0] * writers
+        violations = []
+
+        def read(index):
+            rng = random.Random(seed + index)
+            while not stop.is_set():
+                kind = rng.random()
+                if kind < 0.001:
+                    with store.reading() as snapshot:
+                        violations.extend(check_invariants(snapshot))
+                elif kind < 0.01:
+                    status = rng.choice(VALID_STATUSES)
+                    if any(task['task_status'] != status for task in store.by_status(status)):
+                        violations.append("inconsistent status listing")
+                elif kind < 0.3:
+                    store.search(str(rng.randrange(size)), limit=10)
+                else:
+                    task = store.get(rng.randint(1, size))
+                    if task is not None and task['task_status'] not in VALID_STATUSES:
+                        violations.append("task with an invalid status")
+                reads[index] += 1
+
+        def write(index):
+            rng = random.Random(seed * 1000 + index)
+            while not stop.is_set():
+                kind = rng.random()
+                last_id = store.ids.last_id
+                if kind < 0.3:
+                    store.add(f"Task {rng.randrange(size)}", "added by a writer")
+                elif kind < 0.6:
+                    store.update(rng.randint(1, last_id), status=rng.choice(VALID_STATUSES))
+                elif kind < 0.8:
+                    store.delete(rng.randint(1, last_id))
+                else:
+                    # Compound update: both tasks change status or neither does
+                    with store.transaction() as locked:
+                        first = locked.get(rng.randint(1, last_id))
+                        second = locked.get(rng.randint(1, last_id))
+                        if first and second and first['id'] != second['id']:
+                            locked.update(first['id'], status=second['task_status'])
+                            locked.update(second['id'], status=first['task_status'])
+                writes[index] += 1
+                # Leave room for the readers, as in a read-mostly workload
+                time.sleep(0.0001)
+
+        threads = ([threading.Thread(target=read, args=(i,)) for i in range(reader_count)]
+                   + [threading.Thread(target=write, args=(i,)) for i in range(writers)])
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        with store.reading() as snapshot:
+            violations.extend(check_invariants(snapshot))
+
+        ok = ok and not violations
+        print(f"{reader_count:>8} {sum(reads) / duration:>12.0f} "
+              f"{sum(writes) / duration:>12.0f} {len(violations):>11}")
+        for problem in sorted(set(violations)):
+            print(f"    {problem}")
+    return ok
+
+
+if __name__ == "__main__":
+    stress_test()
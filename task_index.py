@@ -0,0 +1,401 @@
+"""
+Task Search Index
+
+Description:
+Tokenizing inverted index used by the Task Tracker to search tasks by keyword.
+Titles and descriptions are split into lowercase word tokens, and every token
+maps to the IDs of the tasks containing it. The index is maintained
+incrementally as tasks are added, updated and deleted, so a search only
+touches the tasks that actually contain the query terms instead of lowercasing
+every title and description on every call.
+
+Features:
+- Multi-word AND/OR queries
+- Prefix and infix matching ("meet" finds "meeting", "eat" finds "great")
+- Ranked results (tf-idf, with title matches weighted higher)
+- The original search semantics, a case-insensitive substring match, served
+  from a trigram index over the vocabulary instead of a scan
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python task_index.py    # run the search benchmark
+"""
+
+import heapq
+import math
+import random
+import re
+import time
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# A term in the title counts this many times more than one in the description
+TITLE_WEIGHT = 2
+
+# Length of the n-grams the vocabulary is indexed by
+GRAM_SIZE = 3
+
+
+def tokenize(text):
+    """
+    Split text into lowercase word tokens.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list: The tokens in the order they appear in the text.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TaskSearchIndex:
+    """
+    Inverted index over task titles and descriptions.
+
+    Attributes:
+        _postings (dict): Maps a term to a dictionary of task ID -> term weight.
+        _doc_terms (dict): Maps a task ID to the dictionary of its term weights,
+                           used to remove the task from the postings again.
+        _text (dict): Maps a task ID to its lowercased title and description,
+                      used by the substring scan.
+        _grams (dict): Maps every trigram of the vocabulary to the set of
+                       terms containing it.
+        _gram_parts (dict): Maps every one and two character string to the
+                            set of trigrams containing it, so shorter queries
+                            find their terms through the trigrams too.
+        _short_terms (dict): Maps every substring of a term shorter than a
+                             trigram to the set of such terms containing it.
+
+    Note:
+        The n-gram indexes only change when a term enters or leaves the
+        vocabulary, not on every task, so they cost little to keep up to date.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._doc_terms = {}
+        self._text = {}
+        self._grams = {}
+        self._gram_parts = {}
+        self._short_terms = {}
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def add(self, task_id, title, description):
+        """
+        Index a task.
+
+        Args:
+            task_id (int): The ID of the task.
+            title (str): The title of the task.
+            description (str): The description of the task.
+
+        Returns:
+            None
+        """
+        title = title.lower()
+        description = description.lower()
+        weights = {}
+        for term in TOKEN_PATTERN.findall(title):
+            weights[term] = weights.get(term, 0) + TITLE_WEIGHT
+        for term in TOKEN_PATTERN.findall(description):
+            weights[term] = weights.get(term, 0) + 1
+
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._index_term(term)
+            postings[task_id] = weight
+        self._doc_terms[task_id] = weights
+        self._text[task_id] = (title, description)
+
+    def remove(self, task_id):
+        """
+        Remove a task from the index.
+
+        Args:
+            task_id (int): The ID of the task.
+
+        Returns:
+            None
+        """
+        weights = self._doc_terms.pop(task_id, None)
+        if weights is None:
+            return
+        del self._text[task_id]
+        for term in weights:
+            postings = self._postings[term]
+            del postings[task_id]
+            if not postings:
+                del self._postings[term]
+                self._unindex_term(term)
+
+    def update(self, task_id, title, description):
+        """
+        Re-index a task after its title or description changed.
+
+        Args:
+            task_id (int): The ID of the task.
+            title (str): The new title of the task.
+            description (str): The new description of the task.
+
+        Returns:
+            None
+        """
+        self.remove(task_id)
+        self.add(task_id, title, description)
+
+    def match(self, query, mode='and', limit=None, within=None):
+        """
+        Find the tasks whose title or description contains the query, best matches first.
+
+        This keeps the original Task Tracker semantics, a case-insensitive
+        substring match, and only uses the index to find the tasks to check.
+        Text made of word characters can only occur inside a single token, so
+        the tasks containing it are exactly those with a term containing it,
+        and the trigram index of the vocabulary finds those terms. Queries with
+        spaces or punctuation span several tokens and are answered by a scan
+        instead.
+
+        Args:
+            query (str): The text to look for.
+            mode (str, optional): 'and' to match the whole query, 'or' to match
+                                  any of its space-separated words. Defaults to 'and'.
+            limit (int, optional): The maximum number of results. Defaults to None.
+            within (container, optional): Only tasks whose ID is in it can
+                                          match. Defaults to None, every task.
+
+        Returns:
+            list: The IDs of the matching tasks. Tasks found through the index
+                  are ordered by descending score and then by ascending ID,
+                  tasks found by a scan in insertion order.
+
+        Raises:
+            ValueError: If mode is not 'and' or 'or'.
+        """
+        needles = self._needles(query, mode)
+        if not all(TOKEN_PATTERN.fullmatch(needle) for needle in needles):
+            return self._scan(needles, limit, within)
+        return self._rank(self._score(self._terms(needles), within), limit)
+
+    def count(self, query, mode='and', within=None):
+        """
+        Count the tasks match() finds, without ranking them.
+
+        Args:
+            query (str): The text to look for.
+            mode (str, optional): 'and' or 'or', see match(). Defaults to 'and'.
+            within (container, optional): Only tasks whose ID is in it are
+                                          counted. Defaults to None, every task.
+
+        Returns:
+            int: The number of matching tasks.
+
+        Raises:
+            ValueError: If mode is not 'and' or 'or'.
+        """
+        needles = self._needles(query, mode)
+        if not all(TOKEN_PATTERN.fullmatch(needle) for needle in needles):
+            return len(self._scan(needles, None, within))
+        terms = self._terms(needles)
+        candidates = self._match_ids(terms)
+        if within is None:
+            return len(candidates)
+        return sum(1 for task_id in candidates if task_id in within)
+
+    def scan(self, keyword, limit=None):
+        """
+        Find the tasks whose title or description contains the keyword.
+
+        This is the original Task Tracker search: a case-insensitive substring
+        match. The lowercased text of every task is kept by the index, so no
+        strings are allocated per task while scanning.
+
+        Args:
+            keyword (str): The text to look for.
+            limit (int, optional): The maximum number of results. Defaults to None.
+
+        Returns:
+            list: The IDs of the matching tasks in insertion order.
+        """
+        return self._scan([keyword.lower()], limit)
+
+    @staticmethod
+    def _needles(query, mode):
+        if mode not in ('and', 'or'):
+            raise ValueError("Search mode must be 'and' or 'or'.")
+        query = query.lower()
+        return [query] if mode == 'and' else query.split()
+
+    def _terms(self, needles):
+        # The terms containing any of the needles, found through their trigrams
+        terms = set()
+        for needle in needles:
+            if len(needle) < GRAM_SIZE:
+                terms.update(self._short_terms.get(needle, ()))
+                for gram in self._gram_parts.get(needle, ()):
+                    terms.update(self._grams[gram])
+                continue
+            grams = sorted((self._grams.get(needle[i:i + GRAM_SIZE], ())
+                            for i in range(len(needle) - GRAM_SIZE + 1)), key=len)
+            if len(needle) == GRAM_SIZE:
+                terms.update(grams[0])
+            else:
+                # Every trigram of the needle is in the term, but the needle may still not be
+                terms.update(term for term in grams[0] if needle in term)
+        return list(terms)
+
+    def _index_term(self, term):
+        if len(term) < GRAM_SIZE:
+            for part in self._parts(term):
+                self._short_terms.setdefault(part, set()).add(term)
+            return
+        for i in range(len(term) - GRAM_SIZE + 1):
+            gram = term[i:i + GRAM_SIZE]
+            terms = self._grams.get(gram)
+            if terms is None:
+                terms = self._grams[gram] = set()
+                for part in self._parts(gram):
+                    self._gram_parts.setdefault(part, set()).add(gram)
+            terms.add(term)
+
+    def _unindex_term(self, term):
+        if len(term) < GRAM_SIZE:
+            for part in self._parts(term):
+                self._discard(self._short_terms, part, term)
+            return
+        for i in range(len(term) - GRAM_SIZE + 1):
+            gram = term[i:i + GRAM_SIZE]
+            if self._discard(self._grams, gram, term):
+                for part in self._parts(gram):
+                    self._discard(self._gram_parts, part, gram)
+
+    @staticmethod
+    def _parts(text):
+        # Every substring of text shorter than a trigram
+        return {text[i:i + length] for length in range(1, GRAM_SIZE) for i in range(len(text) - length + 1)}
+
+    @staticmethod
+    def _discard(index, key, value):
+        # Remove value from the set under key, and the key once its set is empty
+        values = index.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del index[key]
+                return True
+        return False
+
+    def _scan(self, needles, limit, within=None):
+        results = []
+        if limit is not None and limit <= 0:
+            return results
+        for task_id, (title, description) in self._text.items():
+            if within is not None and task_id not in within:
+                continue
+            if any(needle in title or needle in description for needle in needles):
+                results.append(task_id)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def _score(self, terms, within=None):
+        # tf-idf of the matched terms, summed per task
+        total = len(self._doc_terms)
+        scores = {}
+        for term in terms:
+            postings = self._postings[term]
+            idf = math.log(1 + total / len(postings))
+            if not scores:
+                scores = {task_id: weight * idf for task_id, weight in postings.items()}
+                continue
+            get = scores.get
+            for task_id, weight in postings.items():
+                scores[task_id] = get(task_id, 0.0) + weight * idf
+        if within is not None:
+            scores = {task_id: score for task_id, score in scores.items() if task_id in within}
+        return scores
+
+    @staticmethod
+    def _rank(scores, limit):
+        def rank(task_id):
+            return (-scores[task_id], task_id)
+
+        if limit is None or limit >= len(scores):
+            return sorted(scores, key=rank)
+        if limit <= 0:
+            return []
+        # Find the score of the last result first, so only the results are
+        # sorted and the other matches are only compared, not keyed
+        cutoff = heapq.nlargest(limit, scores.values())[-1]
+        better = [task_id for task_id, score in scores.items() if score > cutoff]
+        tied = heapq.nsmallest(limit - len(better),
+                               [task_id for task_id, score in scores.items() if score == cutoff])
+        return sorted(better, key=rank) + tied
+
+    def _match_ids(self, matches):
+        if len(matches) == 1:
+            return set(self._postings[matches[0]])
+        ids = set()
+        for term in matches:
+            ids.update(self._postings[term])
+        return ids
+
+def benchmark(size=1000000, queries=1000, seed=42):
+    """
+    Compare indexed search against the original linear scan.
+
+    A synthetic index of tasks is built from a vocabulary of random words,
+    plus a reference number per task so the vocabulary grows with the tasks,
+    and the average latency of whole word, prefix, infix, OR, two character
+    and missing queries is printed, next to the latency of the lowercasing
+    substring scan.
+
+    Args:
+        size (int): The number of tasks to index.
+        queries (int): The number of queries timed per query type.
+        seed (int): Seed for the random generator, for repeatable runs.
+
+    Returns:
+        None
+    """
+    rng = random.Random(seed)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 9)))
+             for _ in range(50000)]
+    index = TaskSearchIndex()
+    start = time.perf_counter()
+    for task_id in range(1, size + 1):
+        title = ' '.join(rng.choices(words, k=3))
+        description = ' '.join(rng.choices(words, k=8)) + f" ref{task_id}"
+        index.add(task_id, title, description)
+    print(f"Indexed {size} tasks, {len(index._postings)} terms, in {time.perf_counter() - start:.2f}s")
+
+    cases = [
+        ('whole word', lambda: rng.choice(words), {}),
+        ('prefix', lambda: rng.choice(words)[:4], {}),
+        ('infix', lambda: rng.choice(words)[1:5], {}),
+        ('two words OR', lambda: ' '.join(rng.choices(words, k=2)), {'mode': 'or'}),
+        ('two characters', lambda: rng.choice(words)[:2], {}),
+        ('missing', lambda: rng.choice(words) + 'qq', {}),
+    ]
+    for name, make_query, options in cases:
+        batch = [make_query() for _ in range(queries)]
+        start = time.perf_counter()
+        for query in batch:
+            index.match(query, limit=20, **options)
+        elapsed_ms = (time.perf_counter() - start) / queries * 1000
+        print(f"{name:>16}: {elapsed_ms:.3f} ms/query")
+
+    keyword = rng.choice(words)
+    start = time.perf_counter()
+    index.scan(keyword)
+    print(f"{'substring scan':>16}: {(time.perf_counter() - start) * 1000:.3f} ms/query")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,412 @@
+"""
+Task Journal
+
+Description:
+Durable persistence for the Task Tracker based on an append-only write-ahead
+journal. Every add, update and delete is appended to the journal as a single
+record, so the cost of a write does not depend on the number of tasks. The
+journal is periodically compacted into a snapshot, and on startup the store is
+rebuilt from the newest snapshot plus the records appended after it.
+
+Features:
+- One checksummed JSON record per mutation
+- Group commit: records are fsync'ed in batches instead of one by one, and
+  at most fsync_interval seconds after they were appended
+- Snapshot compaction once the journal grows as large as the task list
+- Recovery from a crash in the middle of a write: a torn or corrupt record at
+  the end of the journal is dropped and the journal is truncated before it
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python task_journal.py    # run the journal throughput benchmark
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zlib
+
+from task_store import TaskStore, VALID_STATUSES
+
+JOURNAL_FILE = 'tasks.journal'
+SNAPSHOT_FILE = 'tasks.snapshot.json'
+
+
+def encode_record(record):
+    """
+    Encode a journal record as one line of bytes.
+
+    The line holds the CRC32 of the JSON payload followed by the payload, so a
+    partially written or corrupted record can be detected when reading it back.
+
+    Args:
+        record (dict): The record to encode.
+
+    Returns:
+        bytes: The encoded line, including the trailing newline.
+    """
+    payload = json.dumps(record, separators=(',', ':')).encode('utf-8')
+    return b'%08x %s\n' % (zlib.crc32(payload), payload)
+
+
+def decode_record(line):
+    """
+    Decode a journal line written by encode_record.
+
+    Args:
+        line (bytes): The line, including the trailing newline.
+
+    Returns:
+        dict or None: The record, or None if the line is incomplete or its
+                      checksum does not match.
+    """
+    if not line.endswith(b'\n') or len(line) < 10 or line[8:9] != b' ':
+        return None
+    payload = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+class TaskJournal:
+    """
+    Append-only journal file with group commit.
+
+    Args:
+        path (str): Location of the journal file.
+        fsync_every (int, optional): Number of records after which the journal
+                                     is fsync'ed. Defaults to 64.
+        fsync_interval (float, optional): Maximum number of seconds a record may
+                                          wait for an fsync. Defaults to 0.05.
+
+    Note:
+        Every append is written to the operating system right away, so a crash
+        of the program loses nothing. Only a power loss or an operating system
+        crash can lose the records that were not fsync'ed yet, which is at most
+        fsync_every records or fsync_interval seconds worth of writes.
+
+        When an append leaves records waiting, a timer thread fsyncs them once
+        fsync_interval has passed, so the last records before a quiet period do
+        not wait for the next append.
+    """
+
+    def __init__(self, path, fsync_every=64, fsync_interval=0.05):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._file = open(path, 'ab')
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        self._timer = None
+        self.records = 0
+
+    def append(self, record):
+        """
+        Append one record to the journal.
+
+        Args:
+            record (dict): The record to append.
+
+        Returns:
+            None
+        """
+        self.append_many([record])
+
+    def append_many(self, records):
+        """
+        Append several records to the journal with a single write.
+
+        Args:
+            records (list): The records to append.
+
+        Returns:
+            None
+        """
+        data = b''.join(encode_record(record) for record in records)
+        with self._lock:
+            self._file.write(data)
+            self._file.flush()
+            self._pending += len(records)
+            self.records += len(records)
+            if (self._pending >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.fsync_interval, self._sync_due)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def sync(self):
+        """
+        Flush and fsync all records appended so far.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        if self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def _sync_due(self):
+        with self._lock:
+            self._timer = None
+            if not self._file.closed:
+                self._sync()
+
+    def replay(self):
+        """
+        Read back all complete records of the journal.
+
+        Reading stops at the first torn or corrupt record, and the journal file
+        is truncated at that point so new records are appended after the last
+        valid one.
+
+        Returns:
+            list: The valid records in the order they were written.
+        """
+        records = []
+        valid_size = 0
+        with open(self.path, 'rb') as journal_file:
+            for line in journal_file:
+                record = decode_record(line)
+                if record is None:
+                    break
+                records.append(record)
+                valid_size += len(line)
+        if valid_size < os.path.getsize(self.path):
+            self._file.flush()
+            self._file.truncate(valid_size)
+            os.fsync(self._file.fileno())
+        self.records = len(records)
+        return records
+
+    def reset(self):
+        """
+        Empty the journal after its records were saved in a snapshot.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._file.flush()
+            self._file.truncate(0)
+            os.fsync(self._file.fileno())
+            self._pending = 0
+            self.records = 0
+
+    def close(self):
+        """
+        Sync and close the journal file.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+
+class PersistentTaskStore(TaskStore):
+    """
+    TaskStore that survives restarts by journaling every change.
+
+    Args:
+        directory (str): Directory holding the journal and the snapshot. It is
+                         created if it does not exist.
+        snapshot_every (int, optional): Minimum number of journal records before
+                                        a snapshot is taken. Defaults to 10000.
+        fsync_every (int, optional): Group commit size, see TaskJournal.
+        fsync_interval (float, optional): Group commit delay, see TaskJournal.
+
+    Note:
+        The ID allocator is persisted too: the snapshot stores the highest ID
+        handed out and reserved ID blocks are journaled, so IDs of deleted tasks
+        are not reused after a restart.
+
+        A snapshot is only written once the journal holds at least as many
+        records as there are tasks, so the O(n) cost of writing a snapshot is
+        spread over at least n writes and each write stays O(1) on average.
+    """
+
+    def __init__(self, directory, snapshot_every=10000, fsync_every=64, fsync_interval=0.05):
+        super().__init__()
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._seq = self._load_snapshot()
+        self.journal = TaskJournal(os.path.join(directory, JOURNAL_FILE),
+                                   fsync_every=fsync_every, fsync_interval=fsync_interval)
+        for record in self.journal.replay():
+            if record['seq'] > self._seq:
+                self._apply(record)
+                self._seq = record['seq']
+
+    def add(self, title, description, status='pending', task_id=None):
+        task = super().add(title, description, status, task_id)
+        self._log({'op': 'add', 'id': task['id'], 'title': title,
+                   'description': description, 'status': status})
+        return task
+
+    def add_many(self, rows):
+        tasks = super().add_many(rows)
+        self._log_many([{'op': 'add', 'id': task['id'], 'title': task['task_title'],
+                         'description': task['description'], 'status': task['task_status']}
+                        for task in tasks])
+        return tasks
+
+    def update(self, task_id, title=None, description=None, status=None):
+        task = super().update(task_id, title, description, status)
+        if task is not None:
+            record = {'op': 'update', 'id': task_id}
+            if title:
+                record['title'] = title
+            if description:
+                record['description'] = description
+            if status:
+                record['status'] = status
+            self._log(record)
+        return task
+
+    def reserve_ids(self, count):
+        ids = super().reserve_ids(count)
+        self._log({'op': 'ids', 'last_id': self.ids.last_id})
+        return ids
+
+    def delete(self, task_id):
+        task = super().delete(task_id)
+        if task is not None:
+            self._log({'op': 'delete', 'id': task_id})
+        return task
+
+    def snapshot(self):
+        """
+        Write all tasks to a new snapshot and empty the journal.
+
+        The snapshot is written to a temporary file and atomically renamed over
+        the previous one, so a crash leaves either the old or the new snapshot.
+        Journal records that are already contained in the snapshot are skipped
+        on replay thanks to their sequence numbers.
+
+        Returns:
+            None
+        """
+        self.journal.sync()
+        data = {
+            'seq': self._seq,
+            'last_id': self.ids.last_id,
+            'tasks': [[task['id'], task['task_title'], task['description'], task['task_status']]
+                      for task in self],
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as snapshot_file:
+            json.dump(data, snapshot_file, separators=(',', ':'))
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(tmp_path, self._snapshot_path)
+        self.journal.reset()
+
+    def close(self):
+        """
+        Flush all pending writes and close the journal.
+
+        Returns:
+            None
+        """
+        self.journal.close()
+
+    def _log(self, record):
+        self._log_many([record])
+
+    def _log_many(self, records):
+        for record in records:
+            self._seq += 1
+            record['seq'] = self._seq
+        self.journal.append_many(records)
+        if self.journal.records >= max(self.snapshot_every, len(self)):
+            self.snapshot()
+
+    def _load_snapshot(self):
+        if not os.path.exists(self._snapshot_path):
+            return 0
+        with open(self._snapshot_path, encoding='utf-8') as snapshot_file:
+            data = json.load(snapshot_file)
+        for task_id, title, description, status in data['tasks']:
+            TaskStore.add(self, title, description, status, task_id)
+        self.ids.observe(data['last_id'])
+        return data['seq']
+
+    def _apply(self, record):
+        op = record['op']
+        if op == 'add':
+            TaskStore.add(self, record['title'], record['description'], record['status'], record['id'])
+        elif op == 'update':
+            TaskStore.update(self, record['id'], record.get('title'),
+                             record.get('description'), record.get('status'))
+        elif op == 'delete':
+            TaskStore.delete(self, record['id'])
+        elif op == 'ids':
+            self.ids.observe(record['last_id'])
+
+
+def benchmark(operations=100000, fsync_sizes=(1, 64, 1024)):
+    """
+    Measure journal write throughput and startup replay time.
+
+    For every group commit size a fresh store receives a mix of adds, updates
+    and deletes, and the resulting operations per second are printed together
+    with the time it takes to reopen the store.
+
+    Args:
+        operations (int): The number of operations per run.
+        fsync_sizes (tuple): The fsync_every values to compare.
+
+    Returns:
+        None
+    """
+    print(f"{'fsync_every':>12} {'ops/sec':>12} {'reopen (s)':>12}")
+    for fsync_every in fsync_sizes:
+        directory = tempfile.mkdtemp(prefix='task_journal_')
+        try:
+            store = PersistentTaskStore(directory, fsync_every=fsync_every, fsync_interval=1.0)
+            start = time.perf_counter()
+            for i in range(operations):
+                kind = i % 4
+                if kind < 2 or len(store) == 0:
+                    store.add(f"Task {i}", f"Description {i}")
+                elif kind == 2:
+                    store.update(store.ids.last_id, status=VALID_STATUSES[i % 3])
+                else:
+                    store.delete(store.ids.last_id - 1)
+            store.close()
+            ops_per_sec = operations / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            PersistentTaskStore(directory).close()
+            reopen = time.perf_counter() - start
+            print(f"{fsync_every:>12} {ops_per_sec:>12.0f} {reopen:>12.3f}")
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,157 @@
+"""
+Task Renderer
+
+Description:
+Shared rendering layer for the task listings of the Task Tracker. Instead of
+printing every field of every task with its own print() call, the listing is
+built as one string and written with a single call. Listings can be paged, and
+only the tasks on the requested page are formatted, so showing the first page
+of a huge backlog costs the same as showing a short one.
+
+Layouts:
+- Detailed (default): the ID, title, description and status of every task on
+  their own lines, as the Task Tracker has always shown them
+- Compact: one line per task in a table
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python task_render.py    # compare per-field printing with the renderer
+"""
+
+import math
+import os
+import sys
+import time
+from itertools import islice
+
+SEPARATOR = "==========================================="
+TITLE_WIDTH = 30
+DESCRIPTION_WIDTH = 40
+
+
+def format_task(task):
+    """
+    Format a task in the detailed layout.
+
+    Args:
+        task (dict): The task to format.
+
+    Returns:
+        str: The ID, title, description and status lines followed by a separator.
+    """
+    return (f"ID: {task['id']}\n"
+            f"Title: {task['task_title']}\n"
+            f"Description: {task['description']}\n"
+            f"Status: {task['task_status']}\n"
+            f"{SEPARATOR}\n")
+
+
+def _shorten(text, width):
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+def format_row(task):
+    """
+    Format a task as one line of the compact table.
+
+    Args:
+        task (dict): The task to format.
+
+    Returns:
+        str: The table row, with long titles and descriptions shortened.
+    """
+    return (f"{task['id']:>8}  {task['task_status']:<11}  "
+            f"{_shorten(task['task_title'], TITLE_WIDTH):<{TITLE_WIDTH}}  "
+            f"{_shorten(task['description'], DESCRIPTION_WIDTH)}\n")
+
+
+TABLE_HEADER = f"{'ID':>8}  {'Status':<11}  {'Title':<{TITLE_WIDTH}}  Description\n"
+
+
+def render_tasks(tasks, header=None, page=1, limit=None, compact=False, total=None, out=None,
+                 paged=False):
+    """
+    Write a listing of tasks with a single write call.
+
+    Args:
+        tasks (iterable): The tasks to list. It is only consumed up to the end
+                          of the requested page.
+        header (str, optional): A line written before the tasks. Defaults to None.
+        page (int, optional): The page to show, starting at 1. Defaults to 1.
+        limit (int, optional): The number of tasks per page. Defaults to None,
+                               which lists every task on a single page.
+        compact (bool, optional): Use the one-line-per-task table layout.
+                                  Defaults to False.
+        total (int, optional): The total number of tasks, used to show the
+                               number of pages. Defaults to None.
+        out (file, optional): Where to write the listing. Defaults to sys.stdout.
+        paged (bool, optional): Whether tasks already holds only the requested
+                                page, e.g. fetched with the store's limit and
+                                offset. Defaults to False.
+
+    Returns:
+        int: The number of tasks written.
+    """
+    out = out or sys.stdout
+    if limit and not paged:
+        start = (max(page, 1) - 1) * limit
+        tasks = islice(tasks, start, start + limit)
+    formatter = format_row if compact else format_task
+
+    parts = []
+    if header:
+        parts.append(header + "\n")
+    if compact:
+        parts.append(TABLE_HEADER)
+    rows = len(parts)
+    parts.extend(map(formatter, tasks))
+    rows = len(parts) - rows
+    if limit and total is not None:
+        pages = max(math.ceil(total / limit), 1)
+        parts.append(f"Page {page} of {pages} ({total} tasks)\n")
+    out.write(''.join(parts))
+    return rows
+
+
+def benchmark(size=100000):
+    """
+    Compare the original per-field printing with render_tasks.
+
+    Output goes to a line-buffered null device, which behaves like a terminal:
+    every line written by print() reaches the operating system as its own write.
+
+    Args:
+        size (int): The number of tasks to list.
+
+    Returns:
+        None
+    """
+    tasks = [{'id': i, 'task_title': f"Task {i}", 'description': f"Description of task {i}",
+              'task_status': 'pending'} for i in range(1, size + 1)]
+
+    with open(os.devnull, 'w', buffering=1) as out:
+        start = time.perf_counter()
+        for task in tasks:
+            print(f"ID: {task['id']}", file=out)
+            print(f"Title: {task['task_title']}", file=out)
+            print(f"Description: {task['description']}", file=out)
+            print(f"Status: {task['task_status']}", file=out)
+            print(SEPARATOR, file=out)
+        print_time = time.perf_counter() - start
+
+        cases = [
+            ("render_tasks", {}),
+            ("render_tasks --compact", {'compact': True}),
+            ("render_tasks --limit 20", {'limit': 20, 'total': size}),
+        ]
+        print(f"{'print() per field':>24}: {print_time * 1000:9.1f} ms")
+        for name, options in cases:
+            start = time.perf_counter()
+            render_tasks(iter(tasks), out=out, **options)
+            print(f"{name:>24}: {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    benchmark()
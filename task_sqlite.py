@@ -0,0 +1,456 @@
+"""
+Task SQLite Store
+
+Description:
+SQLite storage engine for the Task Tracker. It offers the same interface as
+TaskStore, but keeps the tasks in a local SQLite database instead of memory,
+so the task list can grow far beyond the available RAM while listing by
+status and keyword search stay fast.
+
+Features:
+- WAL journal mode, so readers are not blocked by a writer
+- Index on task status (the task ID is the table's primary key)
+- FTS5 trigram table for ranked substring search, kept in sync by triggers
+- Fixed SQL statements that are compiled once and reused from the statement cache
+- Bulk inserts in a single transaction
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python task_sqlite.py    # run the SQLite store benchmark
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+
+from task_store import IdAllocator, VALID_STATUSES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    task_status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_status_idx ON tasks (task_status, id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts
+    USING fts5(task_title, description, content='tasks', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts (rowid, task_title, description)
+    VALUES (new.id, new.task_title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, task_title, description)
+    VALUES ('delete', old.id, old.task_title, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF task_title, description ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, task_title, description)
+    VALUES ('delete', old.id, old.task_title, old.description);
+    INSERT INTO tasks_fts (rowid, task_title, description)
+    VALUES (new.id, new.task_title, new.description);
+END;
+"""
+
+COLUMNS = "id, task_title, description, task_status"
+SQL_COUNT = "SELECT COUNT(*) FROM tasks"
+# Stops at the first row, where COUNT(*) reads the whole table
+SQL_ANY = "SELECT EXISTS (SELECT 1 FROM tasks)"
+SQL_ALL = f"SELECT {COLUMNS} FROM tasks ORDER BY id"
+SQL_GET = f"SELECT {COLUMNS} FROM tasks WHERE id = ?"
+SQL_INSERT = "INSERT INTO tasks (id, task_title, description, task_status) VALUES (?, ?, ?, ?)"
+SQL_UPDATE = """UPDATE tasks SET task_title = COALESCE(?, task_title),
+                                 description = COALESCE(?, description),
+                                 task_status = COALESCE(?, task_status)
+                WHERE id = ?"""
+SQL_DELETE = "DELETE FROM tasks WHERE id = ?"
+# AUTOINCREMENT keeps the highest ID ever used in sqlite_sequence, even after deletes
+SQL_LAST_ID = "SELECT seq FROM sqlite_sequence WHERE name = 'tasks'"
+SQL_RESERVE_IDS = "UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'tasks'"
+SQL_INIT_IDS = "INSERT INTO sqlite_sequence (name, seq) SELECT 'tasks', ? WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'tasks')"
+SQL_BY_STATUS = f"SELECT {COLUMNS} FROM tasks WHERE task_status = ? ORDER BY id LIMIT ? OFFSET ?"
+SQL_COUNT_STATUS = "SELECT COUNT(*) FROM tasks WHERE task_status = ?"
+SQL_PAGE = f"SELECT {COLUMNS} FROM tasks ORDER BY id LIMIT ? OFFSET ?"
+# bm25() returns lower values for better matches; titles weigh twice as much.
+# A NULL status matches every task.
+SQL_SEARCH = f"""SELECT {COLUMNS} FROM tasks
+                 JOIN (SELECT rowid, bm25(tasks_fts, 2.0, 1.0) AS score
+                       FROM tasks_fts WHERE tasks_fts MATCH ?) AS hits ON hits.rowid = tasks.id
+                 WHERE task_status = COALESCE(?, task_status)
+                 ORDER BY hits.score, tasks.id LIMIT ? OFFSET ?"""
+SQL_COUNT_SEARCH = """SELECT COUNT(*) FROM tasks
+                      JOIN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?) AS hits
+                      ON hits.rowid = tasks.id
+                      WHERE task_status = COALESCE(?, task_status)"""
+SQL_SCAN = f"""SELECT {COLUMNS} FROM tasks WHERE ({{}}) AND task_status = COALESCE(?, task_status)
+               ORDER BY id LIMIT ? OFFSET ?"""
+SQL_COUNT_SCAN = "SELECT COUNT(*) FROM tasks WHERE ({}) AND task_status = COALESCE(?, task_status)"
+SQL_SCAN_CONDITION = "task_title LIKE ? ESCAPE '\\' OR description LIKE ? ESCAPE '\\'"
+
+# The trigram tokenizer indexes every run of three characters, so shorter
+# search text cannot be looked up and is answered by a scan
+FTS_MIN_LENGTH = 3
+
+# Number of compiled statements sqlite3 keeps per connection
+STATEMENT_CACHE_SIZE = 64
+
+
+def _task_from_row(row):
+    if row is None:
+        return None
+    return {'id': row[0], 'task_title': row[1], 'description': row[2], 'task_status': row[3]}
+
+
+class SQLiteTaskStore:
+    """
+    TaskStore backed by a SQLite database file.
+
+    Args:
+        path (str): Location of the database file. It is created if needed.
+
+    Note:
+        Every statement is a module-level constant with ? placeholders, so the
+        sqlite3 statement cache compiles each one only once per connection.
+        If the SQLite library was built without FTS5, keyword search falls back
+        to a LIKE scan.
+
+        New IDs come from an IdAllocator that starts from the AUTOINCREMENT
+        sequence of the tasks table. Every insert with an allocated ID advances
+        that sequence, and reserve_ids() advances it for a whole block, so IDs
+        stay unique across restarts.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, cached_statements=STATEMENT_CACHE_SIZE,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+        try:
+            with self._conn:
+                self._conn.executescript(FTS_SCHEMA)
+            self._fts = True
+        except sqlite3.OperationalError:
+            self._fts = False
+        row = self._conn.execute(SQL_LAST_ID).fetchone()
+        self.ids = IdAllocator(row[0] if row else 0)
+        self._in_transaction = False
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several writes into a single transaction.
+
+        Writes inside the block are committed together when it ends, or rolled
+        back together if it raises. Nested blocks join the outer transaction.
+
+        Yields:
+            SQLiteTaskStore: The store itself.
+        """
+        if self._in_transaction:
+            yield self
+            return
+        self._in_transaction = True
+        try:
+            with self._conn:
+                yield self
+        finally:
+            self._in_transaction = False
+
+    def __len__(self):
+        return self._conn.execute(SQL_COUNT).fetchone()[0]
+
+    def __bool__(self):
+        return bool(self._conn.execute(SQL_ANY).fetchone()[0])
+
+    def __iter__(self):
+        return map(_task_from_row, self._conn.execute(SQL_ALL))
+
+    def __contains__(self, task_id):
+        return self.get(task_id) is not None
+
+    def get(self, task_id):
+        """
+        Return the task with the given ID, or None if it does not exist.
+
+        Args:
+            task_id (int): The ID of the task to look up.
+
+        Returns:
+            dict or None: The task dictionary.
+        """
+        return _task_from_row(self._conn.execute(SQL_GET, (task_id,)).fetchone())
+
+    def add(self, title, description, status='pending', task_id=None):
+        """
+        Add a new task to the database.
+
+        Args:
+            title (str): The title of the task.
+            description (str): A detailed description of the task.
+            status (str, optional): The initial status. Defaults to 'pending'.
+            task_id (int, optional): An explicit ID to use. Defaults to None,
+                                     which assigns the next free ID.
+
+        Returns:
+            dict: The newly added task.
+
+        Raises:
+            ValueError: If a task with the given explicit ID already exists.
+        """
+        if task_id is None:
+            task_id = self.ids.next_id()
+        else:
+            self.ids.observe(task_id)
+        try:
+            with self.transaction():
+                self._conn.execute(SQL_INSERT, (task_id, title, description, status))
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Task ID {task_id} already exists.")
+        return _task_from_row((task_id, title, description, status))
+
+    def reserve_ids(self, count):
+        """
+        Reserve a block of IDs, e.g. for a bulk import.
+
+        The end of the block is written to the AUTOINCREMENT sequence right
+        away, so the reserved IDs are not handed out again after a restart.
+
+        Args:
+            count (int): The number of IDs to reserve.
+
+        Returns:
+            range: The reserved IDs.
+        """
+        ids = self.ids.reserve(count)
+        with self.transaction():
+            self._conn.execute(SQL_RESERVE_IDS, (self.ids.last_id,))
+            self._conn.execute(SQL_INIT_IDS, (self.ids.last_id,))
+        return ids
+
+    def add_many(self, rows):
+        """
+        Add many tasks in a single transaction.
+
+        Args:
+            rows (iterable): Tuples of (title, description, status).
+
+        Returns:
+            list: The added tasks.
+        """
+        rows = list(rows)
+        ids = self.reserve_ids(len(rows))
+        tasks = [(task_id, title, description, status)
+                 for task_id, (title, description, status) in zip(ids, rows)]
+        with self.transaction():
+            self._conn.executemany(SQL_INSERT, tasks)
+        return list(map(_task_from_row, tasks))
+
+    def update(self, task_id, title=None, description=None, status=None):
+        """
+        Update the fields of an existing task.
+
+        Args:
+            task_id (int): The ID of the task to be updated.
+            title (str, optional): The new title. Defaults to None.
+            description (str, optional): The new description. Defaults to None.
+            status (str, optional): The new status. Defaults to None.
+
+        Returns:
+            dict or None: The updated task, or None if the task was not found.
+
+        Note:
+            Empty values leave the corresponding field unchanged.
+        """
+        with self.transaction():
+            cursor = self._conn.execute(SQL_UPDATE, (title or None, description or None,
+                                                     status or None, task_id))
+            if cursor.rowcount == 0:
+                return None
+            return self.get(task_id)
+
+    def delete(self, task_id):
+        """
+        Remove a task from the database.
+
+        Args:
+            task_id (int): The ID of the task to be deleted.
+
+        Returns:
+            dict or None: The removed task, or None if the task was not found.
+        """
+        with self.transaction():
+            task = self.get(task_id)
+            if task is not None:
+                self._conn.execute(SQL_DELETE, (task_id,))
+        return task
+
+    def by_status(self, status, limit=None, offset=0):
+        """
+        Return the tasks with the given status, in ID order.
+
+        Paging is done by SQLite with LIMIT and OFFSET on the status index, so
+        only the rows of the requested page are read and converted.
+
+        Args:
+            status (str): The status to filter by.
+            limit (int, optional): The maximum number of tasks. Defaults to None.
+            offset (int, optional): The number of matching tasks to skip. Defaults to 0.
+
+        Returns:
+            list: The matching tasks.
+        """
+        rows = self._conn.execute(SQL_BY_STATUS, (status, -1 if limit is None else limit, offset))
+        return list(map(_task_from_row, rows))
+
+    def count_status(self, status):
+        """
+        Return the number of tasks with the given status.
+
+        Args:
+            status (str): The status to count.
+
+        Returns:
+            int: The number of matching tasks.
+        """
+        return self._conn.execute(SQL_COUNT_STATUS, (status,)).fetchone()[0]
+
+    def all_tasks(self, limit=None, offset=0):
+        """
+        Return the tasks in ID order, one page at a time.
+
+        Args:
+            limit (int, optional): The maximum number of tasks. Defaults to None.
+            offset (int, optional): The number of tasks to skip. Defaults to 0.
+
+        Returns:
+            list: The tasks of the page.
+        """
+        return list(map(_task_from_row, self._conn.execute(SQL_PAGE, (-1 if limit is None else limit, offset))))
+
+    def search(self, query, mode='and', limit=None, offset=0, status=None):
+        """
+        Search tasks by keyword.
+
+        A task matches when its title or description contains the query, case
+        insensitively, like the in-memory store. The FTS5 table uses the
+        trigram tokenizer, so it answers substring queries directly and ranks
+        the matches by bm25. Text shorter than three characters is matched with
+        a LIKE scan instead.
+
+        Args:
+            query (str): The text to look for.
+            mode (str, optional): 'and' to match the whole query, 'or' to match
+                                  any of its words. Defaults to 'and'.
+            limit (int, optional): The maximum number of results. Defaults to None.
+            offset (int, optional): The number of best matches to skip. Defaults to 0.
+            status (str, optional): Only match tasks with this status. Defaults to None.
+
+        Returns:
+            list: The matching tasks, best matches first.
+
+        Raises:
+            ValueError: If mode is not 'and' or 'or'.
+        """
+        statements = self._search_statements(query, mode)
+        if statements is None:
+            return []
+        sql, _, params = statements
+        rows = self._conn.execute(sql, (*params, status, -1 if limit is None else limit, offset))
+        return list(map(_task_from_row, rows))
+
+    def count_matches(self, query, mode='and', status=None):
+        """
+        Return the number of tasks search() finds for a query.
+
+        Args:
+            query (str): The text to look for.
+            mode (str, optional): 'and' or 'or', see search(). Defaults to 'and'.
+            status (str, optional): Only count tasks with this status. Defaults to None.
+
+        Returns:
+            int: The number of matching tasks.
+
+        Raises:
+            ValueError: If mode is not 'and' or 'or'.
+        """
+        statements = self._search_statements(query, mode)
+        if statements is None:
+            return 0
+        _, sql, params = statements
+        return self._conn.execute(sql, (*params, status)).fetchone()[0]
+
+    def _search_statements(self, query, mode):
+        if mode not in ('and', 'or'):
+            raise ValueError("Search mode must be 'and' or 'or'.")
+        needles = [query] if mode == 'and' else query.split()
+        if not needles:
+            return None
+        if self._fts and all(len(needle) >= FTS_MIN_LENGTH for needle in needles):
+            match = ' OR '.join('"' + needle.replace('"', '""') + '"' for needle in needles)
+            return SQL_SEARCH, SQL_COUNT_SEARCH, (match,)
+        patterns = []
+        for needle in needles:
+            pattern = '%' + needle.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            patterns += [pattern, pattern]
+        condition = ' OR '.join([SQL_SCAN_CONDITION] * len(needles))
+        return SQL_SCAN.format(condition), SQL_COUNT_SCAN.format(condition), tuple(patterns)
+
+    def close(self):
+        """
+        Close the database connection.
+
+        Returns:
+            None
+        """
+        self._conn.close()
+
+
+def benchmark(size=1000000, repeat=1000):
+    """
+    Measure bulk insert, point operations, status listing and search.
+
+    Args:
+        size (int): The number of tasks to insert.
+        repeat (int): The number of operations timed per measurement.
+
+    Returns:
+        None
+    """
+    directory = tempfile.mkdtemp(prefix='task_sqlite_')
+    store = SQLiteTaskStore(os.path.join(directory, 'tasks.db'))
+    try:
+        start = time.perf_counter()
+        store.add_many((f"Task {i}", f"Description of task number {i}", VALID_STATUSES[i % 3])
+                       for i in range(size))
+        elapsed = time.perf_counter() - start
+        print(f"bulk insert: {size / elapsed:.0f} tasks/sec")
+
+        def timed(name, operation):
+            start = time.perf_counter()
+            for i in range(repeat):
+                operation(size // 2 + i)
+            print(f"{name}: {(time.perf_counter() - start) / repeat * 1e6:.1f} us/op")
+
+        timed("update", lambda task_id: store.update(task_id, status='done'))
+        timed("count status", lambda task_id: store.count_status('pending'))
+        timed("status page", lambda task_id: store.by_status('pending', limit=20, offset=task_id // 3))
+        timed("search", lambda task_id: store.search(str(task_id), limit=20))
+        timed("delete", lambda task_id: store.delete(task_id))
+    finally:
+        store.close()
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,415 @@
+"""
+Task Store
+
+Description:
+In-memory storage engine used by the Task Tracker CLI application.
+Tasks are kept in a primary dictionary keyed by their ID, together with a
+secondary index keyed by task status and an inverted index over titles and
+descriptions. All of them are updated incrementally on every add, update and
+delete, so looking up a task by ID, deleting it, listing all tasks with a
+given status or searching by keyword no longer needs a scan over the whole
+task list.
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python task_store.py    # run the store benchmark
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from task_index import TaskSearchIndex
+
+# Statuses accepted by the status listing in the CLI
+VALID_STATUSES = ('pending', 'in progress', 'done')
+
+
+class IdAllocator:
+    """
+    Monotonic, thread-safe allocator for task IDs.
+
+    IDs are never handed out twice, even after the task that used an ID was
+    deleted, so an ID always identifies at most one task.
+
+    Args:
+        last_id (int, optional): The highest ID handed out so far, e.g. as
+                                 restored from storage. Defaults to 0.
+    """
+
+    def __init__(self, last_id=0):
+        self._last_id = last_id
+        self._lock = threading.Lock()
+
+    @property
+    def last_id(self):
+        """int: The highest ID handed out or observed so far."""
+        return self._last_id
+
+    def next_id(self):
+        """
+        Allocate the next ID.
+
+        Returns:
+            int: The allocated ID.
+        """
+        with self._lock:
+            self._last_id += 1
+            return self._last_id
+
+    def reserve(self, count):
+        """
+        Allocate a block of consecutive IDs in one step.
+
+        Args:
+            count (int): The number of IDs to allocate.
+
+        Returns:
+            range: The allocated IDs.
+
+        Raises:
+            ValueError: If count is negative.
+        """
+        if count < 0:
+            raise ValueError("Cannot reserve a negative number of IDs.")
+        with self._lock:
+            start = self._last_id + 1
+            self._last_id += count
+            return range(start, start + count)
+
+    def observe(self, task_id):
+        """
+        Record an ID that was assigned elsewhere, e.g. loaded from storage, so
+        it is never allocated again.
+
+        Args:
+            task_id (int): The ID in use.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if task_id > self._last_id:
+                self._last_id = task_id
+
+
+class TaskStore:
+    """
+    Indexed in-memory container for tasks.
+
+    Every task is a dictionary with the keys 'id', 'task_title', 'description'
+    and 'task_status', the same shape the Task Tracker has always used.
+
+    Attributes:
+        _tasks (dict): Primary index mapping task ID to the task dictionary.
+        _by_status (dict): Secondary index mapping a status to a dictionary of
+                           task ID -> task for all tasks with that status.
+        _search_index (TaskSearchIndex): Inverted index over titles and descriptions.
+        ids (IdAllocator): Allocator handing out the IDs of new tasks.
+
+    Note:
+        Tasks are never modified in place; update() replaces them with an
+        updated copy.
+
+        Dictionaries keep insertion order, so iterating the store returns tasks
+        in the order they were added, and iterating a status bucket returns
+        tasks in the order they entered that status.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self._by_status = {}
+        self._search_index = TaskSearchIndex()
+        self.ids = IdAllocator()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several operations, for stores that support transactions.
+
+        Changes to the in-memory store take effect immediately, so this is a
+        no-op kept for interface compatibility with the other engines.
+
+        Yields:
+            TaskStore: The store itself.
+        """
+        yield self
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __iter__(self):
+        return iter(self._tasks.values())
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
+
+    def get(self, task_id):
+        """
+        Return the task with the given ID, or None if it does not exist.
+
+        Args:
+            task_id (int): The ID of the task to look up.
+
+        Returns:
+            dict or None: The task dictionary.
+        """
+        return self._tasks.get(task_id)
+
+    def add(self, title, description, status='pending', task_id=None):
+        """
+        Add a new task to the store.
+
+        Args:
+            title (str): The title of the task.
+            description (str): A detailed description of the task.
+            status (str, optional): The initial status. Defaults to 'pending'.
+            task_id (int, optional): An explicit ID to use, e.g. when tasks are
+                                     loaded back from storage. Defaults to None,
+                                     which assigns the next free ID.
+
+        Returns:
+            dict: The newly added task.
+
+        Raises:
+            ValueError: If a task with the given explicit ID already exists.
+        """
+        if task_id is None:
+            task_id = self.ids.next_id()
+        elif task_id in self._tasks:
+            raise ValueError(f"Task ID {task_id} already exists.")
+        else:
+            self.ids.observe(task_id)
+        task = {
+            'id': task_id,
+            'task_title': title,
+            'description': description,
+            'task_status': status
+        }
+        self._tasks[task_id] = task
+        self._by_status.setdefault(status, {})[task_id] = task
+        self._search_index.add(task_id, title, description)
+        return task
+
+    def add_many(self, rows):
+        """
+        Add many tasks at once, using one reserved block of IDs.
+
+        Args:
+            rows (iterable): Tuples of (title, description, status).
+
+        Returns:
+            list: The added tasks.
+        """
+        rows = list(rows)
+        ids = self.reserve_ids(len(rows))
+        return [TaskStore.add(self, title, description, status, task_id)
+                for task_id, (title, description, status) in zip(ids, rows)]
+
+    def reserve_ids(self, count):
+        """
+        Reserve a block of IDs, e.g. for a bulk import.
+
+        The reserved IDs can be passed to add() as explicit task IDs.
+
+        Args:
+            count (int): The number of IDs to reserve.
+
+        Returns:
+            range: The reserved IDs.
+        """
+        return self.ids.reserve(count)
+
+    def update(self, task_id, title=None, description=None, status=None):
+        """
+        Update the fields of an existing task.
+
+        Args:
+            task_id (int): The ID of the task to be updated.
+            title (str, optional): The new title. Defaults to None.
+            description (str, optional): The new description. Defaults to None.
+            status (str, optional): The new status. Defaults to None.
+
+        Returns:
+            dict or None: The updated task, or None if the task was not found.
+
+        Note:
+            Empty values leave the corresponding field unchanged, matching the
+            "leave blank to keep current" prompts of the CLI.
+
+            The task is copied on write: the updated task is a new dictionary
+            that replaces the old one in all indexes, so a task returned
+            earlier never changes underneath its reader.
+        """
+        task = self._tasks.get(task_id)
+        if task is None:
+            return None
+        updated = dict(task)
+        if title:
+            updated['task_title'] = title
+        if description:
+            updated['description'] = description
+        if status:
+            updated['task_status'] = status
+        self._tasks[task_id] = updated
+        if updated['task_status'] != task['task_status']:
+            self._unindex_status(task)
+            self._by_status.setdefault(updated['task_status'], {})[task_id] = updated
+        else:
+            self._by_status[task['task_status']][task_id] = updated
+        if title or description:
+            self._search_index.update(task_id, updated['task_title'], updated['description'])
+        return updated
+
+    def delete(self, task_id):
+        """
+        Remove a task from the store.
+
+        Args:
+            task_id (int): The ID of the task to be deleted.
+
+        Returns:
+            dict or None: The removed task, or None if the task was not found.
+        """
+        task = self._tasks.pop(task_id, None)
+        if task is not None:
+            self._unindex_status(task)
+            self._search_index.remove(task_id)
+        return task
+
+    def by_status(self, status, limit=None, offset=0):
+        """
+        Return the tasks with the given status.
+
+        Only the requested page is copied out of the status bucket, so listing
+        one page does not copy every task with the status.
+
+        Args:
+            status (str): The status to filter by.
+            limit (int, optional): The maximum number of tasks. Defaults to None.
+            offset (int, optional): The number of matching tasks to skip. Defaults to 0.
+
+        Returns:
+            list: The matching tasks.
+        """
+        bucket = self._by_status.get(status, {})
+        return list(islice(bucket.values(), offset, None if limit is None else offset + limit))
+
+    def count_status(self, status):
+        """
+        Return the number of tasks with the given status.
+
+        Args:
+            status (str): The status to count.
+
+        Returns:
+            int: The number of matching tasks.
+        """
+        return len(self._by_status.get(status, ()))
+
+    def all_tasks(self, limit=None, offset=0):
+        """
+        Return the tasks in the order they were added, one page at a time.
+
+        Args:
+            limit (int, optional): The maximum number of tasks. Defaults to None.
+            offset (int, optional): The number of tasks to skip. Defaults to 0.
+
+        Returns:
+            list: The tasks of the page.
+        """
+        return list(islice(self._tasks.values(), offset, None if limit is None else offset + limit))
+
+    def search(self, query, mode='and', limit=None, offset=0, status=None):
+        """
+        Search tasks by keyword.
+
+        A task matches when its title or description contains the query, case
+        insensitively, as the Task Tracker has always searched. The inverted
+        index only narrows down the tasks to check and ranks the matches.
+
+        Args:
+            query (str): The text to look for.
+            mode (str, optional): 'and' to match the whole query, 'or' to match
+                                  any of its words. Defaults to 'and'.
+            limit (int, optional): The maximum number of results. Defaults to None.
+            offset (int, optional): The number of best matches to skip. Defaults to 0.
+            status (str, optional): Only match tasks with this status. Defaults to None.
+
+        Returns:
+            list: The matching tasks, best matches first.
+        """
+        within = None if status is None else self._by_status.get(status, {})
+        task_ids = self._search_index.match(query, mode=mode, within=within,
+                                            limit=None if limit is None else offset + limit)
+        return [self._tasks[task_id] for task_id in task_ids[offset:]]
+
+    def count_matches(self, query, mode='and', status=None):
+        """
+        Return the number of tasks search() finds for a query.
+
+        Args:
+            query (str): The text to look for.
+            mode (str, optional): 'and' or 'or', see search(). Defaults to 'and'.
+            status (str, optional): Only count tasks with this status. Defaults to None.
+
+        Returns:
+            int: The number of matching tasks.
+        """
+        within = None if status is None else self._by_status.get(status, {})
+        return self._search_index.count(query, mode=mode, within=within)
+
+    def _unindex_status(self, task):
+        bucket = self._by_status.get(task['task_status'])
+        if bucket is not None:
+            bucket.pop(task['id'], None)
+            if not bucket:
+                del self._by_status[task['task_status']]
+
+
+def benchmark(sizes=(10000, 100000, 1000000), repeat=1000):
+    """
+    Measure update, delete and status lookups at increasing store sizes.
+
+    For every size a store is filled with tasks spread over the three valid
+    statuses, and the average time of a single update, delete and status
+    count is printed. Constant-time operations show roughly the same timings
+    regardless of the store size.
+
+    Args:
+        sizes (tuple): The numbers of tasks to benchmark with.
+        repeat (int): The number of operations timed per measurement.
+
+    Returns:
+        None
+    """
+    print(f"{'tasks':>10} {'update (us)':>12} {'delete (us)':>12} {'status (us)':>12}")
+    for size in sizes:
+        store = TaskStore()
+        for i in range(size):
+            store.add(f"Task {i}", f"Description {i}", VALID_STATUSES[i % 3])
+
+        ids = range(size // 2, size // 2 + repeat)
+        start = time.perf_counter()
+        for task_id in ids:
+            store.update(task_id, status='done')
+        update_us = (time.perf_counter() - start) / repeat * 1e6
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            store.count_status('in progress')
+        status_us = (time.perf_counter() - start) / repeat * 1e6
+
+        start = time.perf_counter()
+        for task_id in ids:
+            store.delete(task_id)
+        delete_us = (time.perf_counter() - start) / repeat * 1e6
+
+        print(f"{size:>10} {update_us:>12.2f} {delete_us:>12.2f} {status_us:>12.2f}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -18,6 +18,11 @@ Features:
 - Delete tasks
 - Search tasks by keyword
 - List tasks by status (pending, in progress, completed)
+- Tasks are saved in a journal and restored on the next start
+- Optional SQLite storage engine for task lists larger than memory
+- Bulk import and export of tasks as JSONL or CSV files
+- Paged listings and a compact one-line-per-task layout
+- Non-interactive subcommands and a batch mode for scripting
 - Simple and intuitive command-line interface
 
 This project serves as a practical example of basic CRUD operations
@@ -25,12 +30,67 @@ and data management in Python, suitable for beginners and intermediate
 programmers looking to understand CLI application development.
 """
 
+import argparse
+import json
+import os
+import shlex
+import sys
+import time
+
+from task_bulk import export_tasks, import_tasks
+from task_concurrency import ConcurrentTaskStore
+from task_journal import PersistentTaskStore
+from task_render import render_tasks
+from task_sqlite import SQLiteTaskStore
+from task_store import TaskStore, VALID_STATUSES
+
+# Directory where the tasks are persisted between runs
+TASK_DATA_DIR = 'task_data'
+
+# Storage engines that can be selected with --engine
+ENGINES = ('memory', 'sqlite')
+
+# Fields a JSON batch operation may set, and their types, for every operation
+BATCH_FIELDS = {
+    'add': {'title': str, 'description': str, 'status': str},
+    'update': {'id': int, 'title': str, 'description': str, 'status': str},
+    'delete': {'id': int},
+    'search': {'keyword': str, 'page': int, 'limit': int, 'compact': bool},
+    'list': {'status': str, 'page': int, 'limit': int, 'compact': bool},
+}
+FIELD_TYPE_NAMES = {str: 'a string', int: 'an integer', bool: 'true or false'}
+
+task_store = TaskStore()
+
+def open_task_store(engine='memory', data_dir=TASK_DATA_DIR, concurrent=False):
+    """
+    Open the persistent task store for the given storage engine.
+
+    Args:
+        engine (str, optional): 'memory' keeps all tasks in memory and journals
+                                every change to disk, 'sqlite' keeps the tasks in
+                                a SQLite database. Defaults to 'memory'.
+        data_dir (str, optional): Directory holding the task data.
+                                  Defaults to TASK_DATA_DIR.
+        concurrent (bool, optional): Wrap the store in a ConcurrentTaskStore so it
+                                     can be shared by several threads.
+                                     Defaults to False.
+
+    Returns:
+        PersistentTaskStore, SQLiteTaskStore or ConcurrentTaskStore: The opened store.
 
-print("####################################################################################################")
-print("#                                            TASK TRACKER IN PYTHON                                #")
-print("####################################################################################################")
+    Raises:
+        ValueError: If the engine is not one of ENGINES.
+    """
+    if engine == 'memory':
+        store = PersistentTaskStore(data_dir)
+    elif engine == 'sqlite':
+        os.makedirs(data_dir, exist_ok=True)
+        store = SQLiteTaskStore(os.path.join(data_dir, 'tasks.db'))
+    else:
+        raise ValueError(f"Unknown storage engine '{engine}'. Use one of: {', '.join(ENGINES)}.")
+    return ConcurrentTaskStore(store) if concurrent else store
 
-tasks_list = []
 def add_task(title, task_description):
     """
     Add a new task to the task list.
@@ -40,48 +100,41 @@ def add_task(title, task_description):
         task_description (str): A detailed description of the task.
 
     Returns:
-        None
+        dict: The newly added task.
 
     Note:
-        This function automatically assigns an ID to the task based on the current number of tasks.
+        This function automatically assigns the next free ID to the task.
         The new task is always added with a 'pending' status.
     """
-    task_id = len(tasks_list) + 1
-    task = {
-        'id': task_id,
-        'task_title': title,
-        'description': task_description,
-        'task_status': 'pending'
-    }
-    tasks_list.append(task)
-
-def view_tasks():
+    return task_store.add(title, task_description)
+
+def view_tasks(page=1, limit=None, compact=False):
     """
     Display all tasks in the task list.
 
-    This function prints out all tasks currently stored in the tasks_list.
+    This function prints out all tasks currently stored in the task_store.
     For each task, it displays the ID, title, description, and status.
     If there are no tasks in the list, it prints a message indicating that no tasks have been added yet.
 
     Args:
-        None
+        page (int, optional): The page of results to display. Defaults to 1.
+        limit (int, optional): The number of tasks per page. Defaults to None,
+                               which displays all tasks.
+        compact (bool, optional): Display one line per task. Defaults to False.
 
     Returns:
         None
 
     Note:
-        This function does not modify the tasks_list; it only reads and displays the information.
+        This function does not modify the task_store; it only reads and displays the information.
     """
-    if len(tasks_list) == 0:
+    if not task_store:
         print("No tasks yet. Add your tasks")
     else:
-        print(f"Total tasks is in the list are ")
-        for task in tasks_list:
-            print(f"ID: {task['id']}")
-            print(f"Title: {task['task_title']}")
-            print(f"Description: {task['description']}")
-            print(f"Status: {task['task_status']}")
-            print("===========================================")
+        # Only the tasks of the requested page are fetched
+        offset = (max(page, 1) - 1) * limit if limit else 0
+        render_tasks(task_store.all_tasks(limit, offset), header="Total tasks is in the list are ",
+                     page=page, limit=limit, compact=compact, total=len(task_store), paged=True)
 
 def update_task(task_id, title=None, description=None, status=None):
     """
@@ -104,26 +157,18 @@ def update_task(task_id, title=None, description=None, status=None):
         the task was not found. If the task list is empty, a message is printed indicating
         that there are no tasks to update.
     """
-    if len(tasks_list) == 0:
+    if not task_store:
         print("No tasks yet. Add your tasks")
-    else:
-        for task in tasks_list:
-            if task['id'] == task_id:
-                if title:
-                    task['task_title'] = title
-                if description:
-                    task['description'] = description
-                if status:
-                    task['task_status'] = status
-                print(f"Task ID {task_id} updated successfully.")
-                return
+    elif task_store.update(task_id, title, description, status) is None:
         print(f"Task ID {task_id} not found.")
+    else:
+        print(f"Task ID {task_id} updated successfully.")
     
 def delete_task(task_id):
     """
     Delete a task from the task list based on its ID.
 
-    This function removes a task from the tasks_list if a task with the given task_id exists.
+    This function removes a task from the task_store if a task with the given task_id exists.
     If the task list is empty or if no task with the given ID is found, appropriate messages are displayed.
 
     Args:
@@ -133,27 +178,31 @@ def delete_task(task_id):
         None
 
     Note:
-        This function modifies the global tasks_list variable.
+        This function modifies the global task_store.
         After successful deletion, a confirmation message is printed.
         If the task list is empty, a message indicating so is printed instead of attempting deletion.
     """
-    global tasks_list
-    if len(tasks_list) == 0:
+    if not task_store:
         print("No tasks yet. Add your tasks")
+    elif task_store.delete(task_id) is None:
+        print(f"Task ID {task_id} not found.")
     else:
-        tasks_list = [task for task in tasks_list if task['id'] != task_id]
         print(f"Task ID {task_id} deleted successfully.")
          
-def search_tasks(keyword):
+def search_tasks(keyword, page=1, limit=None, compact=False):
     """
     Search for tasks based on a keyword.
 
-    This function searches through all tasks in the tasks_list and returns those
-    that contain the given keyword in either their title or description.
-    The search is case-insensitive.
+    This function looks up the keyword in the search index of the task_store and
+    displays the tasks that contain it in either their title or description.
+    The search is case-insensitive, and the best matches are shown first.
 
     Args:
         keyword (str): The keyword to search for in task titles and descriptions.
+        page (int, optional): The page of results to display. Defaults to 1.
+        limit (int, optional): The number of tasks per page. Defaults to None,
+                               which displays all tasks.
+        compact (bool, optional): Display one line per task. Defaults to False.
 
     Returns:
         None
@@ -163,31 +212,32 @@ def search_tasks(keyword):
         If no tasks match the keyword, a message is printed indicating that no matching tasks were found.
         For each matching task, the function prints its ID, title, description, and status.
     """
-    if len(tasks_list) == 0:
+    if not task_store:
         print("No tasks yet. Add your tasks")
     else:
-        results = [task for task in tasks_list if keyword.lower() in task['task_title'].lower() or keyword.lower() in task['description'].lower()]
+        # Only the best matches of the requested page are fetched
+        offset = (max(page, 1) - 1) * limit if limit else 0
+        results = task_store.search(keyword, limit=limit, offset=offset)
         if not results:
             print("No matching tasks found.")
             return
-        for task in results:
-            print(f"ID: {task['id']}")
-            print(f"Title: {task['task_title']}")
-            print(f"Description: {task['description']}")
-            print(f"Status: {task['task_status']}")
-            print("===========================================")
-
-def view_tasks_status(status_filter=None):
+        render_tasks(results, page=page, limit=limit, compact=compact, paged=True)
+
+def view_tasks_status(status_filter=None, page=1, limit=None, compact=False):
     """
     View tasks filtered by a specific status.
 
-    This function displays tasks from the tasks_list that match the given status filter.
+    This function displays tasks from the task_store that match the given status filter.
     If no status filter is provided, it defaults to None and will prompt the user for input.
 
     Args:
         status_filter (str, optional): The status to filter tasks by. 
                                        Should be one of 'pending', 'done', or 'in progress'.
                                        Defaults to None.
+        page (int, optional): The page of results to display. Defaults to 1.
+        limit (int, optional): The number of tasks per page. Defaults to None,
+                               which displays all tasks.
+        compact (bool, optional): Display one line per task. Defaults to False.
 
     Returns:
         None
@@ -200,24 +250,22 @@ def view_tasks_status(status_filter=None):
     """
     if status_filter is None:
         status_filter = input("Enter status filter (pending/done/in progress): ").lower()
-    if status_filter not in ['pending', 'done', 'in progress']:
+    if status_filter not in VALID_STATUSES:
         print("Invalid status filter. Please use 'pending', 'done', or 'in progress'.")
         return
 
-    filtered_tasks = [task for task in tasks_list if task['task_status'] == status_filter]
-    if not filtered_tasks:
+    total = task_store.count_status(status_filter)
+    if total == 0:
         print(f"No tasks with the status '{status_filter}'.")
     else:
-        print(f"Total tasks with status '{status_filter}': {len(filtered_tasks)}")
-        for task in filtered_tasks:
-            print(f"ID: {task['id']}")
-            print(f"Title: {task['task_title']}")
-            print(f"Description: {task['description']}")
-            print(f"Status: {task['task_status']}")
-            print("===========================================")
-            
-
-def main():
+        # Only the requested page is fetched from the store
+        offset = (max(page, 1) - 1) * limit if limit else 0
+        render_tasks(task_store.by_status(status_filter, limit=limit, offset=offset),
+                     header=f"Total tasks with status '{status_filter}': {total}",
+                     page=page, limit=limit, compact=compact, total=total, paged=True)
+
+
+def main(engine='memory', data_dir=TASK_DATA_DIR, page=1, limit=None, compact=False):
     """
     Main function to run the Task Tracker CLI application.
 
@@ -242,6 +290,41 @@ def main():
     The function handles invalid inputs by displaying an error message and
     continuing the loop.
 
+    Tasks are loaded from data_dir when the application starts and every
+    change is saved there, so they are available again on the next run.
+
+    Args:
+        engine (str, optional): The storage engine, see open_task_store.
+                                Defaults to 'memory'.
+        data_dir (str, optional): Directory holding the task data.
+                                  Defaults to TASK_DATA_DIR.
+        page (int, optional): The page shown by the task listings. Defaults to 1.
+        limit (int, optional): The number of tasks per page in the listings.
+                               Defaults to None, which shows all tasks.
+        compact (bool, optional): Show listings with one line per task.
+                                  Defaults to False.
+
+    Returns:
+        None
+    """
+    print("####################################################################################################")
+    print("#                                            TASK TRACKER IN PYTHON                                #")
+    print("####################################################################################################")
+
+    global task_store
+    task_store = open_task_store(engine, data_dir)
+    try:
+        run_menu(page=page, limit=limit, compact=compact)
+    finally:
+        task_store.close()
+
+def run_menu(**listing):
+    """
+    Run the interactive menu loop until the user chooses to exit.
+
+    Args:
+        **listing: The page, limit and compact options passed to the task listings.
+
     Returns:
         None
     """
@@ -263,7 +346,7 @@ def main():
             description = input("Enter task description: ")
             add_task(title, description)
         elif choice == '2':
-            view_tasks()
+            view_tasks(**listing)
         elif choice == '3':
             task_id = int(input("Enter task ID to update: "))
             title = input("Enter new title (leave blank to keep current): ")
@@ -275,18 +358,278 @@ def main():
             delete_task(task_id)
         elif choice == '5':
             keyword = input("Enter keyword to search: ")
-            search_tasks(keyword)
+            search_tasks(keyword, **listing)
         elif choice == '6':
-            view_tasks_status('pending')
+            view_tasks_status('pending', **listing)
         elif choice == '7':
-            view_tasks_status('done')
+            view_tasks_status('done', **listing)
         elif choice == '8':
-            view_tasks_status('in progress')
+            view_tasks_status('in progress', **listing)
         elif choice == '9':
                 print("Exiting Task Tracker. Goodbye!")
                 break
         else:
             print("Invalid choice. Please try again.")
 
+def add_listing_options(parser, defaults=True):
+    """
+    Add the --page, --limit and --compact options to an argument parser.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to extend.
+        defaults (bool, optional): Whether the options get default values. The
+                                   subcommand parsers leave them unset, so the
+                                   same options given before the subcommand are
+                                   not overwritten. Defaults to True.
+
+    Returns:
+        None
+    """
+    parser.add_argument('--page', type=int, default=1 if defaults else argparse.SUPPRESS,
+                        help="page of the task listings to show (default: 1)")
+    parser.add_argument('--limit', type=int, default=None if defaults else argparse.SUPPRESS,
+                        help="number of tasks per page in the task listings (default: all)")
+    parser.add_argument('--compact', action='store_true', default=False if defaults else argparse.SUPPRESS,
+                        help="show task listings with one line per task")
+
+def build_parser():
+    """
+    Build the command-line parser of the Task Tracker.
+
+    Without a subcommand the interactive menu is started. The subcommands run a
+    single operation on the persisted tasks and exit.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(description="Task Tracker CLI")
+    parser.add_argument('--engine', choices=ENGINES, default='memory',
+                        help="storage engine for the tasks (default: memory)")
+    parser.add_argument('--data-dir', default=TASK_DATA_DIR,
+                        help=f"directory holding the task data (default: {TASK_DATA_DIR})")
+    add_listing_options(parser)
+    commands = parser.add_subparsers(dest='command', metavar='command')
+
+    add_parser = commands.add_parser('add', help="add a task")
+    add_parser.add_argument('title')
+    add_parser.add_argument('description', nargs='?', default='')
+    add_parser.add_argument('--status', choices=VALID_STATUSES, default='pending')
+
+    update_parser = commands.add_parser('update', help="update a task")
+    update_parser.add_argument('id', type=int)
+    update_parser.add_argument('--title')
+    update_parser.add_argument('--description')
+    update_parser.add_argument('--status', choices=VALID_STATUSES)
+
+    delete_parser = commands.add_parser('delete', help="delete a task")
+    delete_parser.add_argument('id', type=int)
+
+    search_parser = commands.add_parser('search', help="search tasks by keyword")
+    search_parser.add_argument('keyword')
+    add_listing_options(search_parser, defaults=False)
+
+    list_parser = commands.add_parser('list', help="list all tasks or the tasks with a status")
+    list_parser.add_argument('--status', choices=VALID_STATUSES)
+    add_listing_options(list_parser, defaults=False)
+
+    batch_parser = commands.add_parser(
+        'batch', help="apply many operations read from a file or stdin, one per line")
+    batch_parser.add_argument('file', nargs='?', type=argparse.FileType('r'), default=sys.stdin)
+
+    import_parser = commands.add_parser('import', help="import tasks from a .jsonl or .csv file")
+    import_parser.add_argument('file')
+
+    export_parser = commands.add_parser('export', help="export all tasks to a .jsonl or .csv file")
+    export_parser.add_argument('file')
+    return parser
+
+def run_command(args):
+    """
+    Run a single subcommand against the global task_store.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+
+    Returns:
+        None
+    """
+    listing = {'page': args.page, 'limit': args.limit, 'compact': args.compact}
+    if args.command == 'add':
+        task = task_store.add(args.title, args.description, args.status)
+        print(f"Task ID {task['id']} added successfully.")
+    elif args.command == 'update':
+        update_task(args.id, args.title, args.description, args.status)
+    elif args.command == 'delete':
+        delete_task(args.id)
+    elif args.command == 'search':
+        search_tasks(args.keyword, **listing)
+    elif args.command == 'list':
+        if args.status:
+            view_tasks_status(args.status, **listing)
+        else:
+            view_tasks(**listing)
+    elif args.command in ('import', 'export'):
+        try:
+            if args.command == 'import':
+                import_tasks(task_store, args.file)
+            else:
+                export_tasks(task_store, args.file)
+        except OSError as error:
+            print(f"Could not {args.command} '{args.file}': {error.strerror or error}")
+        except ValueError as error:
+            print(f"Could not {args.command} '{args.file}': {error}")
+
+def parse_batch_line(parser, line, defaults):
+    """
+    Parse one line of batch input into an operation.
+
+    A line is either a JSON object such as {"op": "add", "title": "Buy milk"},
+    or a command written like on the command line, e.g. add "Buy milk" --status done.
+    The fields of a JSON operation are the same as the options of the subcommand,
+    with "id" for the task ID and "keyword" for a search. Only the fields listed
+    in BATCH_FIELDS for the operation are accepted, with the listed types.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser built by build_parser.
+        line (str): The line to parse.
+        defaults (argparse.Namespace): The parsed batch command line. Options
+                                       given before the batch subcommand, such
+                                       as --limit, apply to every operation.
+
+    Returns:
+        argparse.Namespace: The operation, with the same fields as a parsed command line.
+
+    Raises:
+        ValueError: If the line is not a valid operation.
+    """
+    if line.startswith('{'):
+        fields = json.loads(line)
+        if not isinstance(fields, dict):
+            raise ValueError("an operation must be a JSON object")
+        command = fields.pop('op', None)
+        if command not in BATCH_FIELDS:
+            raise ValueError(f"unknown operation '{command}'")
+        operation = argparse.Namespace(**vars(defaults))
+        operation.command = command
+        operation.title = operation.description = operation.status = None
+        for name, value in fields.items():
+            expected = BATCH_FIELDS[command].get(name)
+            if expected is None:
+                raise ValueError(f"unknown field '{name}' for '{command}'")
+            if value is None:
+                continue
+            # JSON true and false are ints to Python, but not valid IDs or page sizes
+            if not isinstance(value, expected) or isinstance(value, bool) and expected is not bool:
+                raise ValueError(f"field '{name}' must be {FIELD_TYPE_NAMES[expected]}")
+            setattr(operation, name, value)
+    else:
+        try:
+            operation = parser.parse_args(shlex.split(line), argparse.Namespace(**vars(defaults)))
+        except SystemExit:
+            raise ValueError("invalid command")
+        if operation.command not in BATCH_FIELDS:
+            raise ValueError(f"'{operation.command}' is not allowed in a batch")
+    if operation.command == 'add' and not operation.title:
+        raise ValueError("missing title")
+    if operation.command == 'search' and not isinstance(getattr(operation, 'keyword', None), str):
+        raise ValueError("missing keyword")
+    if operation.command in ('update', 'delete') and not isinstance(getattr(operation, 'id', None), int):
+        raise ValueError("missing task id")
+    status = getattr(operation, 'status', None)
+    if status and status not in VALID_STATUSES:
+        raise ValueError(f"invalid status '{status}'")
+    for name in ('page', 'limit'):
+        value = getattr(operation, name, None)
+        if value is not None and value < 1:
+            raise ValueError(f"{name} must be at least 1")
+    return operation
+
+def run_batch(parser, lines, defaults):
+    """
+    Apply many operations to the global task_store in one process.
+
+    Adds, updates and deletes are applied quietly, searches and listings print
+    their results. Invalid lines and updates or deletes of unknown tasks are
+    reported with their line number, and a summary with the throughput is
+    printed at the end.
+
+    All operations run inside one store transaction, so the SQLite engine
+    commits the whole batch at once instead of once per operation.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser built by build_parser.
+        lines (iterable): The operations, one per line. Empty lines and lines
+                          starting with # are ignored.
+        defaults (argparse.Namespace): The parsed batch command line.
+
+    Returns:
+        int: The number of failed operations.
+    """
+    start = time.perf_counter()
+    with task_store.transaction():
+        failed, applied = _apply_batch(parser, lines, defaults)
+    elapsed = time.perf_counter() - start
+    print(f"Applied {applied} operations in {elapsed:.2f}s "
+          f"({applied / elapsed if elapsed else 0:.0f} ops/sec), {failed} failed.")
+    return failed
+
+def _apply_batch(parser, lines, defaults):
+    applied = failed = 0
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            operation = parse_batch_line(parser, line, defaults)
+        except ValueError as error:
+            print(f"Line {line_number}: {error}", file=sys.stderr)
+            failed += 1
+            continue
+        command = operation.command
+        if command == 'add':
+            task_store.add(operation.title, operation.description or '', operation.status or 'pending')
+        elif command == 'update':
+            if task_store.update(operation.id, operation.title, operation.description, operation.status) is None:
+                print(f"Line {line_number}: Task ID {operation.id} not found.", file=sys.stderr)
+                failed += 1
+                continue
+        elif command == 'delete':
+            if task_store.delete(operation.id) is None:
+                print(f"Line {line_number}: Task ID {operation.id} not found.", file=sys.stderr)
+                failed += 1
+                continue
+        else:
+            run_command(operation)
+        applied += 1
+    return failed, applied
+
+def run_cli(argv=None):
+    """
+    Entry point of the command line: run a subcommand or the interactive menu.
+
+    The task store is opened once and closed when the command is done.
+
+    Args:
+        argv (list, optional): The command-line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit status, 1 if any batch operation failed and 0 otherwise.
+    """
+    global task_store
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        main(args.engine, args.data_dir, args.page, args.limit, args.compact)
+        return 0
+
+    task_store = open_task_store(args.engine, args.data_dir)
+    try:
+        if args.command == 'batch':
+            return 1 if run_batch(parser, args.file, args) else 0
+        run_command(args)
+        return 0
+    finally:
+        task_store.close()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(run_cli())
@@ -0,0 +1,100 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from expense_aggregates import ExpenseAggregates, check_consistency, month_deltas
+from expense_reports import total, totals_by_category, totals_by_period
+from expense_store import ExpenseStore
+
+DESCRIPTIONS = ["Lunch", "Rent", "Bus", "Groceries"]
+
+
+def random_expense(rng):
+    return (rng.choice(DESCRIPTIONS), rng.randint(1, 99999) / 100,
+            f"2024-{rng.randint(1, 6):02d}-{rng.randint(1, 28):02d}")
+
+
+def apply_random_changes(rng, store, ids, changes):
+    for _ in range(changes):
+        live = store.to_frame()['ID'].tolist()
+        kind = rng.random()
+        if kind < 0.3 or not live:
+            store.add(next(ids), *random_expense(rng))
+        elif kind < 0.4:
+            rows = [random_expense(rng) for _ in range(rng.randint(0, 20))]
+            store.add_many((next(ids), *row) for row in rows)
+        elif kind < 0.7:
+            description, amount, date_spent = random_expense(rng)
+            store.update(rng.choice(live), description=description if rng.random() < 0.5 else None,
+                         amount=amount if rng.random() < 0.5 else None,
+                         date_spent=date_spent if rng.random() < 0.5 else None)
+        elif kind < 0.95:
+            store.delete(rng.choice(live))
+        else:
+            store.compact()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_aggregates_match_a_full_recompute_after_every_change(seed):
+    rng = random.Random(seed)
+    store = ExpenseStore()
+    store.add_many((expense_id, *random_expense(rng)) for expense_id in range(1, 51))
+    aggregates = ExpenseAggregates(store)
+    ids = itertools.count(51)
+    for _ in range(20):
+        apply_random_changes(rng, store, ids, 10)
+        assert check_consistency(aggregates, store) == []
+
+    assert aggregates.total == pytest.approx(total(store))
+    assert aggregates.count == len(store)
+    months = totals_by_period(store, 'month')
+    for month, month_total, count in zip(months.index, months['Total'], months['Count']):
+        assert aggregates.month_total(str(np.datetime64(month, 'M'))) == (pytest.approx(month_total), count)
+    categories = totals_by_category(store)
+    assert aggregates.by_category()['Total'].tolist() == pytest.approx(categories['Total'].tolist())
+    for description, category_total, count in zip(categories.index, categories['Total'], categories['Count']):
+        assert aggregates.category_total(description) == (pytest.approx(category_total), count)
+
+
+def test_buckets_of_deleted_expenses_go_away():
+    store = ExpenseStore()
+    aggregates = ExpenseAggregates(store)
+    store.add(1, "Rent", 500, '2024-01-05')
+    store.add(2, "Lunch", 12.5, '2024-02-05')
+    store.update(1, description="Lunch", date_spent='2024-02-01')
+    assert list(aggregates.by_month().index) == ['2024-02']
+    assert list(aggregates.by_category().index) == ["Lunch"]
+    store.delete(1)
+    store.delete(2)
+    assert (aggregates.total_cents, aggregates.count) == (0, 0)
+    assert aggregates.by_month().empty and aggregates.by_category().empty
+
+
+def test_cents_never_drift():
+    store = ExpenseStore()
+    aggregates = ExpenseAggregates(store)
+    store.add_many((expense_id, "Coffee", 0.1, '2024-01-01') for expense_id in range(1, 1001))
+    for expense_id in range(1, 1001, 2):
+        store.update(expense_id, amount=0.2)
+    assert aggregates.total_cents == 15000
+    assert aggregates.month_total('2024-01') == (150.0, 1000)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_month_deltas_of_one_expense_match_the_array_path(seed):
+    rng = random.Random(seed)
+    expenses = [random_expense(rng) for _ in range(200)]
+    columns = {'Description': np.array([e[0] for e in expenses], dtype=object),
+               'Amount': np.array([e[1] for e in expenses]),
+               'Date Spent': np.array([e[2] for e in expenses], dtype='datetime64[D]')}
+    one_by_one = {}
+    for description, amount, date_spent in expenses:
+        expense = {'Description': description, 'Amount': amount, 'Date Spent': np.datetime64(date_spent)}
+        month_deltas(expense, 1, one_by_one)
+    assert month_deltas(columns) == one_by_one
+    # Removing them again nets every pair out
+    netted = month_deltas(columns, -1, month_deltas(columns))
+    assert all(delta == [0, 0] for delta in netted.values())
+    assert month_deltas({name: values[:0] for name, values in columns.items()}) == {}
@@ -0,0 +1,128 @@
+import itertools
+import random
+
+import pytest
+
+from expense_budgets import ExpenseBudgets, format_alert
+from expense_store import ExpenseStore
+from test_expense_aggregates import DESCRIPTIONS, apply_random_changes, random_expense
+
+
+def fired(budgets):
+    return [(alert['category'], alert['month'], alert['threshold']) for alert in budgets.pop_alerts()]
+
+
+def spending(store):
+    # The spending in cents of every (category, month) and (None, month) bucket, recomputed
+    frame = store.to_frame()
+    months = frame['Date Spent'].astype('datetime64[s]').dt.strftime('%Y-%m')
+    cents = (frame['Amount'] * 100).round().astype(int)
+    spent = {}
+    for category, month, amount in zip(frame['Description'], months, cents):
+        for bucket in ((category, month), (None, month)):
+            spent[bucket] = spent.get(bucket, 0) + amount
+    return spent
+
+
+def test_each_threshold_fires_once():
+    store = ExpenseStore()
+    budgets = ExpenseBudgets(store)
+    budgets.set_budget(100, "Rent")
+    store.add(1, "Rent", 50, '2024-01-02')
+    store.add(2, "Rent", 35, '2024-01-03')
+    assert fired(budgets) == [("Rent", '2024-01', 0.8)]
+    store.add(3, "Rent", 5, '2024-01-04')
+    assert fired(budgets) == []
+    store.add(4, "Rent", 20, '2024-01-05')
+    assert fired(budgets) == [("Rent", '2024-01', 1.0)]
+    store.add(5, "Rent", 5, '2024-01-06')
+    assert fired(budgets) == []
+    # Another month has its own spending
+    store.add(6, "Rent", 10, '2024-02-06')
+    assert fired(budgets) == []
+
+
+def test_dropping_below_a_threshold_arms_it_again():
+    store = ExpenseStore()
+    budgets = ExpenseBudgets(store)
+    budgets.set_budget(100, "Rent")
+    store.add(1, "Rent", 90, '2024-01-02')
+    store.add(2, "Rent", 20, '2024-01-03')
+    assert fired(budgets) == [("Rent", '2024-01', 0.8), ("Rent", '2024-01', 1.0)]
+    store.delete(2)
+    assert fired(budgets) == []
+    store.update(1, amount=100.01)
+    assert fired(budgets) == [("Rent", '2024-01', 1.0)]
+    store.update(1, amount=10)
+    store.update(1, amount=200)
+    # Only the highest threshold passed by one change is reported
+    assert fired(budgets) == [("Rent", '2024-01', 1.0)]
+
+
+def test_updates_within_a_bucket_raise_nothing():
+    store = ExpenseStore()
+    budgets = ExpenseBudgets(store)
+    budgets.set_budget(100)
+    store.add(1, "Rent", 95, '2024-01-02')
+    assert fired(budgets) == [(None, '2024-01', 0.8)]
+    store.update(1, date_spent='2024-01-28')
+    store.update(1, description="Lunch")
+    assert fired(budgets) == []
+    assert budgets.status('2024-01') == (95, 100)
+    # Moving it to another month moves the spending with it
+    store.update(1, date_spent='2024-02-01')
+    assert fired(budgets) == [(None, '2024-02', 0.8)]
+    assert budgets.status('2024-01') == (0, 100)
+
+
+def test_budget_of_the_month_replaces_the_recurring_one(tmp_path):
+    path = str(tmp_path / 'budgets.json')
+    store = ExpenseStore()
+    budgets = ExpenseBudgets(store, path)
+    budgets.set_budget(100, "Rent")
+    budgets.set_budget(1000, "Rent", '2024-01')
+    store.add(1, "Rent", 500, '2024-01-02')
+    store.add(2, "Rent", 500, '2024-02-02')
+    assert fired(budgets) == [("Rent", '2024-02', 1.0)]
+    assert budgets.status('2024-01', "Rent") == (500, 1000)
+    assert "over the budget of 100.00" in format_alert({'category': "Rent", 'month': '2024-02', 'limit': 100,
+                                                        'spent': 500, 'threshold': 1.0})
+
+    # The budgets are saved, the spending is counted again from the store
+    reopened = ExpenseBudgets(store, path)
+    assert len(reopened) == 2
+    assert reopened.status('2024-02', "Rent") == (500, 100)
+    assert budgets.remove_budget("Rent", '2024-01') and not budgets.remove_budget("Rent", '2024-01')
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_spending_and_alerts_match_a_recompute(seed):
+    rng = random.Random(seed)
+    store = ExpenseStore()
+    store.add_many((expense_id, *random_expense(rng)) for expense_id in range(1, 31))
+    budgets = ExpenseBudgets(store)
+    limits = {}
+    for category in DESCRIPTIONS + [None]:
+        limits[(category, None)] = rng.randint(500, 3000) * 100
+        budgets.set_budget(limits[(category, None)] / 100, category)
+    for month in ('2024-01', '2024-03'):
+        limits[("Rent", month)] = rng.randint(500, 3000) * 100
+        budgets.set_budget(limits[("Rent", month)] / 100, "Rent", month)
+
+    ids = itertools.count(31)
+    before = spending(store)
+    for _ in range(200):
+        apply_random_changes(rng, store, ids, 1)
+        after = spending(store)
+        expected = []
+        for bucket in sorted(set(before) | set(after), key=str):
+            category, month = bucket
+            limit = limits.get(bucket, limits.get((category, None)))
+            passed = [threshold for threshold in budgets.thresholds
+                      if before.get(bucket, 0) <= limit * threshold < after.get(bucket, 0)]
+            if passed:
+                expected.append((category, month, passed[-1]))
+        assert sorted(fired(budgets), key=str) == expected
+        for category, month in after:
+            assert budgets.status(month, category)[0] == pytest.approx(after[(category, month)] / 100)
+        before = after
@@ -0,0 +1,112 @@
+import random
+
+import numpy as np
+import pytest
+
+import expense_tracker
+from expense_ids import ExpenseIdSequence, format_id, format_ids, max_sequence_number, parse_id
+
+# Past the 10M the tracker's old fixed-width IDs ran out at
+LARGE = 10_000_000
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_ids_past_10m_are_unique_and_increasing(tmp_path, seed):
+    rng = random.Random(seed)
+    path = str(tmp_path / 'expense_ids.json')
+    sequence = ExpenseIdSequence(path, block_size=rng.randint(1, 50))
+    sequence.observe(LARGE - rng.randint(0, 100))
+    handed_out = []
+    for _ in range(200):
+        if rng.random() < 0.3:
+            handed_out.extend(sequence.reserve(rng.randint(0, 20)))
+        else:
+            handed_out.append(sequence.next_id())
+        if rng.random() < 0.05:
+            # A restart never hands out an ID again
+            sequence = ExpenseIdSequence(path, block_size=sequence.block_size)
+    assert handed_out == sorted(set(handed_out))
+    assert handed_out[-1] > LARGE
+
+
+def test_sequence_continues_after_restart_past_10m(tmp_path):
+    path = str(tmp_path / 'expense_ids.json')
+    sequence = ExpenseIdSequence(path)
+    block = sequence.reserve(LARGE + 5)
+    assert block.stop - 1 == LARGE + 5
+    assert ExpenseIdSequence(path).next_id() > LARGE + 5
+
+
+def test_formats_past_10m():
+    numbers = range(LARGE - 1, LARGE + 2)
+    assert format_ids(numbers, 'integer').tolist() == list(numbers)
+    assert format_ids(numbers, 'integer').dtype == np.int64
+    assert format_ids(numbers, 'date', '2024-05-01').tolist() == [format_id(n, 'date', '2024-05-01') for n in numbers]
+    assert format_id(LARGE + 1, 'date', '2024-05-01') == f"2024-05-01_{LARGE + 1}"
+
+
+def test_max_sequence_number_compares_numbers_not_text():
+    # '9999999' sorts after '10000001' as text
+    ids = ["2024-05-01_9999999", f"2024-04-01_{LARGE + 1}", "2024-06-01_12"]
+    assert max_sequence_number(np.array(ids, dtype=object)) == LARGE + 1
+    assert max_sequence_number(np.array([9_999_999, LARGE + 1, 12], dtype=np.int64)) == LARGE + 1
+    assert max_sequence_number(np.array([], dtype=object)) == 0
+
+
+def test_parse_id_per_format():
+    assert parse_id(f" {LARGE + 1} ", 'integer') == LARGE + 1
+    assert parse_id("2024-05-01_3", 'integer') is None
+    assert parse_id(" 2024-05-01_3 ", 'date') == "2024-05-01_3"
+
+
+@pytest.fixture
+def tracker_dir(tmp_path, monkeypatch):
+    pytest.importorskip('pyarrow')
+    from expense_storage import PartitionedExpenseStorage
+    monkeypatch.setattr(expense_tracker, 'EXPENSE_DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(expense_tracker, 'openStorage', lambda: PartitionedExpenseStorage(str(tmp_path)))
+    open_sequence = expense_tracker.openSequence
+    monkeypatch.setattr(expense_tracker, 'openSequence',
+                        lambda store, storage=None: open_sequence(store, str(tmp_path), storage))
+    return tmp_path
+
+
+def add_expenses(tracker, count):
+    store, storage, _, _, sequence, id_format = tracker
+    for number in sequence.reserve(count):
+        store.add(format_id(number, id_format, '2024-05-01'), "Lunch", 5, "2024-05-01")
+    storage.flush()
+
+
+@pytest.mark.parametrize('saved, asked', [('date', 'integer'), ('integer', 'date')])
+def test_saved_id_format_wins_over_the_asked_one(tracker_dir, saved, asked):
+    tracker = expense_tracker.openTracker(saved)
+    tracker[4].observe(LARGE)
+    add_expenses(tracker, 3)
+
+    store, storage, _, budgets, sequence, id_format = expense_tracker.openTracker(asked)
+    assert id_format == saved
+    assert store.id_format == saved
+    assert expense_tracker.loadHistory(store, storage, budgets) == 3
+    assert sequence.next_id() > LARGE + 3
+    ids = store.column('ID')
+    assert (ids.dtype == np.int64) == (saved == 'integer')
+
+
+def test_new_ids_continue_after_the_loaded_ones_without_the_sequence_file(tracker_dir):
+    tracker = expense_tracker.openTracker('date')
+    tracker[4].observe(LARGE)
+    add_expenses(tracker, 2)
+    (tracker_dir / 'expense_ids.json').unlink()
+
+    store, storage, _, _, sequence, _ = expense_tracker.openTracker('integer')
+    # Nothing is loaded at startup, so the IDs are read from the storage
+    assert len(store) == 0
+    assert sequence.next_id() == max_sequence_number(storage.load(columns=['ID'])['ID'].to_numpy()) + 1 == LARGE + 3
+
+
+def test_in_memory_sequence():
+    sequence = ExpenseIdSequence()
+    sequence.observe(LARGE)
+    assert sequence.next_id() == LARGE + 1
+    assert list(sequence.reserve(2)) == [LARGE + 2, LARGE + 3]
@@ -0,0 +1,164 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import expense_ingest
+from expense_ids import ExpenseIdSequence
+from expense_ingest import ingest_statement, normalize_amounts
+from expense_store import ExpenseStore
+
+DESCRIPTIONS = ["Coffee", "Rent", "Bus pass", "Groceries"]
+
+
+def expenses_of(store):
+    frame = store.to_frame()
+    return list(zip(frame['Description'].astype(str), frame['Amount'].round(2), frame['Date Spent'].astype(str)))
+
+
+def ingest(path, store=None, **options):
+    store = store if store is not None else ExpenseStore()
+    sequence = ExpenseIdSequence()
+    if len(store):
+        sequence.observe(int(store.column('ID').max()))
+    counts = ingest_statement(store, str(path), sequence, **options)
+    return store, counts
+
+
+def skipped_lines(output):
+    return [int(line.split()[2].rstrip(':')) for line in output.splitlines() if line.startswith("Skipped line")]
+
+
+@pytest.mark.parametrize('text, spending, expected', [
+    ('$1,234.50', 'any', 1234.5), ('  12 ', 'any', 12), ('-12.00', 'any', 12), ('(3.10)', 'any', 3.1),
+    ('€ 7,5', 'any', 75), ('USD -0.005', 'any', np.nan), ('0', 'any', np.nan), ('abc', 'any', np.nan),
+    ('-12.00', 'negative', 12), ('(3.10)', 'negative', 3.1), ('$(1,000.00)', 'negative', 1000),
+    ('12.00', 'negative', np.nan), ('12.00', 'positive', 12), ('-12.00', 'positive', np.nan),
+    ('(3.10)', 'positive', np.nan), ('+4.255', 'positive', 4.26),
+])
+def test_normalize_amounts(text, spending, expected):
+    result = normalize_amounts(pd.Series([text]), spending)[0]
+    assert result == pytest.approx(expected, nan_ok=True)
+
+
+def test_csv_amounts_and_spending_sign(tmp_path, capsys):
+    path = tmp_path / 'statement.csv'
+    path.write_text('Date,Payee,Amount\n'
+                    '2024-05-01,Coffee,"-$4.50"\n'
+                    '2024-05-02,Salary,"$2,000.00"\n'
+                    '2024-05-03,Rent,"(1,200.00)"\n'
+                    '2024-05-04,Refund,0.00\n', encoding='utf-8')
+    store, counts = ingest(path, spending='negative')
+    assert expenses_of(store) == [("Coffee", 4.5, '2024-05-01'), ("Rent", 1200.0, '2024-05-03')]
+    assert counts == (2, 2, 0)
+    assert skipped_lines(capsys.readouterr().out) == [3, 5]
+
+    store, counts = ingest(path, spending='positive')
+    assert expenses_of(store) == [("Salary", 2000.0, '2024-05-02')]
+    store, counts = ingest(path)
+    assert [amount for _, amount, _ in expenses_of(store)] == [4.5, 2000.0, 1200.0]
+
+
+def test_error_lines_point_at_the_bad_rows(tmp_path, capsys):
+    path = tmp_path / 'statement.csv'
+    path.write_text('date,description,amount\n'
+                    '2024-05-01,Coffee,4.50\n'
+                    '2024-13-01,Bad month,4.50\n'
+                    '2024-05-03,"Multi, quoted",nope\n'
+                    '2024-05-04,   ,3\n'
+                    '05/05/2024,Wrong format,3\n'
+                    '2024-05-06,Tea,2\n', encoding='utf-8')
+    store, counts = ingest(path, chunk_size=2)
+    assert counts == (2, 4, 0)
+    output = capsys.readouterr().out
+    assert skipped_lines(output) == [3, 4, 5, 6]
+    assert "Skipped line 3: invalid date" in output
+    assert "Skipped line 4: invalid amount" in output
+    assert "Skipped line 5: missing description" in output
+
+
+def test_duplicates_within_a_file_and_against_the_store(tmp_path):
+    store = ExpenseStore()
+    store.add(1, "Coffee  shop", 4.5, '2024-05-01')
+    path = tmp_path / 'statement.csv'
+    path.write_text('date,description,amount\n'
+                    # Same as the stored expense once whitespace and case are normalized
+                    '2024-05-01, coffee SHOP ,4.50\n'
+                    '2024-05-02,Tea,2\n'
+                    '2024-05-02,Tea,2.00\n'
+                    '2024-05-02,Tea,2.01\n'
+                    '2024-05-03,Tea,2\n', encoding='utf-8')
+    store, counts = ingest(path, store, chunk_size=1)
+    assert counts == (3, 0, 2)
+    assert expenses_of(store)[1:] == [("Tea", 2.0, '2024-05-02'), ("Tea", 2.01, '2024-05-02'),
+                                      ("Tea", 2.0, '2024-05-03')]
+    # Importing the same statement again adds nothing
+    assert ingest(path, store)[1] == (0, 0, 5)
+
+
+def random_statement(rng, rows):
+    return [(f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+             rng.choice(DESCRIPTIONS), f"{rng.choice(['-', ''])}{rng.randint(0, 30)}.{rng.randint(0, 99):02d}")
+            for _ in range(rows)]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_chunk_size_does_not_change_the_import(tmp_path, capsys, seed):
+    rng = random.Random(seed)
+    # Bad dates, descriptions and amounts mixed, more than are reported
+    rows = [(rng.choice([date, date, '2024-02-30']), rng.choice([name, name, ' ']), amount)
+            for date, name, amount in random_statement(rng, 300)]
+    path = tmp_path / 'statement.csv'
+    path.write_text('date,description,amount\n' + ''.join(f"{date},{name},{amount}\n" for date, name, amount in rows),
+                    encoding='utf-8')
+    results = []
+    for chunk_size in (1, 7, 64, 299, 300, 1000):
+        store, counts = ingest(path, chunk_size=chunk_size, spending='negative')
+        results.append((expenses_of(store), counts, skipped_lines(capsys.readouterr().out)))
+    assert all(result == results[0] for result in results)
+    imported, invalid, _ = results[0][1]
+    assert imported > 0 and invalid > expense_ingest.MAX_REPORTED_ERRORS
+    # The first invalid rows are the ones reported
+    assert results[0][2] == [line for line, (date, name, amount) in enumerate(rows, start=2)
+                             if date.endswith('30') or name == ' ' or not amount.startswith('-')
+                             or float(amount) == 0][:expense_ingest.MAX_REPORTED_ERRORS]
+
+
+def ofx_statement(rows):
+    transactions = ''.join(
+        f"<STMTTRN>\n<TRNTYPE>DEBIT\n<DTPOSTED>{date.replace('-', '')}120000\n<TRNAMT>{amount}\n"
+        f"<NAME>{name}\n</STMTTRN>\n" for date, name, amount in rows)
+    return f"OFXHEADER:100\n<OFX>\n<BANKTRANLIST>\n{transactions}</BANKTRANLIST>\n</OFX>\n"
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_ofx_transactions_split_across_reads(tmp_path, monkeypatch, capsys, seed):
+    rng = random.Random(seed)
+    rows = random_statement(rng, 100)
+    # Every tenth transaction has a bad date
+    rows = [('2024-02-31', name, amount) if number % 10 == 3 else (date, name, amount)
+            for number, (date, name, amount) in enumerate(rows)]
+    path = tmp_path / 'statement.ofx'
+    path.write_text(ofx_statement(rows), encoding='utf-8')
+
+    store, counts = ingest(path)
+    expected = (expenses_of(store), counts, skipped_lines(capsys.readouterr().out))
+    # Each transaction starts on line 4 + 6 * its number
+    assert expected[2] == [4 + 6 * number for number in range(3, 100, 10)]
+    for read_size in (1, 5, 9, 10, 64, 1000):
+        monkeypatch.setattr(expense_ingest, 'OFX_READ_SIZE', read_size)
+        store, counts = ingest(path, chunk_size=rng.randint(1, 30))
+        assert (expenses_of(store), counts, skipped_lines(capsys.readouterr().out)) == expected
+
+
+def test_csv_columns_are_found_or_named(tmp_path):
+    path = tmp_path / 'statement.csv'
+    path.write_text('\ufeffPosting Date,Memo,Withdrawal,Balance\n2024-05-01,Coffee,4.50,100\n', encoding='utf-8')
+    assert expenses_of(ingest(path)[0]) == [("Coffee", 4.5, '2024-05-01')]
+    assert expenses_of(ingest(path, amount_column='balance')[0]) == [("Coffee", 100.0, '2024-05-01')]
+    with pytest.raises(ValueError):
+        ingest(path, amount_column='missing')
+    path.write_text('when,what,how much\n2024-05-01,Coffee,4.50\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        ingest(path)
@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from expense_query import SORT_KEYS, query_expenses
+from expense_store import ExpenseStore
+
+
+def filled_store(seed, id_format, size=300):
+    rng = random.Random(seed)
+    store = ExpenseStore(id_format=id_format)
+    # Few distinct amounts and descriptions, so most sort keys tie
+    store.add_many((number if id_format == 'integer' else f"2024-01-01_{number}",
+                    rng.choice(["Lunch", "Rent", "Bus"]), rng.choice([5, 12.5, 40]),
+                    f"2024-{rng.randint(1, 3):02d}-{rng.randint(1, 28):02d}")
+                   for number in range(1, size + 1))
+    return store
+
+
+def expected(store, sort, descending):
+    # A stable sort of the date ordered expenses keeps ties in date order
+    frame = query_expenses(store)
+    frame = frame.sort_values(SORT_KEYS[sort], ascending=not descending, kind='stable',
+                              key=lambda column: column.astype(str) if sort == 'description' else column)
+    return frame['ID'].tolist()
+
+
+@pytest.mark.parametrize('id_format', ['integer', 'date'])
+@pytest.mark.parametrize('sort', ['amount', 'description', 'id'])
+@pytest.mark.parametrize('descending', [False, True])
+@pytest.mark.parametrize('seed', range(3))
+def test_limited_queries_keep_date_order_on_ties(id_format, sort, descending, seed):
+    store = filled_store(seed, id_format)
+    full = query_expenses(store, sort=sort, descending=descending)['ID'].tolist()
+    assert full == expected(store, sort, descending)
+    for limit in (0, 1, 7, 50, 299, 300, 500):
+        assert query_expenses(store, sort=sort, descending=descending, limit=limit)['ID'].tolist() == full[:limit]
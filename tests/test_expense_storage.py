@@ -0,0 +1,152 @@
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pyarrow')
+
+import expense_storage
+from expense_storage import PartitionedExpenseStorage
+from expense_store import ExpenseStore
+
+
+def expenses_of(store):
+    frame = store.to_frame()
+    return sorted(zip(frame['ID'].tolist(), frame['Description'].tolist(), frame['Amount'].round(2).tolist(),
+                      frame['Date Spent'].astype(str).tolist()))
+
+
+def reload(directory, id_format):
+    store = ExpenseStore(id_format=id_format)
+    PartitionedExpenseStorage(str(directory)).load_into(store)
+    return store
+
+
+def ids(id_format, count):
+    return list(range(1, count + 1)) if id_format == 'integer' else [f"2024{i:04d}_1" for i in range(count)]
+
+
+@pytest.mark.parametrize('id_format', ['integer', 'date'])
+@pytest.mark.parametrize('seed', range(5))
+def test_changes_survive_reload(tmp_path, id_format, seed):
+    rng = random.Random(seed)
+    store = ExpenseStore(id_format=id_format)
+    storage = PartitionedExpenseStorage(str(tmp_path))
+    store.add_listener(storage)
+    new_ids = iter(ids(id_format, 400))
+    for _ in range(300):
+        kind = rng.random()
+        live = store.to_frame()['ID'].tolist()
+        date = f"2024-{rng.randint(1, 4):02d}-{rng.randint(1, 28):02d}"
+        if kind < 0.5 or not live:
+            store.add(next(new_ids), rng.choice(["Lunch", "Rent", "Bus"]), rng.randint(1, 9999) / 100, date)
+        elif kind < 0.8:
+            store.update(rng.choice(live), amount=rng.randint(1, 9999) / 100,
+                         date_spent=date if rng.random() < 0.5 else None)
+        else:
+            store.delete(rng.choice(live))
+        if rng.random() < 0.05:
+            storage.flush()
+    storage.flush()
+
+    assert expenses_of(reload(tmp_path, id_format)) == expenses_of(store)
+    count, total = PartitionedExpenseStorage(str(tmp_path)).summary()
+    assert count == len(store)
+    assert total == pytest.approx(store.to_frame()['Amount'].sum())
+
+
+def test_adds_are_written_together(tmp_path):
+    store = ExpenseStore()
+    storage = PartitionedExpenseStorage(str(tmp_path))
+    store.add_listener(storage)
+    for expense_id in range(1, 51):
+        store.add(expense_id, "Lunch", 10, "2024-05-01")
+    assert storage.parts('2024-05') == []
+    storage.flush()
+    assert len(storage.parts('2024-05')) == 1
+    assert storage.summary() == (50, 500.0)
+
+
+def test_pending_changes_are_flushed_at_the_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(expense_storage, 'MAX_PENDING_CHANGES', 10)
+    store = ExpenseStore()
+    storage = PartitionedExpenseStorage(str(tmp_path))
+    store.add_listener(storage)
+    for expense_id in range(1, 26):
+        store.add(expense_id, "Lunch", 1, "2024-05-01")
+    assert [part['rows'] for part in storage.parts('2024-05')] == [10, 10]
+
+
+def test_delete_and_update_do_not_rewrite_the_month(tmp_path):
+    store = ExpenseStore()
+    storage = PartitionedExpenseStorage(str(tmp_path))
+    store.add_listener(storage)
+    for expense_id in range(1, 11):
+        store.add(expense_id, "Lunch", expense_id, "2024-05-01")
+    storage.flush()
+    parts = storage.parts('2024-05')
+    store.delete(3)
+    store.update(4, amount=100)
+    storage.flush()
+    assert storage.parts('2024-05')[0] == parts[0]
+    assert storage.deleted('2024-05') == [3, 4]
+    assert storage.summary() == (9, 148.0)
+    frame = storage.load()
+    assert sorted(frame['ID'].tolist()) == [1, 2, 4, 5, 6, 7, 8, 9, 10]
+    assert frame.loc[frame['ID'] == 4, 'Amount'].tolist() == [100.0]
+
+
+def test_change_to_pending_expense_is_applied_in_memory(tmp_path):
+    store = ExpenseStore()
+    storage = PartitionedExpenseStorage(str(tmp_path))
+    store.add_listener(storage)
+    store.add(1, "Lunch", 5, "2024-05-01")
+    store.add(2, "Rent", 500, "2024-05-02")
+    store.update(1, amount=7)
+    store.delete(2)
+    storage.flush()
+    assert storage.deleted('2024-05') == []
+    assert storage.load()[['ID', 'Amount']].values.tolist() == [[1, 7.0]]
+
+
+def test_tombstones_are_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(expense_storage, 'MAX_DELETED_PER_MONTH', 5)
+    store = ExpenseStore()
+    storage = PartitionedExpenseStorage(str(tmp_path))
+    store.add_listener(storage)
+    for expense_id in range(1, 21):
+        store.add(expense_id, "Lunch", 1, "2024-05-01")
+    storage.flush()
+    for expense_id in range(1, 7):
+        store.delete(expense_id)
+        storage.flush()
+    assert storage.deleted('2024-05') == []
+    assert storage.parts('2024-05')[0]['rows'] == 14
+    assert expenses_of(reload(tmp_path, 'integer')) == expenses_of(store)
+
+
+def test_compact_applies_tombstones(tmp_path):
+    store = ExpenseStore(id_format='date')
+    storage = PartitionedExpenseStorage(str(tmp_path))
+    store.add_listener(storage)
+    store.add("20240501_1", "Lunch", 5, "2024-05-01")
+    store.add("20240501_2", "Lunch", 6, "2024-05-01")
+    storage.flush()
+    store.delete("20240501_1")
+    storage.flush()
+    assert storage.compact() == 1
+    assert storage.deleted('2024-05') == []
+    assert storage.load()['ID'].tolist() == ["20240501_2"]
+
+
+@pytest.mark.parametrize('id_format', ['integer', 'date'])
+def test_empty_load_matches_stored_id_type(tmp_path, id_format):
+    store = ExpenseStore(id_format=id_format)
+    storage = PartitionedExpenseStorage(str(tmp_path))
+    store.add_listener(storage)
+    store.add(ids(id_format, 1)[0], "Lunch", 5, "2024-05-01")
+    storage.flush()
+    assert storage.load('2030-01')['ID'].dtype == storage.load()['ID'].dtype
+    assert (storage.load()['ID'].dtype == np.int64) == (id_format == 'integer')
+    assert PartitionedExpenseStorage(str(tmp_path)).id_format == id_format
+    assert PartitionedExpenseStorage(str(tmp_path / 'empty')).load()['ID'].dtype == np.int64
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+import expense_tracker
+from expense_storage import PartitionedExpenseStorage
+
+MONTHS = ['2024-01', '2024-02', '2024-03', '2024-04']
+
+
+@pytest.fixture
+def tracker_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(expense_tracker, 'EXPENSE_DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(expense_tracker, 'openStorage', lambda: PartitionedExpenseStorage(str(tmp_path)))
+    open_sequence = expense_tracker.openSequence
+    monkeypatch.setattr(expense_tracker, 'openSequence',
+                        lambda store, storage=None: open_sequence(store, str(tmp_path), storage))
+    return tmp_path
+
+
+@pytest.fixture
+def read_months(monkeypatch):
+    # The months of every data file read
+    months = []
+    read_part = PartitionedExpenseStorage._read_part
+    def record(path, columns):
+        months.append(os.path.basename(os.path.dirname(path))[len('month='):])
+        return read_part(path, columns)
+    monkeypatch.setattr(PartitionedExpenseStorage, '_read_part', staticmethod(record))
+    return months
+
+
+def save_expenses(per_month=5):
+    store, storage, _, _, sequence, _ = expense_tracker.openTracker()
+    for month in MONTHS:
+        for day in range(1, per_month + 1):
+            store.add(sequence.next_id(), "Rent" if day == 1 else "Lunch", day * 10, f"{month}-{day:02d}")
+    storage.flush()
+    return store.to_frame()
+
+
+def test_startup_and_summary_read_only_the_newest_month(tracker_dir, read_months, capsys):
+    saved = save_expenses()
+    read_months.clear()
+    store, storage, aggregates, _, _, _ = expense_tracker.openTracker()
+    assert len(store) == 0
+    assert read_months == []
+
+    expense_tracker.printSummary(store, storage, aggregates)
+    assert set(read_months) == {MONTHS[-1]}
+    output = capsys.readouterr().out
+    assert f"Total expenses summary :  {saved['Amount'].sum()}" in output
+    for month in MONTHS:
+        assert f"{month}  150.0      5" in output
+
+
+def test_query_reads_only_the_months_of_its_dates(tracker_dir, read_months, capsys):
+    saved = save_expenses()
+    read_months.clear()
+    found = expense_tracker.queryExpenses(start='2024-02-03', end='2024-03-02')
+    assert set(read_months) == {'2024-02', '2024-03'}
+    dates = saved['Date Spent'].astype(str)
+    assert found['ID'].tolist() == saved['ID'][(dates >= '2024-02-03') & (dates <= '2024-03-02')].tolist()
+
+
+def test_history_is_loaded_once_without_the_session_adds(tracker_dir):
+    saved = save_expenses()
+    store, storage, aggregates, budgets, sequence, _ = expense_tracker.openTracker()
+    new_id = sequence.next_id()
+    store.add(new_id, "Bus", 2.5, "2024-04-09")
+    storage.flush()
+    assert expense_tracker.loadHistory(store, storage, budgets) == len(saved)
+    assert sorted(store.to_frame()['ID'].tolist()) == sorted(saved['ID'].tolist() + [new_id])
+    assert aggregates.total == saved['Amount'].sum() + 2.5
+    # Loading did not write the saved expenses again
+    assert storage.summary() == (len(saved) + 1, saved['Amount'].sum() + 2.5)
+
+
+def test_budgets_count_the_saved_spending_of_a_month(tracker_dir):
+    save_expenses()
+    store, storage, _, budgets, sequence, _ = expense_tracker.openTracker()
+    # 10 of Rent is saved in every month
+    budgets.set_budget(30, "Rent")
+    assert budgets.status('2024-03', "Rent") == (10, 30)
+    store.add(sequence.next_id(), "Rent", 15, "2024-03-20")
+    assert [alert['threshold'] for alert in budgets.pop_alerts()] == [0.8]
+    february_id = sequence.next_id()
+    store.add(february_id, "Rent", 1, "2024-02-20")
+    assert budgets.pop_alerts() == []
+
+    # Loading the history counts nothing twice
+    expense_tracker.loadHistory(store, storage, budgets)
+    assert budgets.status('2024-03', "Rent") == (25, 30)
+    assert budgets.status('2024-02', "Rent") == (11, 30)
+    store.update(february_id, amount=25)
+    assert [alert['threshold'] for alert in budgets.pop_alerts()] == [1.0]
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from task_api import MAX_TASK_ID, TaskAPI, TaskAPIServer
+from task_sqlite import SQLiteTaskStore
+from task_store import TaskStore, VALID_STATUSES
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def api(request, tmp_path):
+    if request.param == 'memory':
+        store = TaskStore()
+    else:
+        store = SQLiteTaskStore(str(tmp_path / 'tasks.db'))
+    store.add_many((f"Task {i}", f"Description {i}", VALID_STATUSES[i % 3]) for i in range(30))
+    yield TaskAPI(store)
+    if hasattr(store, 'close'):
+        store.close()
+
+
+def status_of(api, method, target, body=b''):
+    try:
+        return api.handle(method, target, body)[0]
+    except Exception as error:
+        return getattr(error, 'status', error)
+
+
+def test_list_pages(api):
+    status, payload = api.handle('GET', '/tasks?limit=7&page=2', b'')
+    assert [task['id'] for task in payload['tasks']] == list(range(8, 15))
+    assert payload['total'] == 30
+
+    status, payload = api.handle('GET', '/tasks?status=done&limit=3&page=3', b'')
+    assert [task['id'] for task in payload['tasks']] == [21, 24, 27]
+    assert payload['total'] == 10
+
+    status, payload = api.handle('GET', '/tasks?q=task 1&status=in progress&limit=2', b'')
+    assert [task['title'] for task in payload['tasks']] == ["Task 1", "Task 10"]
+    assert payload['total'] == 5
+
+
+def test_search_pages_agree_with_full_search(api):
+    everything = api.handle('GET', '/tasks?q=1&mode=or&limit=1000', b'')[1]
+    pages = [api.handle('GET', f'/tasks?q=1&mode=or&limit=4&page={page}', b'')[1] for page in (1, 2, 3)]
+    assert [task for page in pages for task in page['tasks']] == everything['tasks']
+    assert {page['total'] for page in pages} == {everything['total']} == {12}
+
+
+@pytest.mark.parametrize('target', ['/tasks?limit=-1', '/tasks?limit=0', '/tasks?page=0', '/tasks?limit=x',
+                                    f'/tasks?limit={MAX_TASK_ID + 1}', f'/tasks?page={MAX_TASK_ID}&limit=2',
+                                    '/tasks/99999999999999999999999', '/tasks/0', '/tasks?mode=xor&q=a'])
+def test_invalid_requests_are_rejected(api, target):
+    assert status_of(api, 'GET', target) == 400
+
+
+def test_out_of_range_id_in_batch_fails_alone(api):
+    body = json.dumps({'operations': [
+        {'op': 'add', 'title': "New"},
+        {'op': 'delete', 'id': 99999999999999999999999},
+        {'op': 'delete', 'id': True},
+        {'op': 'update', 'id': 1, 'status': 'done'},
+    ]}).encode()
+    results = api.handle('POST', '/tasks/batch', body)[1]['results']
+    assert [result['ok'] for result in results] == [True, False, False, True]
+
+
+async def exchange(api, raw):
+    server = TaskAPIServer(api, port=0)
+    listener = await asyncio.start_server(server.handle_connection, '127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(raw)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    return response
+
+
+def test_server_answers_overflowing_id(api):
+    response = asyncio.run(exchange(api, b"GET /tasks/99999999999999999999999 HTTP/1.1\r\n"
+                                         b"Connection: close\r\n\r\n"))
+    assert response.startswith(b"HTTP/1.1 400 ")
+
+
+@pytest.mark.parametrize('length', [b'-5', b'abc', b'+3', b'\xd9\xa3'])
+def test_server_rejects_invalid_content_length(api, length):
+    response = asyncio.run(exchange(api, b"POST /tasks HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n{}"))
+    assert response.startswith(b"HTTP/1.1 400 ")
+
+
+def test_server_answers_unexpected_errors_with_500(api, monkeypatch, capsys):
+    def fail(*args):
+        raise OverflowError("boom")
+
+    monkeypatch.setattr(api, 'list_tasks', fail)
+    response = asyncio.run(exchange(api, b"GET /tasks HTTP/1.1\r\n\r\nGET /tasks/1 HTTP/1.1\r\n"
+                                         b"Connection: close\r\n\r\n"))
+    assert response.startswith(b"HTTP/1.1 500 ")
+    # The connection stays usable for the next request
+    assert b"HTTP/1.1 200 " in response
+    assert "OverflowError" in capsys.readouterr().err
+
+
+def test_server_rejects_chunked_bodies_without_desync(api):
+    # The chunk data would otherwise be read as a second request
+    smuggled = b"GET /tasks/1 HTTP/1.1\r\n\r\n"
+    response = asyncio.run(exchange(api, b"POST /tasks HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n"
+                                         + b"%x\r\n%b\r\n0\r\n\r\n" % (len(smuggled), smuggled)))
+    assert response.startswith(b"HTTP/1.1 411 ")
+    assert response.count(b"HTTP/1.1") == 1
+
+
+def test_server_runs_handlers_off_the_event_loop(api, monkeypatch):
+    threads = []
+    handle = api.handle
+
+    def record(*args):
+        threads.append(threading.current_thread())
+        return handle(*args)
+
+    monkeypatch.setattr(api, 'handle', record)
+    response = asyncio.run(exchange(api, b"GET /tasks/1 HTTP/1.1\r\nConnection: close\r\n\r\n"))
+    assert response.startswith(b"HTTP/1.1 200 ")
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,120 @@
+import json
+
+import pytest
+
+import task_tracker
+from task_bulk import detect_format, export_tasks, import_tasks
+from task_store import TaskStore, VALID_STATUSES
+
+# Titles and descriptions a naive CSV or JSON writer would get wrong
+AWKWARD_TEXT = ['plain', 'comma, inside', 'quote " inside', 'line\nbreak', 'ünïcödé ✓', '  padded  ', '']
+
+
+def filled_store(size=40):
+    store = TaskStore()
+    store.add_many((f"Task {i} {AWKWARD_TEXT[i % len(AWKWARD_TEXT)]}",
+                    AWKWARD_TEXT[(i * 3) % len(AWKWARD_TEXT)], VALID_STATUSES[i % 3])
+                   for i in range(size))
+    return store
+
+
+def rows(store):
+    return [(task['task_title'], task['description'], task['task_status']) for task in store]
+
+
+@pytest.mark.parametrize('extension', ['jsonl', 'csv'])
+def test_export_import_round_trip(tmp_path, extension, capsys):
+    store = filled_store()
+    store.delete(3)
+    path = str(tmp_path / f'tasks.{extension}')
+    assert export_tasks(store, path, progress_every=7) == 39
+
+    imported = TaskStore()
+    assert import_tasks(imported, path, batch_size=8, progress_every=7) == (39, 0)
+    assert rows(imported) == rows(store)
+    assert "Imported 39 tasks" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('extension', ['jsonl', 'csv'])
+def test_import_adds_after_existing_tasks(tmp_path, extension, capsys):
+    path = str(tmp_path / f'tasks.{extension}')
+    export_tasks(filled_store(5), path)
+    store = filled_store(3)
+    import_tasks(store, path)
+    # Exported IDs are not reused, the imported tasks get new ones
+    assert [task['id'] for task in store] == list(range(1, 9))
+    assert rows(store) == rows(filled_store(3)) + rows(filled_store(5))
+
+
+def test_invalid_jsonl_rows_are_skipped_with_their_line_number(tmp_path, capsys):
+    path = tmp_path / 'tasks.jsonl'
+    path.write_text('\n'.join([
+        json.dumps({'title': 'First'}),
+        '{not json',
+        '',
+        json.dumps(['a', 'list']),
+        json.dumps({'title': '   '}),
+        json.dumps({'title': 'Bad', 'status': 'later'}),
+        json.dumps({'title': 'Last', 'description': 'Done', 'status': ' Done '}),
+    ]) + '\n', encoding='utf-8')
+    store = TaskStore()
+    assert import_tasks(store, str(path)) == (2, 4)
+    assert rows(store) == [('First', '', 'pending'), ('Last', 'Done', 'done')]
+    output = capsys.readouterr().out
+    for line_number in (2, 4, 5, 6):
+        assert f"Skipped line {line_number}:" in output
+    assert "missing title" in output and "invalid status 'later'" in output
+
+
+def test_invalid_csv_rows_are_skipped_with_their_line_number(tmp_path, capsys):
+    path = tmp_path / 'tasks.csv'
+    path.write_text('title,description,status\n'
+                    'First,"two\nlines",pending\n'
+                    ',no title,pending\n'
+                    'Bad,,later\n', encoding='utf-8')
+    store = TaskStore()
+    assert import_tasks(store, str(path)) == (1, 2)
+    assert rows(store) == [('First', 'two\nlines', 'pending')]
+    output = capsys.readouterr().out
+    # Line numbers count the lines of the file, not the rows
+    assert "Skipped line 4: missing title" in output
+    assert "Skipped line 5: invalid status 'later'" in output
+
+
+def test_malformed_csv_raises_value_error(tmp_path):
+    path = tmp_path / 'tasks.csv'
+    # A field longer than the csv module's field size limit
+    path.write_text(f'title,description,status\nFirst,,pending\nSecond,{"x" * 200_000},pending\n',
+                    encoding='utf-8')
+    with pytest.raises(ValueError, match='after line 2'):
+        import_tasks(TaskStore(), str(path))
+
+
+def test_detect_format():
+    assert detect_format('tasks.JSONL') == 'jsonl'
+    assert detect_format('dir.v2/tasks.csv') == 'csv'
+    with pytest.raises(ValueError):
+        detect_format('tasks.txt')
+
+
+@pytest.mark.parametrize('command, name, message', [
+    ('import', 'tasks.txt', "Could not import"),
+    ('export', 'tasks.xml', "Could not export"),
+    ('import', 'missing.jsonl', "No such file or directory"),
+    ('export', 'missing/tasks.csv', "No such file or directory"),
+])
+def test_cli_reports_bad_files_without_a_traceback(tmp_path, capsys, command, name, message):
+    status = task_tracker.run_cli(['--data-dir', str(tmp_path), command, str(tmp_path / name)])
+    assert status == 0
+    assert message in capsys.readouterr().out
+
+
+def test_cli_round_trip(tmp_path, capsys):
+    source, target = tmp_path / 'source', tmp_path / 'target'
+    path = str(tmp_path / 'tasks.csv')
+    task_tracker.run_cli(['--data-dir', str(source), 'add', 'Write, then "test"', 'twice\nover'])
+    task_tracker.run_cli(['--data-dir', str(source), 'export', path])
+    task_tracker.run_cli(['--data-dir', str(target), 'import', path])
+    capsys.readouterr()
+    task_tracker.run_cli(['--data-dir', str(target), 'list'])
+    assert 'Write, then "test"' in capsys.readouterr().out
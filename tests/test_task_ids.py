@@ -0,0 +1,126 @@
+import random
+import threading
+
+import pytest
+
+from task_journal import PersistentTaskStore
+from task_sqlite import SQLiteTaskStore
+from task_store import IdAllocator, TaskStore, VALID_STATUSES
+
+SEEDS = range(25)
+
+
+def open_memory(path):
+    return TaskStore()
+
+
+def open_journal(path):
+    return PersistentTaskStore(str(path), snapshot_every=20)
+
+
+def open_sqlite(path):
+    return SQLiteTaskStore(str(path / 'tasks.db'))
+
+
+def close(store):
+    if hasattr(store, 'close'):
+        store.close()
+
+
+def run_workload(store, rng, steps, issued):
+    """Apply random adds, bulk adds, reservations, updates and deletes, checking every new ID."""
+    for _ in range(steps):
+        kind = rng.random()
+        live = [task['id'] for task in store]
+        if kind < 0.4 or not live:
+            new_ids = [store.add(f"Task {rng.random()}", "")['id']]
+        elif kind < 0.5:
+            rows = [(f"Bulk {i}", "", rng.choice(VALID_STATUSES)) for i in range(rng.randint(0, 5))]
+            new_ids = [task['id'] for task in store.add_many(rows)]
+        elif kind < 0.6:
+            new_ids = list(store.reserve_ids(rng.randint(0, 4)))
+        elif kind < 0.75:
+            store.update(rng.choice(live), status=rng.choice(VALID_STATUSES))
+            new_ids = []
+        else:
+            store.delete(rng.choice(live))
+            new_ids = []
+        for task_id in new_ids:
+            assert task_id not in issued, f"ID {task_id} handed out twice"
+            assert not issued or task_id > max(issued)
+            issued.add(task_id)
+        ids = [task['id'] for task in store]
+        assert len(ids) == len(set(ids))
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_ids_unique_in_memory(seed):
+    run_workload(TaskStore(), random.Random(seed), 200, set())
+
+
+@pytest.mark.parametrize('open_store', [open_journal, open_sqlite])
+@pytest.mark.parametrize('seed', SEEDS)
+def test_ids_never_reused_across_reopen(tmp_path, open_store, seed):
+    rng = random.Random(seed)
+    issued = set()
+    for _ in range(4):
+        store = open_store(tmp_path)
+        run_workload(store, rng, 40, issued)
+        # Deleting the newest task must not free its ID for the next run
+        newest = max((task['id'] for task in store), default=None)
+        if newest is not None and rng.random() < 0.5:
+            store.delete(newest)
+        close(store)
+    store = open_store(tmp_path)
+    assert store.ids.last_id == max(issued)
+    close(store)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_allocator_sequences(seed):
+    rng = random.Random(seed)
+    start = rng.randint(0, 100)
+    allocator = IdAllocator(start)
+    issued = []
+    for _ in range(200):
+        kind = rng.random()
+        if kind < 0.5:
+            issued.append(allocator.next_id())
+        elif kind < 0.8:
+            issued.extend(allocator.reserve(rng.randint(0, 10)))
+        else:
+            # An observed ID counts as used; one at or below the last ID changes nothing
+            observed = rng.randint(0, allocator.last_id + 5)
+            if observed > allocator.last_id:
+                issued.append(observed)
+            allocator.observe(observed)
+    assert issued == sorted(set(issued))
+    assert all(task_id > start for task_id in issued)
+    assert allocator.last_id == max(issued, default=start)
+
+
+def test_reserve_rejects_negative_count():
+    with pytest.raises(ValueError):
+        IdAllocator().reserve(-1)
+
+
+def test_allocator_is_thread_safe():
+    allocator = IdAllocator()
+    results = [[] for _ in range(8)]
+
+    def allocate(index):
+        for i in range(2000):
+            if i % 10 == 0:
+                results[index].extend(allocator.reserve(3))
+            else:
+                results[index].append(allocator.next_id())
+
+    threads = [threading.Thread(target=allocate, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    issued = [task_id for result in results for task_id in result]
+    assert sorted(issued) == list(range(1, len(issued) + 1))
+    for result in results:
+        assert result == sorted(result)
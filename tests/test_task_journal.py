@@ -0,0 +1,159 @@
+import os
+import time
+
+import pytest
+
+from task_journal import JOURNAL_FILE, PersistentTaskStore, TaskJournal, decode_record, encode_record
+
+
+def tasks_of(store):
+    return sorted((task['id'], task['task_title'], task['description'], task['task_status'])
+                  for task in store)
+
+
+def crash(store):
+    """Drop a store without closing it, like a killed process would."""
+    store.journal._file.close()
+
+
+def fill(store):
+    store.add("Buy milk", "Two litres")
+    store.add("Call mom", "Sunday")
+    store.update(1, status='done')
+    store.add_many([("Pay rent", "", 'pending'), ("Walk dog", "", 'in progress')])
+    store.delete(2)
+    store.reserve_ids(5)
+
+
+def test_record_roundtrip():
+    record = {'op': 'add', 'id': 1, 'title': 'é', 'seq': 3}
+    assert decode_record(encode_record(record)) == record
+
+
+@pytest.mark.parametrize('line', [b'', b'0000', b'00000000 {}', b'zzzzzzzz {}\n', b'00000000 {}\n'])
+def test_invalid_records_are_rejected(line):
+    assert decode_record(line) is None
+
+
+def test_replay_after_reopen(tmp_path):
+    store = PersistentTaskStore(str(tmp_path))
+    fill(store)
+    expected, last_id = tasks_of(store), store.ids.last_id
+    store.close()
+
+    reopened = PersistentTaskStore(str(tmp_path))
+    assert tasks_of(reopened) == expected
+    assert reopened.ids.last_id == last_id
+    assert reopened.add("New", "")['id'] == last_id + 1
+    reopened.close()
+
+
+def test_replay_without_close(tmp_path):
+    store = PersistentTaskStore(str(tmp_path), fsync_every=1000, fsync_interval=60)
+    fill(store)
+    expected = tasks_of(store)
+    crash(store)
+    assert tasks_of(PersistentTaskStore(str(tmp_path))) == expected
+
+
+@pytest.mark.parametrize('cut', [1, 5, 20])
+def test_truncated_last_record_is_dropped(tmp_path, cut):
+    store = PersistentTaskStore(str(tmp_path))
+    store.add("Kept", "")
+    expected = tasks_of(store)
+    store.add("Torn", "")
+    store.close()
+    path = tmp_path / JOURNAL_FILE
+    data = path.read_bytes()
+    path.write_bytes(data[:-cut])
+
+    reopened = PersistentTaskStore(str(tmp_path))
+    assert tasks_of(reopened) == expected
+    # The torn record was cut off, so new records follow the last valid one
+    assert path.stat().st_size == data.index(b'\n') + 1
+    reopened.add("After", "")
+    reopened.close()
+    assert [task[1] for task in tasks_of(PersistentTaskStore(str(tmp_path)))] == ["Kept", "After"]
+
+
+def test_corrupt_last_record_is_dropped(tmp_path):
+    store = PersistentTaskStore(str(tmp_path))
+    store.add("Kept", "")
+    store.add("Corrupt", "")
+    store.close()
+    path = tmp_path / JOURNAL_FILE
+    data = bytearray(path.read_bytes())
+    data[-5] ^= 0x01
+    path.write_bytes(bytes(data))
+
+    reopened = PersistentTaskStore(str(tmp_path))
+    assert [task['task_title'] for task in reopened] == ["Kept"]
+    reopened.close()
+
+
+def test_crash_between_snapshot_and_journal_reset(tmp_path, monkeypatch):
+    store = PersistentTaskStore(str(tmp_path), snapshot_every=1000)
+    fill(store)
+    expected, last_id = tasks_of(store), store.ids.last_id
+
+    def crash_before_reset(journal):
+        raise SystemExit("crash")
+
+    monkeypatch.setattr(TaskJournal, 'reset', crash_before_reset)
+    with pytest.raises(SystemExit):
+        store.snapshot()
+    crash(store)
+    monkeypatch.undo()
+
+    # The snapshot holds every change and the journal still repeats them
+    assert (tmp_path / JOURNAL_FILE).stat().st_size > 0
+    reopened = PersistentTaskStore(str(tmp_path))
+    assert tasks_of(reopened) == expected
+    assert reopened.ids.last_id == last_id
+    reopened.add("Later", "")
+    reopened.close()
+    assert len(PersistentTaskStore(str(tmp_path))) == len(expected) + 1
+
+
+def test_crash_while_writing_snapshot(tmp_path, monkeypatch):
+    store = PersistentTaskStore(str(tmp_path), snapshot_every=1000)
+    fill(store)
+    expected = tasks_of(store)
+
+    def crash_before_rename(source, target):
+        raise SystemExit("crash")
+
+    monkeypatch.setattr(os, 'replace', crash_before_rename)
+    with pytest.raises(SystemExit):
+        store.snapshot()
+    crash(store)
+    monkeypatch.undo()
+
+    # The journal alone still holds every change
+    assert tasks_of(PersistentTaskStore(str(tmp_path))) == expected
+
+
+def test_snapshot_is_taken_and_replayed(tmp_path):
+    store = PersistentTaskStore(str(tmp_path), snapshot_every=10)
+    for i in range(25):
+        store.add(f"Task {i}", "")
+    store.delete(3)
+    expected = tasks_of(store)
+    assert store.journal.records < 25
+    store.close()
+    assert tasks_of(PersistentTaskStore(str(tmp_path))) == expected
+
+
+def test_pending_records_are_synced_after_interval(tmp_path, monkeypatch):
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, 'fsync', lambda fd: synced.append(fd) or real_fsync(fd))
+    journal = TaskJournal(str(tmp_path / JOURNAL_FILE), fsync_every=100, fsync_interval=0.5)
+    journal.append({'op': 'ids', 'last_id': 1})
+    journal.append({'op': 'ids', 'last_id': 2})
+    assert not synced
+    deadline = time.monotonic() + 5
+    while not synced and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(synced) == 1
+    journal.close()
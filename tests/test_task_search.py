@@ -0,0 +1,134 @@
+import random
+
+import pytest
+
+from task_index import TaskSearchIndex
+from task_sqlite import SQLiteTaskStore
+from task_store import TaskStore
+
+TASKS = [
+    ("Cook dinner", "Make curry and rice"),
+    ("Learn C++", "Read the first chapters"),
+    ("Eat breakfast", "Something great"),
+    ("Great escape", "Plan the weekend"),
+    ("Make curry", "For the party"),
+    ("Café visit", "Meet Ana at the cafe"),
+    ("Weekly meeting", "Agenda: 50% done, next_steps"),
+]
+
+QUERIES = ["c++", "eat", "curry make", "make curry", "cook", "MEET", "eet", "café", "CAFÉ",
+           "cafe", "50%", "next_steps", "_", "", " ", "e", "zzz", "agenda:"]
+
+
+def substring_search(tasks, keyword):
+    """The original Task Tracker search."""
+    return [task for task in tasks if keyword.lower() in task['task_title'].lower()
+            or keyword.lower() in task['description'].lower()]
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_store(request, tmp_path):
+    stores = []
+
+    def make_store():
+        if request.param == 'memory':
+            store = TaskStore()
+        else:
+            store = SQLiteTaskStore(str(tmp_path / f'tasks{len(stores)}.db'))
+        stores.append(store)
+        return store
+
+    yield make_store
+    for store in stores:
+        if hasattr(store, 'close'):
+            store.close()
+
+
+def ids(tasks):
+    return sorted(task['id'] for task in tasks)
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_search_matches_substring_search(make_store, query):
+    store = make_store()
+    for title, description in TASKS:
+        store.add(title, description)
+    expected = substring_search(list(store), query)
+    assert ids(store.search(query)) == ids(expected)
+
+
+def test_search_ranks_only_matching_tasks(make_store):
+    store = make_store()
+    for title, description in TASKS:
+        store.add(title, description)
+    assert [task['task_title'] for task in store.search("c++")] == ["Learn C++"]
+    assert "Eat breakfast" in [task['task_title'] for task in store.search("eat")]
+    assert "Great escape" in [task['task_title'] for task in store.search("eat")]
+    assert [task['task_title'] for task in store.search("curry make")] == []
+
+
+def test_search_or_matches_any_word(make_store):
+    store = make_store()
+    for title, description in TASKS:
+        store.add(title, description)
+    found = ids(store.search("c++ party", mode='or'))
+    expected = ids(substring_search(list(store), "c++") + substring_search(list(store), "party"))
+    assert found == expected
+
+
+def test_search_limit_returns_best_matches(make_store):
+    store = make_store()
+    for title, description in TASKS:
+        store.add(title, description)
+    every = store.search("e")
+    assert store.search("e", limit=3) == every[:3]
+
+
+def test_search_agrees_with_substring_search_after_changes(make_store):
+    rng = random.Random(7)
+    words = ["alpha", "beta", "gamma", "delta", "alphabet", "betamax", "mega", "gam"]
+    store = make_store()
+    for _ in range(300):
+        store.add(' '.join(rng.choices(words, k=2)), ' '.join(rng.choices(words, k=4)))
+    for task_id in rng.sample(range(1, 301), 60):
+        store.update(task_id, title=' '.join(rng.choices(words, k=2)))
+    for task_id in rng.sample(range(1, 301), 60):
+        store.delete(task_id)
+    for query in ["alpha", "pha", "bet", "a", "ma", "gam", "mega beta", "lpha b", "x"]:
+        assert ids(store.search(query)) == ids(substring_search(list(store), query))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_index_ranks_like_a_full_sort(seed):
+    rng = random.Random(seed)
+    words = ["fix", "prefix", "fixed", "bug", "debug", "io", "x", "ab", "b"]
+    index = TaskSearchIndex()
+    for task_id in range(1, 201):
+        index.add(task_id, ' '.join(rng.choices(words, k=2)), ' '.join(rng.choices(words, k=3)))
+    for query in ["fix", "x", "b", "ix", "bug", "io", "fix bug", "zz"]:
+        for mode in ('and', 'or'):
+            ranked = index.match(query, mode=mode)
+            needles = index._needles(query, mode)
+            if ' ' in query and mode == 'and':
+                # Text spanning several words is found by a scan, in insertion order
+                assert ranked == index._scan(needles, None)
+            else:
+                scores = index._score(index._terms(needles))
+                assert ranked == sorted(scores, key=lambda task_id: (-scores[task_id], task_id))
+            assert index.count(query, mode=mode) == len(ranked)
+            for limit in (0, 1, 5, 50, 500):
+                assert index.match(query, mode=mode, limit=limit) == ranked[:limit]
+            within = set(range(1, 201, 3))
+            assert index.match(query, mode=mode, within=within) == [task_id for task_id in ranked if task_id in within]
+
+
+def test_removed_terms_leave_no_grams():
+    index = TaskSearchIndex()
+    index.add(1, "Fix the parser", "a b io")
+    index.add(2, "Parse it", "prefix")
+    index.update(2, "Parse again", "x")
+    assert index.match("refi") == []
+    assert sorted(index.match("pars")) == [1, 2]
+    index.remove(1)
+    index.remove(2)
+    assert (index._postings, index._grams, index._gram_parts, index._short_terms) == ({}, {}, {}, {})
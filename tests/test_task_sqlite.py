@@ -0,0 +1,50 @@
+from task_sqlite import SQLiteTaskStore
+from task_store import VALID_STATUSES
+
+
+def test_by_status_pages(tmp_path):
+    store = SQLiteTaskStore(str(tmp_path / 'tasks.db'))
+    store.add_many((f"Task {i}", "", VALID_STATUSES[i % 3]) for i in range(100))
+    store.delete(4)
+    pending = store.by_status('pending')
+    assert [task['id'] for task in pending] == [task_id for task_id in range(1, 101, 3) if task_id != 4]
+    assert store.by_status('pending', limit=5) == pending[:5]
+    assert store.by_status('pending', limit=5, offset=30) == pending[30:35]
+    assert store.by_status('pending', offset=10) == pending[10:]
+    assert store.by_status('pending', limit=5, offset=500) == []
+    store.close()
+
+
+def test_reopen_keeps_tasks_and_ids(tmp_path):
+    path = str(tmp_path / 'tasks.db')
+    store = SQLiteTaskStore(path)
+    store.add("Buy milk", "")
+    store.reserve_ids(10)
+    store.close()
+    store = SQLiteTaskStore(path)
+    assert [task['task_title'] for task in store] == ["Buy milk"]
+    assert store.add("Next", "")['id'] == 12
+    store.close()
+
+
+def test_tracker_operations_check_emptiness_without_counting(tmp_path, monkeypatch, capsys):
+    import task_tracker
+    store = SQLiteTaskStore(str(tmp_path / 'tasks.db'))
+    monkeypatch.setattr(task_tracker, 'task_store', store)
+    assert not store
+    task_tracker.delete_task(1)
+    store.add("Buy milk", "Two litres")
+    assert store
+    statements = []
+    store._conn.set_trace_callback(statements.append)
+    task_tracker.update_task(1, status='done')
+    task_tracker.delete_task(7)
+    task_tracker.search_tasks("milk")
+    task_tracker.delete_task(1)
+    store._conn.set_trace_callback(None)
+    assert not any('COUNT(' in statement for statement in statements)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "No tasks yet. Add your tasks"
+    assert "Task ID 7 not found." in lines
+    assert lines[-1] == "Task ID 1 deleted successfully."
+    store.close()
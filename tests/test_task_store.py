@@ -0,0 +1,44 @@
+import task_tracker
+from task_store import TaskStore, VALID_STATUSES
+
+
+def make_store(size=50):
+    store = TaskStore()
+    store.add_many((f"Task {i}", "", VALID_STATUSES[i % 3]) for i in range(size))
+    return store
+
+
+def test_by_status_pages():
+    store = make_store()
+    store.update(4, status='done')
+    pending = store.by_status('pending')
+    assert [task['id'] for task in pending] == [task_id for task_id in range(1, 51, 3) if task_id != 4]
+    assert store.by_status('pending', limit=4) == pending[:4]
+    assert store.by_status('pending', limit=4, offset=8) == pending[8:12]
+    assert store.by_status('pending', offset=5) == pending[5:]
+    assert store.by_status('pending', limit=4, offset=100) == []
+    assert store.by_status('unknown', limit=4) == []
+
+
+def test_view_tasks_status_shows_requested_page(monkeypatch, capsys):
+    monkeypatch.setattr(task_tracker, 'task_store', make_store())
+    task_tracker.view_tasks_status('pending', page=2, limit=3, compact=True)
+    output = capsys.readouterr().out
+    rows = [line.split()[0] for line in output.splitlines()[2:-1]]
+    assert rows == ['10', '13', '16']
+    assert "Page 2 of 6 (17 tasks)" in output
+
+
+def test_view_tasks_fetches_only_the_requested_page(monkeypatch, capsys):
+    store = make_store()
+    monkeypatch.setattr(task_tracker, 'task_store', store)
+    pages = []
+    all_tasks = store.all_tasks
+    monkeypatch.setattr(store, 'all_tasks', lambda limit=None, offset=0: pages.append((limit, offset))
+                        or all_tasks(limit, offset))
+    task_tracker.view_tasks(page=3, limit=4, compact=True)
+    output = capsys.readouterr().out
+    rows = [line.split()[0] for line in output.splitlines()[2:-1]]
+    assert pages == [(4, 8)]
+    assert rows == ['9', '10', '11', '12']
+    assert "Page 3 of 13 (50 tasks)" in output
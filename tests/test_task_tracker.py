@@ -0,0 +1,62 @@
+import io
+
+import pytest
+
+import task_tracker
+from task_store import TaskStore
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = TaskStore()
+    monkeypatch.setattr(task_tracker, 'task_store', store)
+    return store
+
+
+def run_batch(lines):
+    parser = task_tracker.build_parser()
+    defaults = parser.parse_args(['batch'])
+    return task_tracker.run_batch(parser, lines, defaults)
+
+
+def test_batch_applies_json_and_command_lines(store, capsys):
+    failed = run_batch([
+        '{"op": "add", "title": "Buy milk", "description": "Two litres"}',
+        'add "Call mom" --status "in progress"',
+        '# comment',
+        '',
+        '{"op": "update", "id": 1, "status": "done"}',
+        '{"op": "search", "keyword": "milk", "limit": 5}',
+        'delete 2',
+    ])
+    assert failed == 0
+    assert [(task['task_title'], task['task_status']) for task in store] == [("Buy milk", "done")]
+    assert "Buy milk" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('line, message', [
+    ('{"op": "search", "keyword": "milk", "limit": "5"}', "field 'limit' must be an integer"),
+    ('{"op": "update", "id": "1", "status": "done"}', "field 'id' must be an integer"),
+    ('{"op": "delete", "id": true}', "field 'id' must be an integer"),
+    ('{"op": "add", "title": ["x"]}', "field 'title' must be a string"),
+    ('{"op": "add", "title": "x", "command": "delete"}', "unknown field 'command'"),
+    ('{"op": "add", "title": "x", "id": 7}', "unknown field 'id'"),
+    ('{"op": "list", "compact": 1}', "field 'compact' must be true or false"),
+    ('{"op": "list", "limit": 0}', "limit must be at least 1"),
+    ('{"op": "export"}', "unknown operation 'export'"),
+    ('{"op": "add"', "Expecting"),
+    ('{"op": "add", "title": "x", "status": "later"}', "invalid status 'later'"),
+])
+def test_batch_reports_invalid_lines_and_continues(store, capsys, line, message):
+    failed = run_batch(['add First', line, 'add Last'])
+    assert failed == 1
+    assert [task['task_title'] for task in store] == ["First", "Last"]
+    errors = capsys.readouterr().err
+    assert errors.startswith("Line 2: ")
+    assert message in errors
+
+
+def test_batch_reports_unknown_tasks(store, capsys):
+    assert run_batch(io.StringIO('update 5 --status done\n{"op": "delete", "id": 6}\n')) == 2
+    assert capsys.readouterr().err.splitlines() == ["Line 1: Task ID 5 not found.",
+                                                    "Line 2: Task ID 6 not found."]
@@ -0,0 +1,264 @@
+import json
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+# The converter is a Flask app in its own folder, importing its modules by name
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'unit_converterApp'))
+
+from app import app
+from units import EXACT_DIGITS, MAX_EXACT_DIGITS, MAX_EXACT_EXPONENT, REGISTRY, UnitError, format_exact, parse_exact
+
+BATCH = '/api/convert/batch'
+
+
+# The converter's functions before the registry replaced them
+def old_convert_length(value, from_unit, to_unit):
+    length_units = {'millimeter': 1, 'centimeter': 10, 'meter': 1000, 'kilometer': 1000000,
+                    'inch': 25.4, 'foot': 304.8, 'yard': 914.4, 'mile': 1609344}
+    return value * length_units[from_unit] / length_units[to_unit]
+
+
+def old_convert_weight(value, from_unit, to_unit):
+    weight_units = {'milligram': 1, 'gram': 1000, 'kilogram': 1000000,
+                    'ounce': 28349.5, 'pound': 453592, 'lbs': 453592}
+    return value * weight_units[from_unit] / weight_units[to_unit]
+
+
+def old_convert_temperature(value, from_unit, to_unit):
+    if from_unit == 'Celsius':
+        if to_unit == 'Fahrenheit':
+            return (value * 9/5) + 32
+        elif to_unit == 'Kelvin':
+            return value + 273.15
+    elif from_unit == 'Fahrenheit':
+        if to_unit == 'Celsius':
+            return (value - 32) * 5/9
+        elif to_unit == 'Kelvin':
+            return (value - 32) * 5/9 + 273.15
+    elif from_unit == 'Kelvin':
+        if to_unit == 'Celsius':
+            return value - 273.15
+        elif to_unit == 'Fahrenheit':
+            return (value - 273.15) * 9/5 + 32
+    return value
+
+
+OLD_CONVERTERS = {'length': old_convert_length, 'weight': old_convert_weight,
+                  'temperature': old_convert_temperature}
+
+PAIRS = [(dimension, from_unit, to_unit) for dimension in OLD_CONVERTERS
+         for from_unit, _ in REGISTRY.dimensions[dimension] for to_unit, _ in REGISTRY.dimensions[dimension]]
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(7).uniform(-1000, 1000, 1000)
+
+
+def units(dimension, from_unit, to_unit):
+    return {'unit_type': dimension, 'from_unit': from_unit, 'to_unit': to_unit}
+
+
+@pytest.mark.parametrize('dimension, from_unit, to_unit', PAIRS)
+def test_registry_matches_the_old_formulas(dimension, from_unit, to_unit, values):
+    expected = OLD_CONVERTERS[dimension](values, from_unit, to_unit)
+    converted = REGISTRY.convert(values, from_unit, to_unit, dimension)
+    np.testing.assert_allclose(converted, expected, rtol=1e-12, atol=1e-9)
+    for value in values[:20].tolist():
+        assert REGISTRY.convert(value, from_unit, to_unit, dimension) == pytest.approx(
+            OLD_CONVERTERS[dimension](value, from_unit, to_unit), rel=1e-12, abs=1e-9)
+        assert float(REGISTRY.convert_exact(repr(value), from_unit, to_unit, dimension)) == pytest.approx(
+            OLD_CONVERTERS[dimension](value, from_unit, to_unit), rel=1e-12, abs=1e-9)
+
+
+def test_registry_refuses_mismatched_units():
+    with pytest.raises(UnitError):
+        REGISTRY.convert(1.0, 'meter', 'gram')
+    with pytest.raises(UnitError):
+        REGISTRY.convert(1.0, 'meter', 'foot', 'weight')
+    with pytest.raises(UnitError):
+        REGISTRY.convert(1.0, 'meter', 'parsec', 'length')
+
+
+@pytest.mark.parametrize('dimension, from_unit, to_unit', [
+    ('length', 'mile', 'meter'), ('weight', 'ounce', 'lbs'), ('temperature', 'Kelvin', 'Fahrenheit')])
+def test_json_round_trip(client, values, dimension, from_unit, to_unit):
+    response = client.post(BATCH, json=dict(units(dimension, from_unit, to_unit), values=values.tolist()))
+    assert response.status_code == 200
+    body = json.loads(response.data)
+    assert body['count'] == len(values)
+    assert body['precision'] == 'float'
+    np.testing.assert_allclose(body['results'], OLD_CONVERTERS[dimension](values, from_unit, to_unit), rtol=1e-12)
+
+
+def test_ndjson_round_trip(client, values):
+    lines = [json.dumps(units('length', 'foot', 'centimeter'))] + [repr(value) for value in values.tolist()]
+    response = client.post(BATCH, data='\n'.join(lines) + '\n', content_type='application/x-ndjson')
+    assert response.status_code == 200
+    header, *results = response.data.decode().splitlines()
+    assert json.loads(header)['count'] == len(values)
+    np.testing.assert_allclose([float(line) for line in results], old_convert_length(values, 'foot', 'centimeter'),
+                               rtol=1e-12)
+
+
+def test_binary_round_trip(client, values):
+    query = '&'.join(f"{name}={value}" for name, value in units('temperature', 'Celsius', 'Kelvin').items())
+    response = client.post(f"{BATCH}?{query}", data=values.astype('<f8').tobytes(),
+                           content_type='application/octet-stream')
+    assert response.status_code == 200
+    np.testing.assert_allclose(np.frombuffer(response.data, dtype='<f8'), values + 273.15, rtol=1e-12)
+
+
+def test_results_larger_than_one_chunk_stay_in_order(client, monkeypatch):
+    monkeypatch.setattr('app.BATCH_CHUNK_SIZE', 7)
+    values = list(range(100))
+    response = client.post(BATCH, json=dict(units('length', 'meter', 'millimeter'), values=values))
+    assert json.loads(response.data)['results'] == [value * 1000 for value in values]
+
+
+def test_converting_a_unit_to_itself_returns_every_value(client):
+    response = client.post(BATCH, json=dict(units('length', 'meter', 'meter'), values=[1, 2.5, -3]))
+    assert json.loads(response.data)['results'] == [1, 2.5, -3]
+
+
+def test_overflow_is_refused(client):
+    response = client.post(BATCH,
+                           json=dict(units('length', 'mile', 'millimeter'), values=[1.0, 1e308]))
+    assert response.status_code == 400
+    assert 'overflow' in json.loads(response.data)['error']
+
+
+def test_non_finite_binary_values_are_refused(client):
+    query = '&'.join(f"{name}={value}" for name, value in units('length', 'meter', 'foot').items())
+    response = client.post(f"{BATCH}?{query}", data=np.array([1.0, np.nan]).tobytes(),
+                           content_type='application/octet-stream')
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('precision', ['float', 'exact'])
+@pytest.mark.parametrize('bad_values', [[True], [1, False], [None], [[1, 2]], [{'value': 1}], 'nope', 3])
+def test_non_numeric_json_values_are_refused(client, precision, bad_values):
+    response = client.post(f"{BATCH}?precision={precision}",
+                           json=dict(units('length', 'meter', 'foot'), values=bad_values))
+    assert response.status_code == 400
+
+
+def test_quoted_numbers_are_only_exact_values(client):
+    body = dict(units('length', 'meter', 'millimeter'), values=["2", 0.5])
+    assert client.post(BATCH, json=body).status_code == 400
+    response = client.post(f"{BATCH}?precision=exact", json=body)
+    assert json.loads(response.data)['results'] == ['2000', '500']
+
+
+@pytest.mark.parametrize('body', [b'not json', b'[1, 2]', b'{"unit_type": "length"}'])
+def test_malformed_batches_are_refused(client, body):
+    response = client.post(BATCH, data=body, content_type='application/json')
+    assert response.status_code == 400
+
+
+def test_unknown_units_are_refused(client):
+    response = client.post(BATCH, json=dict(units('length', 'meter', 'gram'), values=[1]))
+    assert response.status_code == 400
+
+
+def test_random_batches_match_single_conversions(client):
+    rng = random.Random(5)
+    for _ in range(20):
+        dimension, from_unit, to_unit = rng.choice(PAIRS)
+        values = [rng.uniform(-1e6, 1e6) for _ in range(rng.randint(0, 50))]
+        response = client.post(BATCH, json=dict(units(dimension, from_unit, to_unit), values=values))
+        assert response.status_code == 200
+        assert json.loads(response.data)['results'] == [REGISTRY.convert(value, from_unit, to_unit, dimension)
+                                                        for value in values]
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('0.1', Fraction(1, 10)), (' -2.50 ', Fraction(-5, 2)), ('1e-3', Fraction(1, 1000)), ('1_000', 1000),
+    ('3/4', Fraction(3, 4)), (7, 7), (Decimal('0.3'), Fraction(3, 10)), (Fraction(1, 3), Fraction(1, 3)),
+])
+def test_parse_exact_reads_values_as_written(text, expected):
+    assert parse_exact(text) == expected
+
+
+@pytest.mark.parametrize('text', [
+    '9' * MAX_EXACT_DIGITS, '1' + '0' * (MAX_EXACT_DIGITS - 1), f'1e{MAX_EXACT_EXPONENT}', f'1e-{MAX_EXACT_EXPONENT}',
+    f'1e+{MAX_EXACT_EXPONENT:06d}', Decimal(f'1e{MAX_EXACT_EXPONENT}'), 10 ** (MAX_EXACT_DIGITS - 1),
+])
+def test_parse_exact_takes_values_up_to_the_limits(text):
+    assert parse_exact(text)
+
+
+@pytest.mark.parametrize('text', [
+    '9' * (MAX_EXACT_DIGITS + 1), '0.' + '1' * MAX_EXACT_DIGITS, f'1e{MAX_EXACT_EXPONENT + 1}',
+    f'1e-{MAX_EXACT_EXPONENT + 1}', '1e' + '9' * 1000000, Decimal(f'1e{MAX_EXACT_EXPONENT + 1}'),
+    10 ** MAX_EXACT_DIGITS, 'nan', 'inf', '-Infinity', '', 'one', '1/0', None,
+])
+def test_parse_exact_refuses_values_beyond_the_limits(text):
+    start = time.perf_counter()
+    with pytest.raises(ValueError):
+        parse_exact(text)
+    # Refused before the value is expanded into digits
+    assert time.perf_counter() - start < 1
+
+
+def test_exact_batch_reports_values_beyond_the_limits(client):
+    response = client.post(f"{BATCH}?precision=exact",
+                           json=dict(units('length', 'meter', 'foot'), values=['1e100000']))
+    assert response.status_code == 400
+    assert str(MAX_EXACT_DIGITS) in json.loads(response.data)['error']
+
+
+@pytest.mark.parametrize('value, expected', [
+    (Fraction(0), '0'), (Fraction(-0), '0'), (Fraction(1, 8), '0.125'), (Fraction(-5, 2), '-2.5'),
+    (Fraction(10 ** 40), '1' + '0' * 40), (Fraction(1, 10 ** 40), '0.' + '0' * 39 + '1'),
+    (Fraction(1, 2 ** 100), '0.' + str(5 ** 100).rjust(100, '0')),
+    (Fraction(3, 10 ** 60) + 7, '7.' + '0' * 59 + '3'),
+])
+def test_format_exact_writes_terminating_decimals_in_full(value, expected):
+    assert format_exact(value) == expected
+    assert Fraction(format_exact(value)) == value
+
+
+@pytest.mark.parametrize('value, expected', [
+    (Fraction(1, 3), '0.' + '3' * EXACT_DIGITS), (Fraction(-2, 3), '-0.' + '6' * (EXACT_DIGITS - 1) + '7'),
+    (Fraction(10, 7), '1.' + '428571' * 5 + '429'), (Fraction(1, 3 * 2 ** 70), None),
+])
+def test_format_exact_rounds_repeating_decimals(value, expected):
+    text = format_exact(value)
+    if expected is not None:
+        assert text == expected
+    digits = text.lstrip('-0.').replace('.', '')
+    assert len(digits) <= EXACT_DIGITS
+    assert abs(Fraction(text) - value) <= abs(value) / 10 ** (EXACT_DIGITS - 1)
+
+
+def test_exact_results_match_exact_arithmetic(client):
+    response = client.post(f"{BATCH}?precision=exact",
+                           json=dict(units('temperature', 'Fahrenheit', 'Celsius'), values=[0.1, "98.6", 32, "-40"]))
+    assert json.loads(response.data)['results'] == [
+        format_exact((Fraction(1, 10) - 32) * Fraction(5, 9)), '37', '0', '-40']
+    # Exact mode avoids the float error of 0.1 foot in inches
+    response = client.post(f"{BATCH}?precision=exact", json=dict(units('length', 'foot', 'inch'), values=[0.1]))
+    assert json.loads(response.data)['results'] == ['1.2']
+
+
+def test_worker_respawn_backs_off():
+    serve = pytest.importorskip('serve')
+    delays = [serve._respawn_delay(failures) for failures in range(20)]
+    assert delays[0] == serve.RESPAWN_DELAY
+    assert all(later == min(2 * earlier, serve.MAX_RESPAWN_DELAY) for earlier, later in zip(delays, delays[1:]))
+    assert delays[-1] == serve.MAX_RESPAWN_DELAY
+    # However long a worker keeps failing, the delay stays capped
+    assert serve._respawn_delay(10 ** 6) == serve.MAX_RESPAWN_DELAY
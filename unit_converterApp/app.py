@@ -1,71 +1,313 @@
-from flask import Flask, render_template, request
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+from flask import Flask, Response, abort, jsonify, render_template, request
+
+from cache import LRUCache
+from units import REGISTRY, UnitError, format_exact, format_float, parse_exact
 
 app = Flask(__name__)
+# Form posts are a few short fields; only batch requests are allowed more
+app.config['MAX_CONTENT_LENGTH'] = 64 * 1024
+
+# Batch requests carry millions of values, but not without bound
+BATCH_MAX_CONTENT_LENGTH = 256 * 1024 * 1024
+
+# Values converted and written back per chunk of a streamed batch response
+BATCH_CHUNK_SIZE = 65536
+
+# Arithmetic of a conversion, chosen per request with ?precision=: fast floats or exact fractions
+PRECISIONS = ('float', 'exact')
+
+# Result pages of recent conversions, keyed by (unit_type, from_unit, to_unit, value)
+RESULT_CACHE = LRUCache(maxsize=4096, ttl=3600)
+
+# Pages that only change with the code, rendered once as (body, etag)
+PAGE_CACHE = LRUCache(maxsize=16)
+
+# The pages are as new as their template and the units, which is the same in every worker
+PAGES_MODIFIED = int(max(os.path.getmtime(path) for path in (
+    os.path.join(app.root_path, 'templates', 'index.html'), os.path.join(app.root_path, 'units.py'))))
+
+# Responses answered without a body, and other counts for /metrics
+METRICS = Counter()
+
+def cached_page(key, render):
+    # Pages are shared by the Flask routes and the ASGI handlers in serve.py, so render in an app context
+    page = PAGE_CACHE.get(key)
+    if page is None:
+        with app.app_context():
+            body = render().encode('utf-8')
+        page = (body, hashlib.sha1(body).hexdigest())
+        PAGE_CACHE.set(key, page)
+    return page
+
+def parse_value(text, precision):
+    # Exact values are read as written, so '0.1' is 1/10 and not the float nearest to it,
+    # and parse_exact() refuses ones too large to convert quickly
+    return parse_exact(text) if precision == 'exact' else float(text)
+
+def index_page(precision='float'):
+    return cached_page(('index', precision),
+                       lambda: render_template('index.html', units=REGISTRY.dimensions, precision=precision))
+
+def cached_result_page(unit_type, from_unit, to_unit, value, precision='float'):
+    # Most conversions repeat, so keep the rendered page rather than just the number
+    return RESULT_CACHE.get((unit_type, from_unit, to_unit, value, precision))
+
+def result_page(unit_type, from_unit, to_unit, value, precision='float'):
+    page = cached_result_page(unit_type, from_unit, to_unit, value, precision)
+    if page is None:
+        page = render_result_page(unit_type, from_unit, to_unit, value, precision)
+    return page
 
-# Conversion functions
-def convert_length(value, from_unit, to_unit):
-    length_units = {
-        'millimeter': 1,
-        'centimeter': 10,
-        'meter': 1000,
-        'kilometer': 1000000,
-        'inch': 25.4,
-        'foot': 304.8,
-        'yard': 914.4,
-        'mile': 1609344,
-    }
-    return value * length_units[from_unit] / length_units[to_unit]
-
-def convert_weight(value, from_unit, to_unit):
-    weight_units = {
-        'milligram': 1,
-        'gram': 1000,
-        'kilogram': 1000000,
-        'ounce': 28349.5,
-        'pound': 453592,
-        'lbs': 453592,  # Adding pounds (lbs)
-    }
-    return value * weight_units[from_unit] / weight_units[to_unit]
-
-def convert_temperature(value, from_unit, to_unit):
-    if from_unit == 'Celsius':
-        if to_unit == 'Fahrenheit':
-            return (value * 9/5) + 32
-        elif to_unit == 'Kelvin':
-            return value + 273.15
-    elif from_unit == 'Fahrenheit':
-        if to_unit == 'Celsius':
-            return (value - 32) * 5/9
-        elif to_unit == 'Kelvin':
-            return (value - 32) * 5/9 + 273.15
-    elif from_unit == 'Kelvin':
-        if to_unit == 'Celsius':
-            return value - 273.15
-        elif to_unit == 'Fahrenheit':
-            return (value - 273.15) * 9/5 + 32
-    return value
+def render_result_page(unit_type, from_unit, to_unit, value, precision='float'):
+    # The registry holds every unit type; unknown units or a mismatched pair are unsupported
+    try:
+        if precision == 'exact':
+            result = format_exact(REGISTRY.convert_exact(value, from_unit, to_unit, unit_type))
+        else:
+            result = format_float(REGISTRY.convert(value, from_unit, to_unit, unit_type))
+        # Only pages of known units are kept, so made-up unit names cannot fill the cache, and
+        # no NaN, which never equals itself and so would add an entry on every request
+        cacheable = precision == 'exact' or math.isfinite(value)
+    except UnitError:
+        result = "Unsupported conversion"
+        cacheable = False
+
+    with app.app_context():
+        page = render_template('index.html', units=REGISTRY.dimensions, result=result,
+                               value=format_exact(value) if precision == 'exact' else format_float(value),
+                               from_unit=from_unit, to_unit=to_unit, unit_type=unit_type,
+                               precision=precision).encode('utf-8')
+    if cacheable:
+        RESULT_CACHE.set((unit_type, from_unit, to_unit, value, precision), page)
+    return page
+
+def request_precision():
+    precision = request.args.get('precision', 'float')
+    if precision not in PRECISIONS:
+        abort(400, f"Unknown precision: {precision}. Use one of: {', '.join(PRECISIONS)}.")
+    return precision
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    body, etag = index_page(request_precision())
+    response = Response(body, mimetype='text/html')
+    response.set_etag(etag)
+    response.last_modified = PAGES_MODIFIED
+    # Browsers keep the page but ask every time, and get a 304 while it is unchanged
+    response.cache_control.no_cache = True
+    response.make_conditional(request)
+    if response.status_code == 304:
+        METRICS['not_modified'] += 1
+    return response
 
 @app.route('/convert', methods=['POST'])
 def convert():
-    value = float(request.form['value'])
+    precision = request_precision()
+    try:
+        value = parse_value(request.form['value'], precision)
+    except ValueError as error:
+        abort(400, str(error) if precision == 'exact' else "The value must be a number.")
     from_unit = request.form['from_unit']
     to_unit = request.form['to_unit']
     unit_type = request.form['unit_type']
+    return Response(result_page(unit_type, from_unit, to_unit, value, precision), mimetype='text/html')
 
-    if unit_type == 'length':
-        result = convert_length(value, from_unit, to_unit)
-    elif unit_type == 'weight':
-        result = convert_weight(value, from_unit, to_unit)
-    elif unit_type == 'temperature':
-        result = convert_temperature(value, from_unit, to_unit)
-    else:
-        result = "Unsupported conversion"
+@app.route('/metrics')
+def metrics():
+    return jsonify(results=RESULT_CACHE.stats(), pages=PAGE_CACHE.stats(), **METRICS)
+
+class BatchError(Exception):
+    pass
+
+def read_batch(precision):
+    # JSON: {"unit_type", "from_unit", "to_unit", "values": [...]}
+    # NDJSON: a first line with the units, then one value per line
+    # Binary: little-endian float64 values, with the units in the query string
+    body = request.get_data()
+    if request.mimetype == 'application/octet-stream':
+        if precision == 'exact':
+            raise BatchError("Exact conversions take JSON or NDJSON; float64 values are not exact decimals.")
+        if len(body) % 8:
+            raise BatchError("The body must be a whole number of float64 values.")
+        return request.args, np.frombuffer(body, dtype='<f8')
+    try:
+        if request.mimetype == 'application/x-ndjson':
+            header, _, rest = body.partition(b'\n')
+            params = json.loads(header)
+            values = rest.split()
+        else:
+            # Exact values keep their digits as written, not the float nearest to them
+            params = json.loads(body, parse_float=str if precision == 'exact' else float)
+            values = params['values']
+    except (ValueError, TypeError, KeyError):
+        raise BatchError("Send a JSON object with 'values', NDJSON, or application/octet-stream.") from None
+    if not isinstance(params, dict):
+        raise BatchError("The units must be sent as a JSON object.")
+    # NumPy and Fraction() would read true as 1 and a quoted "2" as 2; exact JSON floats are kept as strings
+    number_types = {int, float, str} if precision == 'exact' else {int, float}
+    if request.mimetype != 'application/x-ndjson' and not (isinstance(values, list)
+                                                            and set(map(type, values)) <= number_types):
+        raise BatchError("'values' must be a flat list of finite numbers.")
+    try:
+        if precision == 'exact':
+            if not isinstance(values, list):
+                raise TypeError
+            values = [parse_exact(value.decode('ascii') if isinstance(value, bytes) else value) for value in values]
+        else:
+            values = np.asarray(values, dtype=np.float64)
+    except ValueError as error:
+        raise BatchError(str(error) if precision == 'exact' else "'values' must be a flat list of finite numbers.") \
+            from None
+    except TypeError:
+        raise BatchError("'values' must be a flat list of finite numbers.") from None
+    if precision == 'float' and (values.ndim != 1 or not np.isfinite(values).all()):
+        raise BatchError("'values' must be a flat list of finite numbers.")
+    return params, values
 
-    return render_template('index.html', result=result, value=value, from_unit=from_unit, to_unit=to_unit)
+def convert_batch(params, values, precision):
+    # The registry converts whole NumPy arrays at once; the unit type is required
+    try:
+        if precision == 'exact':
+            scale, offset = REGISTRY.transform(params.get('from_unit'), params.get('to_unit'),
+                                               str(params.get('unit_type')), exact=True)
+            return [format_exact(value * scale + offset) for value in values]
+        with np.errstate(over='ignore', invalid='ignore'):
+            results = REGISTRY.convert(values, params.get('from_unit'), params.get('to_unit'),
+                                       str(params.get('unit_type')))
+    except UnitError as error:
+        raise BatchError(str(error)) from None
+    # Finite values can still overflow, e.g. 1e308 miles in millimeters, and JSON has no Infinity
+    if not np.isfinite(results).all():
+        raise BatchError("The converted values must be finite; some overflow float64.")
+    return results
+
+def stream_results(mimetype, params, results, precision):
+    chunks = (results[start:start + BATCH_CHUNK_SIZE] for start in range(0, len(results), BATCH_CHUNK_SIZE))
+    if mimetype == 'application/octet-stream':
+        for chunk in chunks:
+            yield chunk.astype('<f8', copy=False).tobytes()
+        return
+    header = {name: params.get(name) for name in ('unit_type', 'from_unit', 'to_unit')}
+    header['precision'] = precision
+    header['count'] = len(results)
+    if mimetype == 'application/x-ndjson':
+        yield json.dumps(header) + '\n'
+        for chunk in chunks:
+            if precision == 'exact':
+                # Exact results are decimal strings already, one number per line
+                yield '\n'.join(chunk) + '\n'
+            else:
+                # json.dumps formats a list of floats in C, far faster than one at a time
+                yield json.dumps(chunk.tolist(), separators=(',', ':'))[1:-1].replace(',', '\n') + '\n'
+        return
+    yield json.dumps(header)[:-1] + ', "results": ['
+    for number, chunk in enumerate(chunks):
+        # Exact results go out as strings, so JSON parsers do not round them to floats
+        chunk = chunk if precision == 'exact' else chunk.tolist()
+        yield (',' if number else '') + json.dumps(chunk, separators=(',', ':'))[1:-1]
+    yield ']}'
+
+@app.route('/api/convert/batch', methods=['POST'])
+def convert_batch_api():
+    request.max_content_length = BATCH_MAX_CONTENT_LENGTH
+    try:
+        precision = request.args.get('precision', 'float')
+        if precision not in PRECISIONS:
+            raise BatchError(f"Unknown precision: {precision}. Use one of: {', '.join(PRECISIONS)}.")
+        params, values = read_batch(precision)
+        results = convert_batch(params, values, precision)
+    except BatchError as error:
+        return jsonify(error=str(error)), 400
+    if precision == 'float':
+        # Constant results, e.g. converting a unit to itself, still come back one per value
+        results = np.broadcast_to(np.asarray(results, dtype=np.float64), values.shape)
+    mimetype = request.mimetype if request.mimetype in ('application/octet-stream', 'application/x-ndjson') \
+        else 'application/json'
+    return Response(stream_results(mimetype, params, results, precision), mimetype=mimetype)
+
+def benchmark(single_requests=2000, batch_size=1000000):
+    # Values per second through the single-value form route and the batch API, in process
+    client = app.test_client()
+    rng = np.random.default_rng(7)
+    start = time.perf_counter()
+    for value in rng.uniform(-50, 150, single_requests).tolist():
+        client.post('/convert', data={'value': value, 'unit_type': 'temperature',
+                                      'from_unit': 'Celsius', 'to_unit': 'Fahrenheit'})
+    elapsed = time.perf_counter() - start
+    print(f"{'/convert (one value per request)':>36}: {single_requests / elapsed:>12,.0f} values/sec")
+
+    values = rng.uniform(-50, 150, batch_size)
+    # Exact conversions run one value at a time in Python, so time a tenth as many
+    decimals = values[:batch_size // 10].round(6).tolist()
+    units = {'unit_type': 'temperature', 'from_unit': 'Celsius', 'to_unit': 'Fahrenheit'}
+    bodies = [
+        ('JSON', 'float', 'application/json', batch_size, json.dumps(dict(units, values=values.tolist()))),
+        ('NDJSON', 'float', 'application/x-ndjson', batch_size,
+         json.dumps(units) + '\n' + '\n'.join(map(repr, values.tolist()))),
+        ('binary float64', 'float', 'application/octet-stream', batch_size, values.astype('<f8').tobytes()),
+        ('JSON, exact', 'exact', 'application/json', len(decimals), json.dumps(dict(units, values=decimals))),
+        ('NDJSON, exact', 'exact', 'application/x-ndjson', len(decimals),
+         json.dumps(units) + '\n' + '\n'.join(map(repr, decimals))),
+    ]
+    for name, precision, content_type, count, body in bodies:
+        query = dict(units) if content_type == 'application/octet-stream' else {}
+        query['precision'] = precision
+        start = time.perf_counter()
+        response = client.post('/api/convert/batch', data=body, content_type=content_type, query_string=query)
+        response.get_data()
+        elapsed = time.perf_counter() - start
+        print(f"{'/api/convert/batch, ' + name:>36}: {count / elapsed:>12,.0f} values/sec")
+
+def load_test(requests=20000, distinct=500, seed=11):
+    # Requests per second for a repeating mix of page loads, revalidations and
+    # conversions, with the caches off and then on, in process
+    client = app.test_client()
+    rng = np.random.default_rng(seed)
+    units = REGISTRY.dimensions
+    forms = []
+    for _ in range(distinct):
+        unit_type = rng.choice(list(units))
+        from_unit, to_unit = rng.choice([unit for unit, _ in units[unit_type]], 2)
+        forms.append({'unit_type': unit_type, 'from_unit': from_unit, 'to_unit': to_unit,
+                      'value': int(rng.integers(1, 1000))})
+    # Popular conversions come up far more often than the rest, like real traffic
+    picks = np.minimum(rng.zipf(1.3, requests), distinct) - 1
+    kinds = rng.choice(['page', 'revalidate', 'convert'], requests, p=[0.2, 0.2, 0.6])
+    etag = client.get('/').headers['ETag']
+
+    sizes = {cache: cache.maxsize for cache in (RESULT_CACHE, PAGE_CACHE)}
+    for caching in (False, True):
+        for cache, maxsize in sizes.items():
+            cache.clear()
+            cache.maxsize = maxsize if caching else 0
+        METRICS.clear()
+        start = time.perf_counter()
+        for kind, pick in zip(kinds.tolist(), picks.tolist()):
+            if kind == 'page':
+                client.get('/')
+            elif kind == 'revalidate':
+                client.get('/', headers={'If-None-Match': etag})
+            else:
+                client.post('/convert', data=forms[pick])
+        elapsed = time.perf_counter() - start
+        stats = RESULT_CACHE.stats()
+        print(f"{'caching ' + ('on' if caching else 'off'):>12}: {requests / elapsed:>8,.0f} requests/sec, "
+              f"result hit rate {stats['hit_rate']:.0%}, {METRICS['not_modified']} not modified")
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    if sys.argv[1:] == ['benchmark']:
+        benchmark()
+    elif sys.argv[1:] == ['loadtest']:
+        load_test()
+    else:
+        # The development server; serve.py runs the app in production
+        app.run(debug=True)
@@ -0,0 +1,115 @@
+"""
+Response Cache
+
+Description:
+A thread-safe LRU cache with an optional time to live, used by the Unit
+Converter to keep the pages it rendered for recent requests. Entries live in
+an OrderedDict in order of last use, so a lookup, an insert and evicting the
+least recently used entry are all O(1). Every cache counts its hits, misses,
+evictions and expirations for the /metrics route.
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    from cache import LRUCache
+    pages = LRUCache(maxsize=1024, ttl=3600)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    A cache of at most maxsize entries that drops the least recently used one
+    when full, and entries older than ttl seconds on their next lookup.
+
+    Args:
+        maxsize (int, optional): The most entries kept; 0 keeps none, which
+                                 turns the cache off. Defaults to 1024.
+        ttl (float, optional): Seconds an entry stays valid after it is set.
+                               Defaults to None, forever.
+        clock (callable, optional): The time source. Defaults to time.monotonic.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """
+        Look up an entry and mark it as the most recently used.
+
+        Args:
+            key (hashable): The key.
+            default (optional): Returned on a miss. Defaults to None.
+
+        Returns:
+            The cached value, or default if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """
+        Add or replace an entry, evicting the least recently used one if the cache is full.
+
+        Args:
+            key (hashable): The key.
+            value: The value.
+
+        Returns:
+            None
+        """
+        if self.maxsize <= 0:
+            return
+        expires = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drop every entry and reset the counters.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self):
+        """
+        Get the size and counters of the cache.
+
+        Returns:
+            dict: 'size', 'maxsize', 'ttl', 'hits', 'misses', 'evictions',
+                  'expirations' and 'hit_rate', the share of lookups that hit.
+        """
+        lookups = self.hits + self.misses
+        return {'size': len(self._entries), 'maxsize': self.maxsize, 'ttl': self.ttl,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'expirations': self.expirations, 'hit_rate': self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,848 @@
+"""
+Unit Converter Server
+
+Description:
+Production serving mode for the Unit Converter, in place of the Werkzeug
+development server that app.run(debug=True) starts. It has three parts:
+
+- application: an ASGI app. It answers / and /convert on the event loop from
+  the page caches of app.py, and static assets from memory with ETags. Jinja
+  only renders a page the first time it is asked for. Every other route, such
+  as the batch API or /metrics, runs through the Flask app on a thread.
+- ASGIServer: an asyncio HTTP/1.1 server for one worker process, with
+  keep-alive connections. On SIGTERM it stops accepting, closes idle
+  connections and lets the requests in flight finish.
+- serve(): a launcher that binds the port once and starts worker processes
+  that share it. A worker that dies is started again, after a delay that
+  doubles each time workers exit soon after starting. SIGHUP reloads
+  gracefully: a new set of workers is started from the current code, and the
+  old ones are stopped only once the new ones are serving, so no request is
+  dropped. If the new code fails to start, the old workers keep serving.
+
+The load generator drives the development server and the workers with the same
+mix of requests and reports requests per second and p99 latency.
+
+Needs a POSIX system for the shared socket and the signals. The application
+runs under any ASGI server too, e.g. uvicorn serve:application.
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python serve.py --port 8000 serve --workers 4    # kill -HUP <pid> to reload
+    python serve.py loadtest                         # development server against the workers
+"""
+
+import argparse
+import asyncio
+import email.utils
+import hashlib
+import mimetypes
+import os
+import random
+import select
+import signal
+import socket
+import subprocess
+import sys
+import time
+import traceback
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote
+
+from werkzeug.test import EnvironBuilder, run_wsgi_app
+
+from app import (BATCH_MAX_CONTENT_LENGTH, METRICS, PAGES_MODIFIED, PRECISIONS, app, cached_result_page,
+                 index_page, parse_value, render_result_page)
+from units import REGISTRY
+
+# Largest request body accepted, in bytes, the same as the Flask app
+MAX_BODY_SIZE = app.config['MAX_CONTENT_LENGTH']
+
+# Largest body of a batch request, the same as the batch route of the Flask app
+MAX_BATCH_BODY_SIZE = BATCH_MAX_CONTENT_LENGTH
+
+# Path of the batch API, allowed the larger bodies
+BATCH_PATH = '/api/convert/batch'
+
+# Seconds an idle keep-alive connection stays open
+KEEP_ALIVE_TIMEOUT = 30
+
+# Seconds a stopped worker has to finish the requests in flight
+GRACEFUL_TIMEOUT = 30
+
+# Seconds a new worker has to start serving before a start or reload is given up
+WORKER_START_TIMEOUT = 10
+
+# Seconds before a worker that exited is started again, doubled for every
+# worker in a row that exits within STABLE_WORKER_SECONDS of starting
+RESPAWN_DELAY = 0.1
+
+# Longest delay before a worker that exited is started again, in seconds
+MAX_RESPAWN_DELAY = 30
+
+# Seconds a worker has to run for its exit not to count as a failed start
+STABLE_WORKER_SECONDS = 10
+
+HTML = b'text/html; charset=utf-8'
+
+
+class HTTPError(Exception):
+    """
+    Error answered by the server with an HTTP error status, before the app is called.
+
+    Args:
+        status (HTTPStatus): The HTTP status of the response.
+        message (str): The error message.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def load_static(folder, url_path):
+    """
+    Read every static asset into memory once, so they are served without touching the disk.
+
+    Args:
+        folder (str): The static folder of the app.
+        url_path (str): The URL the folder is served under, e.g. '/static'.
+
+    Returns:
+        dict: The body, ETag and content type of every asset, by URL path.
+    """
+    assets = {}
+    if not os.path.isdir(folder):
+        return assets
+    for root, _, names in os.walk(folder):
+        for name in names:
+            path = os.path.join(root, name)
+            with open(path, 'rb') as asset_file:
+                body = asset_file.read()
+            content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            if content_type.startswith('text/'):
+                content_type += '; charset=utf-8'
+            url = url_path + '/' + os.path.relpath(path, folder).replace(os.sep, '/')
+            assets[url] = (body, hashlib.sha1(body).hexdigest(), content_type.encode('ascii'))
+    return assets
+
+
+STATIC_ASSETS = load_static(app.static_folder, app.static_url_path)
+
+
+def is_not_modified(headers, etag, modified=None):
+    """
+    Check the conditional headers of a request against a response.
+
+    Args:
+        headers (dict): The request headers, lowercased bytes names.
+        etag (str): The ETag of the response, without quotes.
+        modified (int, optional): The Last-Modified time of the response.
+                                  Defaults to None.
+
+    Returns:
+        bool: True if the client's copy is current and a 304 will do.
+    """
+    match = headers.get(b'if-none-match')
+    if match is not None:
+        tags = [tag.strip().removeprefix(b'W/') for tag in match.split(b',')]
+        return b'*' in tags or f'"{etag}"'.encode('ascii') in tags
+    since = headers.get(b'if-modified-since')
+    if since is not None and modified is not None:
+        try:
+            return email.utils.parsedate_to_datetime(since.decode('latin-1')).timestamp() >= modified
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def respond(send, status, body=b'', headers=()):
+    await send({'type': 'http.response.start', 'status': status, 'headers': list(headers)})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def respond_cached(send, request_headers, body, etag, content_type, modified=None):
+    # Clients keep the response but ask every time, and get a 304 while it is unchanged
+    headers = [(b'content-type', content_type), (b'etag', f'"{etag}"'.encode('ascii')),
+               (b'cache-control', b'no-cache')]
+    if modified is not None:
+        headers.append((b'last-modified', email.utils.formatdate(modified, usegmt=True).encode('ascii')))
+    if is_not_modified(request_headers, etag, modified):
+        METRICS['not_modified'] += 1
+        await respond(send, HTTPStatus.NOT_MODIFIED, b'', headers)
+    else:
+        await respond(send, HTTPStatus.OK, body, headers)
+
+
+async def read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def call_flask(scope, receive, send):
+    # Routes without an async handler run through the WSGI app on a thread. The
+    # response is streamed, one item of the WSGI iterator at a time, so a large
+    # batch response is never held in memory whole
+    environ = EnvironBuilder(
+        path=scope['path'], method=scope['method'], query_string=scope['query_string'].decode('latin-1'),
+        headers=[(name.decode('latin-1'), value.decode('latin-1')) for name, value in scope['headers']],
+        data=await read_body(receive)).get_environ()
+    loop = asyncio.get_running_loop()
+    app_iter, status, headers = await loop.run_in_executor(None, run_wsgi_app, app, environ)
+    try:
+        await send({'type': 'http.response.start', 'status': int(status.split(' ', 1)[0]),
+                    'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                for name, value in headers.to_wsgi_list()]})
+        chunks = iter(app_iter)
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                break
+            if chunk:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        if hasattr(app_iter, 'close'):
+            await loop.run_in_executor(None, app_iter.close)
+
+
+async def application(scope, receive, send):
+    """
+    The Unit Converter as an ASGI app.
+
+    Args:
+        scope (dict): The ASGI connection scope.
+        receive (callable): Awaitable that returns the next ASGI event.
+        send (callable): Awaitable that sends an ASGI event.
+
+    Returns:
+        None
+    """
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Render the index page before the first request
+                index_page()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+
+    path, method = scope['path'], scope['method']
+    headers = dict(scope['headers'])
+    if path in ('/', '/convert'):
+        precision = parse_qs(scope['query_string'].decode('latin-1')).get('precision', ['float'])[0]
+        if precision not in PRECISIONS:
+            await respond(send, HTTPStatus.BAD_REQUEST,
+                          f"Unknown precision: {precision}. Use one of: {', '.join(PRECISIONS)}.".encode('utf-8'),
+                          [(b'content-type', b'text/plain; charset=utf-8')])
+            return
+    if path == '/' and method in ('GET', 'HEAD'):
+        body, etag = index_page(precision)
+        await respond_cached(send, headers, body, etag, HTML, PAGES_MODIFIED)
+    elif path == '/convert' and method == 'POST':
+        form = parse_qs((await read_body(receive)).decode('utf-8', 'replace'))
+        try:
+            value = parse_value(form['value'][0], precision)
+            unit_type, from_unit, to_unit = (form[name][0] for name in ('unit_type', 'from_unit', 'to_unit'))
+        except (KeyError, ValueError):
+            await respond(send, HTTPStatus.BAD_REQUEST, b"Send a value, unit_type, from_unit and to_unit.",
+                          [(b'content-type', b'text/plain; charset=utf-8')])
+            return
+        page = cached_result_page(unit_type, from_unit, to_unit, value, precision)
+        if page is None:
+            # Converting and rendering, exact conversions above all, would hold up the event loop
+            page = await asyncio.get_running_loop().run_in_executor(
+                None, render_result_page, unit_type, from_unit, to_unit, value, precision)
+        await respond(send, HTTPStatus.OK, page, [(b'content-type', HTML)])
+    elif path in STATIC_ASSETS and method in ('GET', 'HEAD'):
+        body, etag, content_type = STATIC_ASSETS[path]
+        await respond_cached(send, headers, body, etag, content_type)
+    else:
+        await call_flask(scope, receive, send)
+
+
+def build_response(status, message, keep_alive=False):
+    """
+    Encode a plain-text HTTP/1.1 error response, for requests the app never sees.
+
+    Args:
+        status (HTTPStatus): The response status.
+        message (str): The body.
+        keep_alive (bool, optional): Whether the connection stays open. Defaults to False.
+
+    Returns:
+        bytes: The complete response.
+    """
+    body = message.encode('utf-8')
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: text/plain; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('ascii') + body
+
+
+async def read_request(reader):
+    """
+    Read one HTTP request from a connection.
+
+    Args:
+        reader (asyncio.StreamReader): The connection.
+
+    Returns:
+        tuple or None: The method, target, HTTP version, headers as
+                       (lowercased name, value) bytes pairs, and body, or None
+                       when the client closed the connection.
+
+    Raises:
+        HTTPError: If the request is malformed or its body is too large.
+    """
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Request headers are too large.")
+    lines = head[:-4].split(b'\r\n')
+    try:
+        method, target, version = lines[0].decode('latin-1').split(' ')
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+    headers = []
+    for line in lines[1:]:
+        name, _, value = line.partition(b':')
+        headers.append((name.strip().lower(), value.strip()))
+    fields = dict(headers)
+    if b'transfer-encoding' in fields:
+        raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "Send the request body with a Content-Length.")
+    length = fields.get(b'content-length', b'0')
+    # int() would take '-5', '+5' or ' 5 ', and a negative length breaks readexactly()
+    if not length.isdigit():
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+    length = int(length)
+    if length > (MAX_BATCH_BODY_SIZE if target.partition('?')[0] == BATCH_PATH else MAX_BODY_SIZE):
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "The request body is too large.")
+    body = await reader.readexactly(length) if length else b''
+    return method, target, version, headers, body
+
+
+class ASGIServer:
+    """
+    asyncio HTTP/1.1 server running an ASGI app in one worker process.
+
+    Args:
+        application (callable): The ASGI app.
+        sock (socket.socket): The listening socket, shared with the other workers.
+
+    Note:
+        Requests of a connection are answered one after another. A response
+        without a Content-Length is sent in chunks if the app streams it.
+    """
+
+    def __init__(self, application, sock):
+        self.application = application
+        self.sock = sock
+        self._connections = set()
+        self._idle = set()
+        self._closing = False
+
+    async def serve(self, on_ready=None):
+        """
+        Serve until SIGTERM or SIGINT, then finish the requests in flight.
+
+        Args:
+            on_ready (callable, optional): Called once the worker accepts
+                                           connections. Defaults to None.
+
+        Returns:
+            None
+        """
+        loop = asyncio.get_running_loop()
+        stopped = asyncio.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stopped.set)
+        server = await asyncio.start_server(self.handle_connection, sock=self.sock)
+        if on_ready is not None:
+            on_ready()
+        await stopped.wait()
+
+        # Stop accepting, drop the connections waiting for a next request and
+        # let the others finish the one they are answering
+        self._closing = True
+        server.close()
+        for task in list(self._idle):
+            task.cancel()
+        if self._connections:
+            await asyncio.wait(list(self._connections), timeout=GRACEFUL_TIMEOUT)
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve the requests of one connection until it is closed.
+
+        Args:
+            reader (asyncio.StreamReader): The incoming stream.
+            writer (asyncio.StreamWriter): The outgoing stream.
+
+        Returns:
+            None
+        """
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while not self._closing:
+                self._idle.add(task)
+                try:
+                    request = await asyncio.wait_for(read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as error:
+                    writer.write(build_response(error.status, error.message))
+                    break
+                finally:
+                    self._idle.discard(task)
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                connection = dict(headers).get(b'connection', b'').lower()
+                keep_alive = (not self._closing and connection != b'close'
+                              and (version == 'HTTP/1.1' or connection == b'keep-alive'))
+                if not await self.run(request, writer, keep_alive):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def run(self, request, writer, keep_alive):
+        """
+        Answer one request through the ASGI app.
+
+        Args:
+            request (tuple): The request returned by read_request().
+            writer (asyncio.StreamWriter): The outgoing stream.
+            keep_alive (bool): Whether the connection stays open after the response.
+
+        Returns:
+            bool: True if the connection can take another request.
+        """
+        method, target, version, headers, body = request
+        path, _, query = target.partition('?')
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': version.partition('/')[2],
+            'method': method, 'scheme': 'http', 'path': unquote(path), 'raw_path': path.encode('latin-1'),
+            'query_string': query.encode('latin-1'), 'root_path': '', 'headers': headers,
+            'client': writer.get_extra_info('peername'), 'server': writer.get_extra_info('sockname'),
+        }
+        pending = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        response = {}
+
+        async def receive():
+            return pending.pop() if pending else {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = HTTPStatus(message['status'])
+                response['headers'] = list(message.get('headers', []))
+                return
+            data, more = message.get('body', b''), message.get('more_body', False)
+            if 'chunked' not in response:
+                names = {name.lower() for name, _ in response['headers']}
+                # A streamed body of unknown length is sent in chunks; a single one gets its length
+                response['chunked'] = more and b'content-length' not in names
+                if response['chunked']:
+                    response['headers'].append((b'transfer-encoding', b'chunked'))
+                elif b'content-length' not in names and response['status'] not in (204, 304):
+                    response['headers'].append((b'content-length', str(len(data)).encode('ascii')))
+                status = response['status']
+                head = [f"HTTP/1.1 {status.value} {status.phrase}".encode('ascii')]
+                head += [name + b': ' + value for name, value in response['headers']]
+                head.append(b'connection: ' + (b'keep-alive' if keep_alive else b'close'))
+                writer.write(b'\r\n'.join(head) + b'\r\n\r\n')
+            if method != 'HEAD':
+                if response['chunked']:
+                    if data:
+                        writer.write(b'%x\r\n%b\r\n' % (len(data), data))
+                    if not more:
+                        writer.write(b'0\r\n\r\n')
+                else:
+                    writer.write(data)
+            await writer.drain()
+
+        try:
+            await self.application(scope, receive, send)
+        except Exception:
+            traceback.print_exc()
+            if 'chunked' in response:
+                # The response has started, so the only way to signal the error is to close
+                return False
+            writer.write(build_response(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error."))
+            return False
+        if 'chunked' not in response:
+            writer.write(build_response(HTTPStatus.INTERNAL_SERVER_ERROR, "The app sent no response."))
+            return False
+        return keep_alive
+
+
+def run_worker(fd, ready_fd=None):
+    """
+    Serve the application on a listening socket inherited from the launcher.
+
+    Args:
+        fd (int): The file descriptor of the listening socket.
+        ready_fd (int, optional): A pipe to write to once serving. Defaults to None.
+
+    Returns:
+        None
+    """
+    sock = socket.socket(fileno=fd)
+    index_page()
+
+    def ready():
+        if ready_fd is not None:
+            try:
+                os.write(ready_fd, b'1')
+            except BrokenPipeError:
+                # The launcher gave up waiting and is stopping this worker
+                pass
+            os.close(ready_fd)
+
+    asyncio.run(ASGIServer(application, sock).serve(ready))
+
+
+def _spawn_worker(sock, ready=True):
+    # With ready, also return a pipe the worker writes to once it serves
+    command = [sys.executable, os.path.abspath(__file__), 'worker', '--fd', str(sock.fileno())]
+    if not ready:
+        return subprocess.Popen(command, pass_fds=(sock.fileno(),)), None
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen(command + ['--ready-fd', str(write_fd)], pass_fds=(sock.fileno(), write_fd))
+    os.close(write_fd)
+    return process, read_fd
+
+
+def _start_workers(sock, count):
+    # Start a set of workers and wait until every one of them serves, or give up
+    spawned = [_spawn_worker(sock) for _ in range(count)]
+    waiting = {read_fd: process for process, read_fd in spawned}
+    deadline = time.monotonic() + WORKER_START_TIMEOUT
+    ready = True
+    while waiting and ready:
+        readable, _, _ = select.select(list(waiting), [], [], max(deadline - time.monotonic(), 0))
+        if not readable:
+            ready = False
+        for read_fd in readable:
+            # A worker that died before serving closes its end without writing
+            ready = ready and os.read(read_fd, 1) == b'1'
+            os.close(read_fd)
+            del waiting[read_fd]
+    for read_fd in waiting:
+        os.close(read_fd)
+    workers = [process for process, _ in spawned]
+    if not ready:
+        _stop_workers(workers)
+        return None
+    return workers
+
+
+def _respawn_delay(failures):
+    # Exponential backoff, so a worker that cannot start is not respawned in a tight loop
+    return min(RESPAWN_DELAY * 2 ** min(failures, 32), MAX_RESPAWN_DELAY)
+
+
+def _stop_workers(workers, wait=True):
+    for process in workers:
+        if process.poll() is None:
+            process.send_signal(signal.SIGTERM)
+    if wait:
+        for process in workers:
+            try:
+                process.wait(GRACEFUL_TIMEOUT + 5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def serve(host='127.0.0.1', port=8000, workers=None):
+    """
+    Serve the Unit Converter from several worker processes until SIGTERM or
+    SIGINT, reloading gracefully on SIGHUP.
+
+    Args:
+        host (str, optional): The interface to listen on. Defaults to '127.0.0.1'.
+        port (int, optional): The port to listen on. Defaults to 8000.
+        workers (int, optional): The number of worker processes. Defaults to
+                                 None, one per CPU.
+
+    Returns:
+        None
+    """
+    workers = workers or os.cpu_count() or 1
+    sock = socket.create_server((host, port), backlog=2048)
+    events = []
+    signal.signal(signal.SIGHUP, lambda signum, frame: events.append('reload'))
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda signum, frame: events.append('stop'))
+
+    current = _start_workers(sock, workers)
+    if current is None:
+        print("The workers could not start.")
+        return
+    print(f"Unit converter listening on http://{host}:{port} with {workers} workers (pid {os.getpid()})")
+    retiring = []
+    # Per slot: when its worker started, its failed starts in a row, and when to start it again
+    started = [time.monotonic()] * workers
+    failures = [0] * workers
+    restart_at = [None] * workers
+    while 'stop' not in events:
+        if 'reload' in events:
+            events.remove('reload')
+            fresh = _start_workers(sock, workers)
+            if fresh is None:
+                print("Reload failed: the new workers could not start. The old workers keep serving.")
+            else:
+                # The new workers share the socket already, so the old ones can stop accepting
+                _stop_workers(current, wait=False)
+                retiring += current
+                current = fresh
+                started = [time.monotonic()] * workers
+                failures = [0] * workers
+                restart_at = [None] * workers
+                print(f"Reloaded with {workers} new workers.")
+        now = time.monotonic()
+        for slot, process in enumerate(current):
+            if 'stop' in events:
+                break
+            if restart_at[slot] is None and process.poll() is not None:
+                if now - started[slot] < STABLE_WORKER_SECONDS:
+                    failures[slot] += 1
+                else:
+                    failures[slot] = 0
+                delay = _respawn_delay(failures[slot])
+                restart_at[slot] = now + delay
+                print(f"Worker {process.pid} exited with {process.returncode}; starting another in {delay:.1f}s.")
+            if restart_at[slot] is not None and now >= restart_at[slot]:
+                current[slot], _ = _spawn_worker(sock, ready=False)
+                started[slot] = now
+                restart_at[slot] = None
+        retiring = [process for process in retiring if process.poll() is None]
+        time.sleep(0.1)
+
+    _stop_workers(current + retiring)
+    sock.close()
+
+
+def _http_request(method, path, host, headers=(), body=b''):
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {host}", *headers]
+    if body:
+        lines.append(f"Content-Length: {len(body)}")
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('ascii') + body
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head[9:12])
+    headers = {}
+    for line in head[:-4].split(b'\r\n')[1:]:
+        name, _, value = line.partition(b':')
+        headers[name.strip().lower()] = value.strip()
+    if b'content-length' in headers:
+        await reader.readexactly(int(headers[b'content-length']))
+    elif headers.get(b'transfer-encoding') == b'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    elif status not in (204, 304):
+        await reader.read()
+        return status, False
+    return status, headers.get(b'connection', b'').lower() != b'close'
+
+
+async def _client(host, port, requests, forms, etag, latencies, errors, rng):
+    reader = writer = None
+    try:
+        for _ in range(requests):
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            kind = rng.random()
+            if kind < 0.2:
+                request = _http_request('GET', '/', host)
+            elif kind < 0.4:
+                request = _http_request('GET', '/', host, [f"If-None-Match: {etag}"])
+            elif kind < 0.5:
+                request = _http_request('GET', rng.choice(('/static/style.css', '/static/converter.js')), host)
+            else:
+                # Popular conversions come up far more often than the rest
+                form = forms[min(int(rng.paretovariate(1.0)), len(forms)) - 1]
+                request = _http_request('POST', '/convert', host,
+                                        ["Content-Type: application/x-www-form-urlencoded"], form)
+            start = time.perf_counter()
+            try:
+                writer.write(request)
+                status, keep_alive = await _read_response(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # A server may close an idle keep-alive connection just as a request is
+                # sent, e.g. a worker stopping on reload; like browsers, retry once on a new one
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+                writer.write(request)
+                status, keep_alive = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status not in (200, 304):
+                errors.append(status)
+            if not keep_alive:
+                writer.close()
+                reader = writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def load_test(host='127.0.0.1', port=8000, connections=50, requests=20000, distinct=500, seed=5):
+    """
+    Drive a running Unit Converter with keep-alive connections and report throughput and latency.
+
+    The requests are 20% page loads, 20% page revalidations with an ETag, 10%
+    static assets and 50% conversions drawn from a few hundred, the popular
+    ones far more often.
+
+    Args:
+        host (str): The host of the server.
+        port (int): The port of the server.
+        connections (int): The number of concurrent keep-alive connections.
+        requests (int): The total number of requests.
+        distinct (int): The number of different conversions asked for.
+        seed (int): Seed for the random generators, for repeatable runs.
+
+    Returns:
+        dict: 'requests_per_sec', 'p50_ms', 'p99_ms' and 'errors'.
+    """
+    rng = random.Random(seed)
+    units = {dimension: [unit for unit, _ in names] for dimension, names in REGISTRY.dimensions.items()}
+    forms = []
+    for _ in range(distinct):
+        unit_type = rng.choice(list(units))
+        from_unit, to_unit = rng.sample(units[unit_type], 2)
+        forms.append(f"value={rng.randint(1, 1000)}&unit_type={unit_type}&from_unit={from_unit}"
+                     f"&to_unit={to_unit}".encode('ascii'))
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(_http_request('GET', '/', host))
+    head = await reader.readuntil(b'\r\n\r\n')
+    etag = [line.split(b':', 1)[1].strip() for line in head.split(b'\r\n') if line.lower().startswith(b'etag:')]
+    writer.close()
+
+    latencies = []
+    errors = []
+    per_connection = max(requests // connections, 1)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, per_connection, forms, etag[0].decode('ascii') if etag else '""', latencies, errors,
+                random.Random(seed + i))
+        for i in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000,
+        'errors': len(errors),
+    }
+
+
+def _wait_for_port(host, port, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1.0).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"The server did not start on {host}:{port}")
+
+
+def compare(host='127.0.0.1', port=8000, workers=None, connections=50, requests=20000):
+    """
+    Run the load test against the development server and then the workers,
+    each started on its own port for the test.
+
+    Args:
+        host (str): The interface the servers listen on.
+        port (int): The port of the development server; the workers use the next one.
+        workers (int): The number of worker processes. Defaults to None, one per CPU.
+        connections (int): The number of concurrent keep-alive connections.
+        requests (int): The total number of requests per server.
+
+    Returns:
+        None
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    servers = [
+        # What app.py runs, without the reloader's second process
+        ("Werkzeug dev server", port, [sys.executable, '-c', f"from app import app; "
+                                       f"app.run({host!r}, {port}, debug=True, use_reloader=False)"]),
+        (f"ASGI workers ({workers or os.cpu_count()})", port + 1,
+         [sys.executable, os.path.join(here, 'serve.py'), '--host', host, '--port', str(port + 1), 'serve']
+         + (['--workers', str(workers)] if workers else [])),
+    ]
+    print(f"{requests} requests over {connections} connections")
+    for name, server_port, command in servers:
+        server = subprocess.Popen(command, cwd=here, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            _wait_for_port(host, server_port)
+            result = asyncio.run(load_test(host, server_port, connections, requests))
+            print(f"{name:>22}: {result['requests_per_sec']:>8,.0f} req/sec, p50 {result['p50_ms']:6.2f} ms, "
+                  f"p99 {result['p99_ms']:6.2f} ms, {result['errors']} errors")
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait()
+
+
+def main(argv=None):
+    """
+    Run the server, a worker or the load test from the command line.
+
+    Args:
+        argv (list, optional): The command-line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Unit Converter production server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help="serve with several worker processes")
+    serve_parser.add_argument('--workers', type=int, default=None, help="defaults to one per CPU")
+
+    worker_parser = commands.add_parser('worker', help=argparse.SUPPRESS)
+    worker_parser.add_argument('--fd', type=int, required=True)
+    worker_parser.add_argument('--ready-fd', type=int, default=None)
+
+    load_parser = commands.add_parser('loadtest', help="compare the development server with the workers")
+    load_parser.add_argument('--workers', type=int, default=None)
+    load_parser.add_argument('--connections', type=int, default=50)
+    load_parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args.host, args.port, args.workers)
+    elif args.command == 'worker':
+        run_worker(args.fd, args.ready_fd)
+    else:
+        compare(args.host, args.port, args.workers, args.connections, args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+// Fill the unit lists with the units of the selected unit type, from the page's `units`
+function updateUnits() {
+    const unitType = document.getElementById('unit_type').value;
+    const fromUnit = document.getElementById('from_unit');
+    const toUnit = document.getElementById('to_unit');
+
+    const options = (units[unitType] || []).map(
+        ([value, label]) => `<option value="${value}">${label}</option>`
+    ).join('');
+
+    fromUnit.innerHTML = options;
+    toUnit.innerHTML = options;
+}
@@ -0,0 +1,538 @@
+"""
+Unit Registry
+
+Description:
+Registry of the units known to the Unit Converter. Every unit is defined
+declaratively by how much of another unit of the same dimension it is:
+
+    1 <unit> = <factor> <reference> + <offset>
+
+e.g. 1 foot = 12 inch, or 1 Fahrenheit = 5/9 Celsius - 160/9. The definitions
+of a dimension form a graph, which is walked breadth-first from the first unit
+of the dimension when the registry is built, composing the affine transforms
+along the way. Every pair of units of a dimension then gets its transform,
+value * scale + offset, precomputed in a matrix, so a conversion is one
+dictionary lookup and one multiply-add, for single values and NumPy arrays.
+
+Transforms are composed with exact fractions, so a chain like
+mile -> yard -> foot -> inch -> millimeter gives exactly 1609344, and each
+scale and offset is rounded to a float only once. convert_exact() uses the
+exact transforms themselves, for results with no rounding at all, at about a
+tenth of the speed of the float path.
+
+Adding a unit or a whole dimension is one more entry in DEFINITIONS.
+
+Author: Girish Sai Thiruvidhulla
+Github URL : https://github.com/girishSaiWork/BegineerPythonProjects
+
+Usage:
+    python units.py    # time the per-call overhead of conversions, in float and exact precision
+"""
+
+import time
+from collections import deque
+from decimal import Decimal, Inexact, localcontext
+from fractions import Fraction
+
+import numpy as np
+
+# Significant digits of an exact result that has no finite decimal form, as in decimal128
+EXACT_DIGITS = 34
+
+# Significant digits of a float result shown to users; a float holds 15 reliably
+FLOAT_DIGITS = 15
+
+# Most digits and largest power of ten of an exact input; 1e2000000 would take minutes to convert
+MAX_EXACT_DIGITS = 1000
+MAX_EXACT_EXPONENT = 1000
+
+# (dimension, unit, label, factor, reference, offset): 1 unit = factor * reference + offset.
+# The first unit of a dimension is its base and has no reference.
+DEFINITIONS = [
+    ('length', 'millimeter', 'Millimeter', 1, None, 0),
+    ('length', 'centimeter', 'Centimeter', 10, 'millimeter', 0),
+    ('length', 'meter', 'Meter', 1000, 'millimeter', 0),
+    ('length', 'kilometer', 'Kilometer', 1000, 'meter', 0),
+    ('length', 'inch', 'Inch', '25.4', 'millimeter', 0),
+    ('length', 'foot', 'Foot', 12, 'inch', 0),
+    ('length', 'yard', 'Yard', 3, 'foot', 0),
+    ('length', 'mile', 'Mile', 1760, 'yard', 0),
+
+    ('weight', 'milligram', 'Milligram', 1, None, 0),
+    ('weight', 'gram', 'Gram', 1000, 'milligram', 0),
+    ('weight', 'kilogram', 'Kilogram', 1000, 'gram', 0),
+    ('weight', 'ounce', 'Ounce', '28349.5', 'milligram', 0),
+    ('weight', 'pound', 'Pound', 453592, 'milligram', 0),
+    ('weight', 'lbs', 'Lbs', 1, 'pound', 0),
+
+    ('temperature', 'Celsius', 'Celsius', 1, None, 0),
+    ('temperature', 'Fahrenheit', 'Fahrenheit', '5/9', 'Celsius', '-160/9'),
+    ('temperature', 'Kelvin', 'Kelvin', 1, 'Celsius', '-273.15'),
+
+    ('volume', 'milliliter', 'Milliliter', 1, None, 0),
+    ('volume', 'liter', 'Liter', 1000, 'milliliter', 0),
+    ('volume', 'cubic_meter', 'Cubic meter', 1000, 'liter', 0),
+    ('volume', 'teaspoon', 'Teaspoon (US)', '4.92892159375', 'milliliter', 0),
+    ('volume', 'tablespoon', 'Tablespoon (US)', 3, 'teaspoon', 0),
+    ('volume', 'fluid_ounce', 'Fluid ounce (US)', 2, 'tablespoon', 0),
+    ('volume', 'cup', 'Cup (US)', 8, 'fluid_ounce', 0),
+    ('volume', 'pint', 'Pint (US)', 2, 'cup', 0),
+    ('volume', 'quart', 'Quart (US)', 2, 'pint', 0),
+    ('volume', 'gallon', 'Gallon (US)', 4, 'quart', 0),
+
+    ('area', 'square_meter', 'Square meter', 1, None, 0),
+    ('area', 'square_centimeter', 'Square centimeter', '1/10000', 'square_meter', 0),
+    ('area', 'square_kilometer', 'Square kilometer', 1000000, 'square_meter', 0),
+    ('area', 'hectare', 'Hectare', 10000, 'square_meter', 0),
+    ('area', 'square_foot', 'Square foot', '0.09290304', 'square_meter', 0),
+    ('area', 'square_inch', 'Square inch', '1/144', 'square_foot', 0),
+    ('area', 'square_yard', 'Square yard', 9, 'square_foot', 0),
+    ('area', 'acre', 'Acre', 43560, 'square_foot', 0),
+    ('area', 'square_mile', 'Square mile', 640, 'acre', 0),
+
+    ('speed', 'meter_per_second', 'Meter per second', 1, None, 0),
+    ('speed', 'kilometer_per_hour', 'Kilometer per hour', '5/18', 'meter_per_second', 0),
+    ('speed', 'mile_per_hour', 'Mile per hour', '0.44704', 'meter_per_second', 0),
+    ('speed', 'foot_per_second', 'Foot per second', '0.3048', 'meter_per_second', 0),
+    ('speed', 'knot', 'Knot', '1852/3600', 'meter_per_second', 0),
+
+    ('time', 'second', 'Second', 1, None, 0),
+    ('time', 'millisecond', 'Millisecond', '1/1000', 'second', 0),
+    ('time', 'minute', 'Minute', 60, 'second', 0),
+    ('time', 'hour', 'Hour', 60, 'minute', 0),
+    ('time', 'day', 'Day', 24, 'hour', 0),
+    ('time', 'week', 'Week', 7, 'day', 0),
+    ('time', 'year', 'Year (Julian)', '365.25', 'day', 0),
+]
+
+
+class UnitError(ValueError):
+    """Raised for an unknown unit, or units that cannot be converted into each other."""
+
+
+class UnitRegistry:
+    """
+    Units grouped by dimension, with a precomputed affine transform for every pair.
+
+    Note:
+        The transforms are built on the first conversion after a definition,
+        so defining units one by one does not rebuild anything.
+    """
+
+    def __init__(self):
+        self._units = {}
+        self._dimensions = {}
+        self._pairs = None
+        self._exact_pairs = None
+        self._dimension_pairs = None
+        self._dimension_exact_pairs = None
+        self._matrices = None
+
+    def define(self, dimension, unit, factor=1, reference=None, offset=0, label=None):
+        """
+        Define a unit as 1 unit = factor * reference + offset.
+
+        Args:
+            dimension (str): The dimension, e.g. 'length'. It is created by its first unit.
+            unit (str): The name of the unit; unique over all dimensions.
+            factor (int, str or Fraction, optional): How many references one unit is.
+                                                     Strings like '25.4' or '5/9'
+                                                     are read exactly. Defaults to 1.
+            reference (str, optional): The unit it is defined by. It may be
+                                       defined later. Defaults to None, for the
+                                       base unit of the dimension.
+            offset (int, str or Fraction, optional): Added after scaling. Defaults to 0.
+            label (str, optional): The name shown to users. Defaults to the unit name.
+
+        Returns:
+            None
+
+        Raises:
+            UnitError: If the unit exists or the factor is 0.
+        """
+        if unit in self._units:
+            raise UnitError(f"Unit '{unit}' is already defined.")
+        factor, offset = Fraction(factor), Fraction(offset)
+        if factor == 0:
+            raise UnitError(f"Unit '{unit}' needs a factor other than 0.")
+        self._units[unit] = (dimension, factor, reference, offset, label or unit)
+        self._dimensions.setdefault(dimension, []).append(unit)
+        self._pairs = None
+
+    def build(self):
+        """
+        Resolve every unit to the base of its dimension and precompute the
+        transform of every pair of units.
+
+        Returns:
+            None
+
+        Raises:
+            UnitError: If a reference is unknown, in another dimension, or not
+                       connected to the base of the dimension.
+        """
+        dimension_pairs, dimension_exact_pairs, matrices = {}, {}, {}
+        for dimension, units in self._dimensions.items():
+            to_base = self._resolve(dimension, units)
+            scales = np.empty((len(units), len(units)))
+            offsets = np.empty((len(units), len(units)))
+            pairs, exact_pairs = {}, {}
+            for i, source in enumerate(units):
+                for j, target in enumerate(units):
+                    # x -> base: a_i * x + b_i, then base -> y: (base - b_j) / a_j
+                    (a_i, b_i), (a_j, b_j) = to_base[source], to_base[target]
+                    scale, offset = a_i / a_j, (b_i - b_j) / a_j
+                    exact_pairs[(source, target)] = (scale, offset)
+                    scales[i, j], offsets[i, j] = float(scale), float(offset)
+                    pairs[(source, target)] = (float(scale), float(offset))
+            dimension_pairs[dimension], dimension_exact_pairs[dimension] = pairs, exact_pairs
+            matrices[dimension] = (list(units), scales, offsets)
+        self._dimension_pairs, self._dimension_exact_pairs, self._matrices = \
+            dimension_pairs, dimension_exact_pairs, matrices
+        self._exact_pairs = {pair: transform for pairs in dimension_exact_pairs.values()
+                             for pair, transform in pairs.items()}
+        self._pairs = {pair: transform for pairs in dimension_pairs.values() for pair, transform in pairs.items()}
+
+    def _resolve(self, dimension, units):
+        # Walk the definitions as an undirected graph, breadth-first from the base unit
+        edges = {unit: [] for unit in units}
+        for unit in units:
+            _, factor, reference, offset, _ = self._units[unit]
+            if reference is None:
+                continue
+            if self._units.get(reference, (None,))[0] != dimension:
+                raise UnitError(f"Unit '{unit}' is defined by '{reference}', which is not a {dimension} unit.")
+            edges[unit].append((reference, factor, offset, False))
+            edges[reference].append((unit, factor, offset, True))
+        base = units[0]
+        to_base = {base: (Fraction(1), Fraction(0))}
+        queue = deque([base])
+        while queue:
+            unit = queue.popleft()
+            a, b = to_base[unit]
+            for other, factor, offset, defines_other in edges[unit]:
+                if other in to_base:
+                    continue
+                if defines_other:
+                    # 1 other = factor * unit + offset
+                    to_base[other] = (a * factor, a * offset + b)
+                else:
+                    # 1 unit = factor * other + offset, so other = (unit - offset) / factor
+                    to_base[other] = (a / factor, b - a * offset / factor)
+                queue.append(other)
+        missing = [unit for unit in units if unit not in to_base]
+        if missing:
+            raise UnitError(f"{', '.join(missing)} cannot be converted to {base}.")
+        return to_base
+
+    @property
+    def dimensions(self):
+        """dict: The (unit, label) pairs of every dimension, in definition order."""
+        return {dimension: [(unit, self._units[unit][4]) for unit in units]
+                for dimension, units in self._dimensions.items()}
+
+    def dimension_of(self, unit):
+        """
+        Get the dimension of a unit.
+
+        Args:
+            unit (str): The unit.
+
+        Returns:
+            str or None: The dimension, or None if the unit is unknown.
+        """
+        return self._units.get(unit, (None,))[0]
+
+    def matrix(self, dimension):
+        """
+        Get the precomputed transforms of all unit pairs of a dimension.
+
+        Args:
+            dimension (str): The dimension.
+
+        Returns:
+            tuple: The units, and the scale and offset matrices indexed
+                   [from unit, to unit].
+        """
+        if self._pairs is None:
+            self.build()
+        return self._matrices[dimension]
+
+    def transform(self, from_unit, to_unit, dimension=None, exact=False):
+        """
+        Get the affine transform between two units.
+
+        Args:
+            from_unit (str): The unit converted from.
+            to_unit (str): The unit converted to.
+            dimension (str, optional): The dimension both units must be of.
+                                       Defaults to None, any dimension.
+            exact (bool, optional): Return Fractions instead of floats. Defaults to False.
+
+        Returns:
+            tuple: The scale and offset: to = from * scale + offset.
+
+        Raises:
+            UnitError: If a unit is unknown or the units are of different dimensions.
+        """
+        try:
+            if exact:
+                pairs = self._exact_pairs if dimension is None else self._dimension_exact_pairs[dimension]
+            else:
+                pairs = self._pairs if dimension is None else self._dimension_pairs[dimension]
+            return pairs[(from_unit, to_unit)]
+        except (KeyError, TypeError):
+            if self._pairs is None:
+                self.build()
+                return self.transform(from_unit, to_unit, dimension, exact)
+            raise self._error(from_unit, to_unit, dimension) from None
+
+    def _error(self, from_unit, to_unit, dimension):
+        if dimension is not None and (not isinstance(dimension, str) or dimension not in self._dimensions):
+            return UnitError(f"Unsupported unit type: {dimension}")
+        for unit in (from_unit, to_unit):
+            if not isinstance(unit, str) or unit not in self._units:
+                return UnitError(f"Unknown unit: {unit}")
+            if dimension is not None and self._units[unit][0] != dimension:
+                return UnitError(f"{unit} is not a {dimension} unit.")
+        return UnitError(f"Cannot convert {self._units[from_unit][0]} ({from_unit}) "
+                         f"to {self._units[to_unit][0]} ({to_unit}).")
+
+    def convert(self, value, from_unit, to_unit, dimension=None):
+        """
+        Convert a value, or a whole NumPy array of values at once.
+
+        Args:
+            value (float or numpy.ndarray): The value(s) in from_unit.
+            from_unit (str): The unit converted from.
+            to_unit (str): The unit converted to.
+            dimension (str, optional): The dimension both units must be of.
+                                       Defaults to None, any dimension.
+
+        Returns:
+            float or numpy.ndarray: The value(s) in to_unit.
+
+        Raises:
+            UnitError: If a unit is unknown or the units are of different dimensions.
+        """
+        scale, offset = self.transform(from_unit, to_unit, dimension)
+        if offset:
+            return value * scale + offset
+        return value * scale
+
+    def convert_exact(self, value, from_unit, to_unit, dimension=None):
+        """
+        Convert a value with exact rational arithmetic.
+
+        Args:
+            value (int, str, Decimal or Fraction): The value in from_unit. A
+                                                   string like '0.1' or '1/3'
+                                                   is read exactly.
+            from_unit (str): The unit converted from.
+            to_unit (str): The unit converted to.
+            dimension (str, optional): The dimension both units must be of.
+                                       Defaults to None, any dimension.
+
+        Returns:
+            Fraction: The exact value in to_unit.
+
+        Raises:
+            UnitError: If a unit is unknown or the units are of different dimensions.
+            ValueError: If the value is not a finite number.
+        """
+        scale, offset = self.transform(from_unit, to_unit, dimension, exact=True)
+        return parse_exact(value) * scale + offset
+
+
+def parse_exact(value):
+    """
+    Read a number exactly, e.g. '0.1' as 1/10 rather than the float nearest to it.
+
+    Args:
+        value (int, str, Decimal or Fraction): The number.
+
+    Returns:
+        Fraction: The number.
+
+    Raises:
+        ValueError: If the value is not a finite number, or has more than
+                    MAX_EXACT_DIGITS digits or a power of ten beyond
+                    MAX_EXACT_EXPONENT.
+    """
+    if isinstance(value, Fraction):
+        return value
+    _check_exact_size(value)
+    try:
+        return Fraction(value.strip() if isinstance(value, str) else value)
+    except (TypeError, ZeroDivisionError, OverflowError):
+        raise ValueError(f"Not a finite number: {value!r}") from None
+
+
+def _check_exact_size(value):
+    # Checked before Fraction() reads the value, which expands the exponent into digits
+    if isinstance(value, str):
+        mantissa, _, exponent = value.strip().lower().partition('e')
+        digits = sum(map(mantissa.count, '0123456789'))
+        # Compared as text first, so an exponent of a million digits is not read as a number
+        exponent = exponent.replace('_', '').lstrip('+-').lstrip('0')
+        too_large = len(exponent) > len(str(MAX_EXACT_EXPONENT)) or \
+            (exponent.isdigit() and int(exponent) > MAX_EXACT_EXPONENT)
+    elif isinstance(value, Decimal):
+        _, digit_tuple, exponent = value.as_tuple()
+        digits = len(digit_tuple)
+        too_large = isinstance(exponent, int) and abs(exponent) > MAX_EXACT_EXPONENT
+    elif isinstance(value, int):
+        digits, too_large = len(str(abs(value))), False
+    else:
+        return
+    if digits > MAX_EXACT_DIGITS or too_large:
+        raise ValueError(f"Exact values are limited to {MAX_EXACT_DIGITS} digits "
+                         f"and powers of ten up to {MAX_EXACT_EXPONENT}.")
+
+
+def format_exact(value, digits=EXACT_DIGITS):
+    """
+    Write an exact value as a decimal.
+
+    Args:
+        value (Fraction): The value.
+        digits (int, optional): Significant digits of a value that has no
+                                finite decimal form, like 1/3. Defaults to EXACT_DIGITS.
+
+    Returns:
+        str: The value in plain decimal notation, exact whenever the decimal ends.
+    """
+    with localcontext() as context:
+        context.prec = digits
+        result = Decimal(value.numerator) / value.denominator
+        if context.flags[Inexact]:
+            # Denominators made of 2s and 5s end, just after more digits than asked for
+            denominator = value.denominator
+            for factor in (2, 5):
+                while denominator % factor == 0:
+                    denominator //= factor
+            if denominator == 1:
+                context.prec = len(str(abs(value.numerator))) + len(str(value.denominator)) * 3
+                result = Decimal(value.numerator) / value.denominator
+        return format(result.normalize() if result else Decimal(0), 'f')
+
+
+def format_float(value, digits=FLOAT_DIGITS):
+    """
+    Write a float result without the noise of binary rounding, e.g. 0.3048 rather than 0.30479999999999996.
+
+    Args:
+        value (float): The value.
+        digits (int, optional): Significant digits. Defaults to FLOAT_DIGITS.
+
+    Returns:
+        str: The value.
+    """
+    return format(value, f'.{digits}g')
+
+
+REGISTRY = UnitRegistry()
+for _dimension, _unit, _label, _factor, _reference, _offset in DEFINITIONS:
+    REGISTRY.define(_dimension, _unit, _factor, _reference, _offset, _label)
+REGISTRY.build()
+
+
+def benchmark(calls=200000, size=1000000):
+    """
+    Time the per-call overhead of a conversion through the registry against
+    the converter's old functions, which built their unit table on every
+    call, and converting a whole array at once.
+
+    Args:
+        calls (int): The number of single-value conversions timed.
+        size (int): The length of the array converted at once.
+
+    Returns:
+        None
+    """
+    def old_convert_length(value, from_unit, to_unit):
+        length_units = {'millimeter': 1, 'centimeter': 10, 'meter': 1000, 'kilometer': 1000000,
+                        'inch': 25.4, 'foot': 304.8, 'yard': 914.4, 'mile': 1609344}
+        return value * length_units[from_unit] / length_units[to_unit]
+
+    def old_convert_temperature(value, from_unit, to_unit):
+        if from_unit == 'Celsius':
+            if to_unit == 'Fahrenheit':
+                return (value * 9/5) + 32
+            elif to_unit == 'Kelvin':
+                return value + 273.15
+        elif from_unit == 'Fahrenheit':
+            if to_unit == 'Celsius':
+                return (value - 32) * 5/9
+            elif to_unit == 'Kelvin':
+                return (value - 32) * 5/9 + 273.15
+        elif from_unit == 'Kelvin':
+            if to_unit == 'Celsius':
+                return value - 273.15
+            elif to_unit == 'Fahrenheit':
+                return (value - 273.15) * 9/5 + 32
+        return value
+
+    cases = [
+        ("old convert_length", lambda: old_convert_length(3.5, 'mile', 'meter')),
+        ("registry length", lambda: REGISTRY.convert(3.5, 'mile', 'meter')),
+        ("registry length, checked", lambda: REGISTRY.convert(3.5, 'mile', 'meter', 'length')),
+        ("old convert_temperature", lambda: old_convert_temperature(3.5, 'Kelvin', 'Fahrenheit')),
+        ("registry temperature", lambda: REGISTRY.convert(3.5, 'Kelvin', 'Fahrenheit')),
+        ("transform lookup", lambda: REGISTRY.transform('Kelvin', 'Fahrenheit')),
+    ]
+    print(f"Per call, over {calls} calls")
+    for name, case in cases:
+        start = time.perf_counter()
+        for _ in range(calls):
+            case()
+        print(f"{name:>28}: {(time.perf_counter() - start) / calls * 1e9:8.0f} ns")
+
+    values = np.random.default_rng(3).uniform(-100, 100, size)
+    start = time.perf_counter()
+    REGISTRY.convert(values, 'Kelvin', 'Fahrenheit')
+    elapsed = time.perf_counter() - start
+    print(f"{'registry, array of ' + str(size):>28}: {elapsed / size * 1e9:8.2f} ns per value")
+
+
+def benchmark_precision(size=200000, seed=5):
+    """
+    Time converting and formatting values in float and exact precision, and
+    measure how far the float results are from the exact ones.
+
+    Args:
+        size (int): The number of values converted.
+        seed (int): Seed for the random generator, for repeatable runs.
+
+    Returns:
+        None
+    """
+    rng = np.random.default_rng(seed)
+    texts = [f"{value:.6f}" for value in rng.uniform(-1000, 1000, size).tolist()]
+    pairs = [('Fahrenheit', 'Celsius'), ('mile', 'kilometer'), ('fluid_ounce', 'liter'), ('acre', 'square_meter')]
+    print(f"{'conversion':>26} {'float array':>14} {'float each':>14} {'exact each':>14} {'float error':>12}")
+    for from_unit, to_unit in pairs:
+        start = time.perf_counter()
+        floats = np.array(texts, dtype=np.float64)
+        REGISTRY.convert(floats, from_unit, to_unit)
+        array = size / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        scale, offset = REGISTRY.transform(from_unit, to_unit)
+        approximate = [format_float(float(text) * scale + offset) for text in texts]
+        each = size / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        scale, offset = REGISTRY.transform(from_unit, to_unit, exact=True)
+        exact = [format_exact(Fraction(text) * scale + offset) for text in texts]
+        exact_each = size / (time.perf_counter() - start)
+
+        error = max(abs(Fraction(shown) - Fraction(value)) / max(abs(Fraction(value)), 1)
+                    for shown, value in zip(approximate[:10000], exact[:10000]))
+        print(f"{from_unit + ' -> ' + to_unit:>26} {array:>9,.0f}/sec {each:>9,.0f}/sec {exact_each:>9,.0f}/sec "
+              f"{float(error):>12.1e}")
+
+
+if __name__ == "__main__":
+    benchmark()
+    benchmark_precision()